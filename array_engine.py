@@ -0,0 +1,212 @@
+import random
+import numpy as np
+from deap import creator
+import metrics
+from genetic_algorithm import FitnessCache, player_arrays, team_sums, fitness_from_team_sums, population_to_arrays
+from seeding import team_targets, repair_sizes
+
+class ArrayPopulation:
+    """
+    Population 전체를 (개체 수, 선수 수) 크기의 작은 정수 배열 하나와 적합도 벡터, 평가 여부 마스크로 들고 있는 객체.
+    개체마다 리스트와 Fitness 객체를 만들지 않으므로 메모리와 할당이 개체 수가 아닌 배열 몇 개로 줄어듭니다.
+    """
+
+    def __init__(self, genes, fitness, valid):
+        """
+        INPUT:
+        - genes (np.ndarray): (개체 수, 선수 수) 팀 배정 배열 (int8 또는 int16)
+        - fitness (np.ndarray): 개체별 적합도 (float64)
+        - valid (np.ndarray): 개체별 적합도가 현재 유전자에 대해 평가되었는지 여부 (bool)
+        """
+        self.genes = genes
+        self.fitness = fitness
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.genes)
+
+    def arrays(self):
+        """
+        population_to_arrays와 같은 형식 (int16 팀 배정, 평가되지 않은 개체는 nan인 적합도)으로 바꾸는 함수.
+        체크포인트와 워커 프로세스 사이의 전달에 그대로 쓸 수 있습니다.
+        """
+        return self.genes.astype(np.int16), np.where(self.valid, self.fitness, np.nan)
+
+class ArrayEngine:
+    """
+    ArrayPopulation을 DEAP 개체 없이 진화시키는 엔진.
+
+    varAnd(cxpb=0.5, mutpb=0.2), 두 점 교차, 변이(free/balanced 인코딩), selTournament(tournsize=3),
+    HallOfFame(1)과 같은 순서로 random 모듈을 사용하므로, 같은 시드에서 setup_toolbox(incremental=False)로
+    만든 DEAP 경로와 같은 Population과 최적 개체를 만듭니다. 선택은 인덱스 배열로 하고 다음 세대는
+    팀 배정 배열을 한 번에 골라 만들므로, 세대마다 개체 300개를 복제하지 않습니다.
+    """
+
+    def __init__(self, num_teams, fixed_assignments, players, encoding="free", cache_size=0, fitness_cache=None,
+                 cxpb=0.5, mutpb=0.2, indpb=0.2, tournsize=3):
+        """
+        INPUT:
+        - num_teams (int): 팀의 수
+        - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+        - players (list): 일반 선수 리스트
+        - encoding (str): "free" 또는 "balanced" (setup_toolbox와 같은 의미)
+        - cache_size (int): 0보다 크면 FitnessCache로 적합도를 기억 (fitness_cache)
+        - fitness_cache (FitnessCache): 이미 만든 캐시를 함께 쓸 때 전달 (주어지면 cache_size는 무시)
+        - cxpb, mutpb (float): 교차/변이 확률
+        - indpb (float): 유전자별 변이 확률 (balanced는 맞바꾸기라 절반을 사용)
+        - tournsize (int): 토너먼트 크기
+        """
+        if encoding not in ("free", "balanced"):
+            raise ValueError(f"Unknown encoding: {encoding}")
+        self.num_teams = num_teams
+        self.players = players
+        self.encoding = encoding
+        self.cxpb, self.mutpb, self.tournsize = cxpb, mutpb, tournsize
+        self.indpb = indpb / 2 if encoding == "balanced" else indpb
+        self.avg_scores, self.max_scores = player_arrays(players)
+        self.min_team_size = len(players) // num_teams
+        self.free_indices = [i for i, p in enumerate(players) if p['name'] not in fixed_assignments]
+        self.targets = team_targets(num_teams, fixed_assignments, players) if encoding == "balanced" else None
+        self.dtype = np.int8 if num_teams <= 127 else np.int16
+        if fitness_cache is None and cache_size > 0:
+            fitness_cache = FitnessCache(num_teams, cache_size)
+        self.fitness_cache = fitness_cache
+
+    def from_arrays(self, genes, fitness):
+        """
+        population_to_arrays 형식의 배열로 ArrayPopulation을 만드는 함수
+        """
+        fitness = np.asarray(fitness, dtype=np.float64)
+        valid = ~np.isnan(fitness)
+        return ArrayPopulation(np.ascontiguousarray(genes, dtype=self.dtype), np.where(valid, fitness, 0.0), valid)
+
+    def from_population(self, population):
+        """
+        creator.Individual 리스트로 ArrayPopulation을 만드는 함수
+        """
+        return self.from_arrays(*population_to_arrays(population))
+
+    def evaluate_rows(self, rows):
+        """
+        팀 배정 행들의 적합도를 계산하는 함수 (evaluate_individuals와 같은 값)
+        """
+        if len(rows) == 0:
+            return []
+        counts, avg_sums, max_sums = team_sums(np.asarray(rows, dtype=np.intp), self.num_teams, self.avg_scores, self.max_scores)
+        return fitness_from_team_sums(counts, avg_sums, max_sums, self.min_team_size).tolist()
+
+    def evaluate(self, population):
+        """
+        평가되지 않은 개체만 적합도를 계산해 채우는 함수
+
+        OUTPUT:
+        - evaluated (int): 평가한 개체 수
+        """
+        invalid = np.flatnonzero(~population.valid)
+        if len(invalid) == 0:
+            return 0
+        rows = population.genes[invalid]
+        if self.fitness_cache is not None:
+            fits = self.fitness_cache.evaluate(list(rows), self.evaluate_rows)
+        else:
+            fits = self.evaluate_rows(rows)
+        population.fitness[invalid] = fits
+        population.valid[invalid] = True
+        return len(invalid)
+
+    def _mate(self, genes, a, b):
+        # tools.cxTwoPoint와 같은 난수로 교차점을 고르고 구간을 맞바꿉니다.
+        size = genes.shape[1]
+        cxpoint1 = random.randint(1, size)
+        cxpoint2 = random.randint(1, size - 1)
+        if cxpoint2 >= cxpoint1:
+            cxpoint2 += 1
+        else:
+            cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+        segment = genes[a, cxpoint1:cxpoint2].copy()
+        genes[a, cxpoint1:cxpoint2] = genes[b, cxpoint1:cxpoint2]
+        genes[b, cxpoint1:cxpoint2] = segment
+        if self.targets is not None:
+            # balanced_mate와 같이 교차 후 팀 인원을 목표 인원으로 되돌림
+            for row in (a, b):
+                individual = genes[row].tolist()
+                repair_sizes(individual, self.targets, self.free_indices, self.players)
+                genes[row] = individual
+
+    def _mutate(self, genes, row):
+        # custom_mutate / swap_mutate와 같은 순서로 난수를 사용합니다.
+        individual = genes[row].tolist()
+        indpb = self.indpb
+        if self.targets is None:
+            num_teams = self.num_teams
+            for i in self.free_indices:
+                if random.random() < indpb:
+                    individual[i] = random.randint(0, num_teams - 1)
+        else:
+            free_indices = self.free_indices
+            for i in free_indices:
+                if random.random() < indpb:
+                    j = random.choice(free_indices)
+                    individual[i], individual[j] = individual[j], individual[i]
+        genes[row] = individual
+
+    def select(self, population):
+        """
+        selTournament와 같은 방식으로 개체를 골라 다음 세대를 만드는 함수.
+        토너먼트 참가자는 random.choice와 같은 난수로 인덱스만 뽑고, 적합도가 같으면 먼저 뽑힌 개체를 고릅니다.
+
+        OUTPUT:
+        - population (ArrayPopulation): 고른 개체들로 새로 만든 Population
+        """
+        size = len(population)
+        indices = range(size)
+        aspirants = np.array([random.choice(indices) for _ in range(size * self.tournsize)]).reshape(size, self.tournsize)
+        winners = aspirants[np.arange(size), np.argmin(population.fitness[aspirants], axis=1)]
+        return ArrayPopulation(population.genes[winners], population.fitness[winners], population.valid[winners])
+
+    def evolve_generation(self, population, gen):
+        """
+        한 세대의 교차/변이, 평가, 선택을 수행하는 함수. (genetic_algorithm.evolve_generation과 같은 순서)
+
+        INPUT:
+        - population (ArrayPopulation): 현재 세대 (제자리에서 바뀌지 않음)
+        - gen (int): 현재 세대 번호
+
+        OUTPUT:
+        - population (ArrayPopulation): 선택된 다음 세대
+        """
+        with metrics.timer("variation"):
+            genes = population.genes.copy()
+            valid = population.valid.copy()
+            for i in range(1, len(genes), 2):
+                if random.random() < self.cxpb:
+                    self._mate(genes, i - 1, i)
+                    valid[i - 1] = valid[i] = False
+            for i in range(len(genes)):
+                if random.random() < self.mutpb:
+                    self._mutate(genes, i)
+                    valid[i] = False
+            offspring = ArrayPopulation(genes, population.fitness.copy(), valid)
+
+        with metrics.timer("evaluation"):
+            evaluated = self.evaluate(offspring)
+        metrics.inc("teambuilder_generations_total")
+        metrics.inc("teambuilder_evaluations_total", evaluated)
+
+        with metrics.timer("selection"):
+            return self.select(offspring)
+
+    def update_hof(self, hof, population):
+        """
+        HallOfFame.update(population)과 같은 결과로 Hall of Fame을 갱신하는 함수.
+        가장 좋은 개체 하나만 creator.Individual로 만들어 넘깁니다. (적합도가 같으면 앞의 개체)
+        """
+        if len(population) == 0:
+            return
+        best = int(np.argmin(np.where(population.valid, population.fitness, np.inf)))
+        if not population.valid[best]:
+            return
+        if len(hof) == 0 or population.fitness[best] < hof[0].fitness.values[0]:
+            individual = creator.Individual(population.genes[best].tolist())
+            individual.fitness.values = (float(population.fitness[best]),)
+            hof.update([individual])
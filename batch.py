@@ -0,0 +1,162 @@
+import os
+import sys
+import glob
+import json
+import time
+import random
+import logging
+import multiprocessing
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from load import load_prev_json
+from util import parse_args
+import config
+
+def is_result_file(path):
+    """
+    save_results가 만든 결과 JSON(result.json, result1.json, ...)인지 확인하는 함수
+    """
+    suffix = os.path.basename(path)[len("result"):-len(".json")]
+    return os.path.basename(path).startswith("result") and path.endswith(".json") and (suffix == "" or suffix.isdigit())
+
+def roster_files(patterns):
+    """
+    파일, 디렉토리, glob 패턴으로 선수 명단 파일 목록을 만드는 함수.
+    디렉토리는 그 안의 *.json을 사용하며, 이전 실행이 같은 디렉토리에 남긴 결과 JSON은 제외합니다.
+
+    INPUT:
+    - patterns (list): --data_path로 받은 파일/디렉토리/glob 패턴
+
+    OUTPUT:
+    - files (list): 중복 없이 정렬된 명단 파일 경로 리스트
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.json"))
+        else:
+            matches = glob.glob(pattern)
+        for path in sorted(matches):
+            if os.path.isfile(path) and not is_result_file(path) and path not in files:
+                files.append(path)
+    return files
+
+class ErrorCollector(logging.Handler):
+    """
+    작업이 logging.error로 남긴 오류 메시지를 모아 요약의 error에 기록하기 위한 로그 핸들러
+    """
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+def solve_roster(data_path, num_teams, repeat, options, render=False, seed=None):
+    """
+    배치 워커 프로세스에서 명단 하나를 풀고 요약을 만드는 함수.
+
+    INPUT:
+    - data_path (str): 명단 파일 경로 (결과 JSON은 같은 디렉토리에 버전 번호로 저장)
+    - num_teams (int): 팀의 수
+    - repeat (int): 반복 횟수
+    - options (dict): config.solver_options로 만든 작업 옵션
+    - render (bool): True면 결과 그림(PNG)도 생성
+    - seed (int): 난수 시드 (None이면 지정하지 않음)
+
+    OUTPUT:
+    - record (dict): data_path, num_teams, fitness, seconds, team_sums, result 등 (실패하면 error)
+    """
+    # 작업 워커와 같이 유전 알고리즘 모듈은 워커에서만 불러옵니다.
+    from solver import execute_genetic
+    from task_store import TaskState
+    from save import json_to_png
+
+    record = {"data_path": data_path, "num_teams": num_teams}
+    if seed is not None:
+        random.seed(seed)
+    task = TaskState()
+    errors = ErrorCollector()
+    logging.getLogger().addHandler(errors)
+    start = time.time()
+    try:
+        # save_results/json_to_png의 출력이 JSON Lines 출력에 섞이지 않도록 stderr로 보냄
+        with redirect_stdout(sys.stderr):
+            execute_genetic(f"{data_path}:{num_teams}", task, num_teams, repeat, data_path, options)
+            png_path = json_to_png(task.result_json) if render and task.result_json else None
+    except Exception as e:
+        errors.messages.append(str(e))
+    finally:
+        logging.getLogger().removeHandler(errors)
+    if errors.messages or task.result_json is None:
+        # 처음 남은 오류가 원인 (뒤의 오류는 그 결과로 생긴 것)
+        record["error"] = errors.messages[0] if errors.messages else "Task failed without a result"
+        return record
+
+    data = load_prev_json(task.result_json)
+    record.update({
+        "fitness": task.best_fitness,
+        "seconds": round(time.time() - start, 3),
+        "stop_reason": data["parameters"].get("stop_reason"),
+        "generations": data["parameters"].get("generations"),
+        "team_sums": {team: info["Total Score"] for team, info in data["results"].items()},
+        "result": task.result_json,
+    })
+    if render:
+        record["png"] = png_path
+    return record
+
+def run_batch(files, team_counts, repeat, options, processes, output, render=False, seed=None):
+    """
+    명단 파일과 팀 수의 모든 조합을 프로세스 풀에서 풀고, 끝나는 순서대로 요약을 JSON Lines로 쓰는 함수
+
+    INPUT:
+    - files (list): 명단 파일 경로 리스트
+    - team_counts (list): 풀어 볼 팀 수 리스트
+    - repeat (int): 반복 횟수
+    - options (dict): 작업 옵션
+    - processes (int): 동시에 푸는 명단 수
+    - output: 요약을 쓸 텍스트 파일 객체
+    - render (bool): True면 결과 그림도 생성
+    - seed (int): 난수 시드 (조합마다 seed + 순번을 사용)
+
+    OUTPUT:
+    - failed (int): 실패한 조합 수
+    """
+    jobs = [(data_path, num_teams) for data_path in files for num_teams in team_counts]
+    failed = 0
+    # 스레드를 물려받지 않도록 작업 스케줄러와 같이 spawn으로 워커를 만듭니다.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, min(processes, len(jobs))), mp_context=context) as executor:
+        futures = [
+            executor.submit(solve_roster, data_path, num_teams, repeat, options, render,
+                            seed + index if seed is not None else None)
+            for index, (data_path, num_teams) in enumerate(jobs)
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            failed += "error" in record
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+    return failed
+
+if __name__ == "__main__":
+    args = parse_args()
+    files = roster_files(args.data_path)
+    if not files:
+        sys.exit(f"No roster files matched: {' '.join(args.data_path)}")
+
+    # 명단마다 프로세스 하나를 쓰므로 작업 안의 병렬 실행(워커, 섬 모델)은 끕니다.
+    options = config.solver_options(workers=0, islands=0, solver=args.solver, encoding=args.encoding,
+                                    engine=args.engine, objectives=args.objectives, time_budget=args.time_budget)
+    start = time.time()
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        failed = run_batch(files, args.num_teams, args.repeat, options, args.processes, output, args.render, args.seed)
+    finally:
+        if args.output:
+            output.close()
+    total = len(files) * len(args.num_teams)
+    print(f"Solved {total - failed}/{total} in {time.time() - start:.1f}s", file=sys.stderr)
+    sys.exit(1 if failed else 0)
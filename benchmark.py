@@ -0,0 +1,377 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from contextlib import redirect_stdout
+from genetic_algorithm import ensure_creator, setup_toolbox, initialize_population, evolve_generation, infeasible_fitness, \
+    INFEASIBLE_PENALTY
+from parallel import SubPopulationPool
+from save import save_results, json_to_png
+import config
+
+def synthetic_roster(num_players, seed=0):
+    """
+    벤치마크용 가상 선수 명단을 만드는 함수.
+
+    INPUT:
+    - num_players (int): 선수 수
+    - seed (int): 난수 시드
+
+    OUTPUT:
+    - players (list): 일반 선수 리스트
+    """
+    rng = random.Random(seed)
+    players = []
+    for i in range(num_players):
+        avg = round(rng.uniform(90, 230), 1)
+        players.append({"name": f"player{i}", "avg": avg, "max": int(avg + rng.uniform(0, 80))})
+    return players
+
+def synthetic_fixed_assignments(players, num_teams, fixed_ratio, seed=0):
+    """
+    선수 명단 중 fixed_ratio 비율을 팀에 고르게 나누어 고정하는 함수.
+
+    INPUT:
+    - players (list): 일반 선수 리스트
+    - num_teams (int): 팀의 수
+    - fixed_ratio (float): 고정할 선수의 비율
+    - seed (int): 난수 시드
+
+    OUTPUT:
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    """
+    rng = random.Random(seed)
+    fixed = rng.sample(players, int(len(players) * fixed_ratio))
+    return {player["name"]: i % num_teams for i, player in enumerate(fixed)}
+
+def bench_generations(num_teams, players, generations, workers, seed=0):
+    """
+    주어진 워커 수로 generations 세대를 진화시키고 초당 세대 수를 측정하는 함수.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - players (list): 일반 선수 리스트
+    - generations (int): 측정할 세대 수
+    - workers (int): 워커 프로세스 수 (1이면 단일 프로세스)
+    - seed (int): 난수 시드
+
+    OUTPUT:
+    - result (dict): 워커 수, 소요 시간, 초당 세대 수
+    """
+    random.seed(seed)
+    toolbox = setup_toolbox(num_teams, {}, players)
+    population, hof, _ = initialize_population(toolbox)
+
+    if workers > 1:
+        with SubPopulationPool(workers, num_teams, {}, players) as pool:
+            pool.evolve(population, 0, 1)  # 워커 프로세스 기동 시간은 측정에서 제외합니다.
+            start = time.perf_counter()
+            gen = 0
+            while gen < generations:
+                step = min(config.PARALLEL_SYNC_INTERVAL, generations - gen)
+                population = pool.evolve(population, gen, step)
+                hof.update(population)
+                gen += step
+            elapsed = time.perf_counter() - start
+    else:
+        start = time.perf_counter()
+        for gen in range(generations):
+            population = evolve_generation(population, toolbox, gen)
+            hof.update(population)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "generations_per_sec": round(generations / elapsed, 2),
+        "best_fitness": hof[0].fitness.values[0],
+    }
+
+def best_fitness_curve(num_teams, players, generations, seed_ratio, seed=0):
+    """
+    단일 프로세스로 진화시키며 세대별 최고 적합도를 기록하는 함수.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - players (list): 일반 선수 리스트
+    - generations (int): 진화시킬 세대 수
+    - seed_ratio (float): 초기 Population 중 휴리스틱으로 만든 개체의 비율
+    - seed (int): 난수 시드
+
+    OUTPUT:
+    - curve (list): 세대별 최고 적합도 (0번째는 초기 Population)
+    """
+    random.seed(seed)
+    toolbox = setup_toolbox(num_teams, {}, players)
+    population, hof, _ = initialize_population(toolbox, seed_ratio)
+    for ind, fit in zip(population, toolbox.evaluate_population(population)):
+        ind.fitness.values = (fit,)
+    hof.update(population)
+
+    curve = [hof[0].fitness.values[0]]
+    for gen in range(generations):
+        population = evolve_generation(population, toolbox, gen)
+        hof.update(population)
+        curve.append(hof[0].fitness.values[0])
+    return curve
+
+def bench_seeding(num_teams, players, generations, seed_ratio, target=None, seed=0):
+    """
+    무작위 초기화와 휴리스틱 초기화가 목표 적합도에 도달하는 데 필요한 세대 수를 비교하는 함수.
+    목표 적합도를 주지 않으면 무작위 초기화의 최종 최고 적합도를 쓰고, 그 값이 인원 불균형 벌점을 받은 값이면
+    휴리스틱 초기화의 초기 최고 적합도를 씁니다. 도달하지 못하면 None입니다.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - players (list): 일반 선수 리스트
+    - generations (int): 진화시킬 세대 수
+    - seed_ratio (float): 비교할 휴리스틱 개체 비율
+    - target (float): 목표 적합도
+    - seed (int): 난수 시드
+
+    OUTPUT:
+    - result (dict): 초기화 방식별 초기/최종 최고 적합도와 목표 도달 세대 수
+    """
+    curves = {
+        "random": best_fitness_curve(num_teams, players, generations, 0.0, seed),
+        "seeded": best_fitness_curve(num_teams, players, generations, seed_ratio, seed),
+    }
+    if target is None:
+        # 정상 배정의 적합도는 infeasible_fitness에서 벌점을 뺀 상한 이하
+        feasible = infeasible_fitness(sum(abs(player['avg']) for player in players),
+                                      sum(abs(player['max']) for player in players)) - INFEASIBLE_PENALTY / 2
+        target = curves["random"][-1] if curves["random"][-1] < feasible else curves["seeded"][0]
+    return {
+        "target_fitness": target,
+        "seed_ratio": seed_ratio,
+        "results": {
+            name: {
+                "initial_best": curve[0],
+                "final_best": curve[-1],
+                "generations_to_target": next((gen for gen, best in enumerate(curve) if best <= target), None),
+            } for name, curve in curves.items()
+        },
+    }
+
+def bench_case(num_players, num_teams, fixed_ratio, generations, time_limit, target, seed=0):
+    """
+    가상 명단 하나에 대해 단일 프로세스 진화 속도, 목표 적합도 도달 시간, 최대 메모리, 결과 저장/그림 생성 시간을 측정하는 함수.
+
+    INPUT:
+    - num_players (int): 선수 수
+    - num_teams (int): 팀의 수
+    - fixed_ratio (float): 고정 선수 비율
+    - generations (int): 진화시킬 최대 세대 수
+    - time_limit (float): 진화에 쓸 최대 시간(초)
+    - target (float): 목표 적합도
+    - seed (int): 명단과 유전 알고리즘의 난수 시드
+
+    OUTPUT:
+    - result (dict): 측정 결과
+    """
+    players = synthetic_roster(num_players, seed)
+    fixed_assignments = synthetic_fixed_assignments(players, num_teams, fixed_ratio, seed)
+
+    # 최대 메모리는 tracemalloc이 진화 속도를 떨어뜨리므로 몇 세대만 따로 실행해 측정합니다.
+    random.seed(seed)
+    tracemalloc.start()
+    toolbox = setup_toolbox(num_teams, fixed_assignments, players, encoding=config.ENCODING)
+    population, hof, _ = initialize_population(toolbox, config.SEED_RATIO)
+    for gen in range(5):
+        population = evolve_generation(population, toolbox, gen)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    random.seed(seed)
+    start = time.perf_counter()
+    toolbox = setup_toolbox(num_teams, fixed_assignments, players, encoding=config.ENCODING)
+    population, hof, _ = initialize_population(toolbox, config.SEED_RATIO)
+    for ind, fit in zip(population, toolbox.evaluate_population(population)):
+        ind.fitness.values = (fit,)
+    hof.update(population)
+    setup_time = time.perf_counter() - start
+
+    time_to_target = 0.0 if hof[0].fitness.values[0] <= target else None
+    generations_to_target = 0 if time_to_target is not None else None
+    evolve_start = time.perf_counter()
+    gen = 0
+    while gen < generations and time.perf_counter() - evolve_start < time_limit:
+        population = evolve_generation(population, toolbox, gen)
+        hof.update(population)
+        gen += 1
+        if time_to_target is None and hof[0].fitness.values[0] <= target:
+            time_to_target = time.perf_counter() - start
+            generations_to_target = gen
+    evolve_time = time.perf_counter() - evolve_start
+
+    # 결과 JSON 저장과 그림 생성은 임시 디렉토리에서 측정합니다. (글꼴이 없으면 그림은 만들어지지 않음)
+    # save_results와 json_to_png가 출력하는 메시지는 결과 JSON과 섞이지 않도록 stderr로 보냅니다.
+    with tempfile.TemporaryDirectory() as directory, redirect_stdout(sys.stderr):
+        render_start = time.perf_counter()
+        result_path = save_results(hof[0], num_teams, players, gen, os.path.join(directory, "players.json"), evolve_time)
+        save_time = time.perf_counter() - render_start
+        render_start = time.perf_counter()
+        png_path = json_to_png(result_path)
+        render_time = time.perf_counter() - render_start
+
+    return {
+        "players": num_players,
+        "num_teams": num_teams,
+        "fixed_ratio": fixed_ratio,
+        "generations": gen,
+        "setup_seconds": round(setup_time, 4),
+        "generations_per_sec": round(gen / evolve_time, 2) if evolve_time > 0 else None,
+        "best_fitness": hof[0].fitness.values[0],
+        "target_fitness": target,
+        "seconds_to_target": round(time_to_target, 4) if time_to_target is not None else None,
+        "generations_to_target": generations_to_target,
+        "peak_memory_mb": round(peak_memory / 2 ** 20, 2),
+        "save_results_seconds": round(save_time, 4),
+        "json_to_png_seconds": round(render_time, 4),
+        "rendered": png_path is not None,
+    }
+
+def bench_startup(modules=("main", "solver", "renderer"), repeats=5):
+    """
+    새 파이썬 프로세스에서 모듈을 불러오는 데 걸리는 시간을 측정하는 함수.
+    "main"은 API 서버의 시작 시간, "solver"는 작업 워커가 미리 불러오는 유전 알고리즘 모듈,
+    "renderer"는 그림 워커가 처음 그림을 그리기 전까지의 시간입니다. (matplotlib은 처음 그릴 때 불러옴)
+
+    INPUT:
+    - modules (tuple): 측정할 모듈 이름
+    - repeats (int): 모듈마다 측정할 횟수 (중앙값을 사용)
+
+    OUTPUT:
+    - result (dict): 모듈별 불러오기 시간의 중앙값(초)
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    # 인터프리터 자체의 시작 시간은 빼고 import 문만 측정합니다.
+    code = "import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)"
+    result = {}
+    for module in modules:
+        times = sorted(
+            float(subprocess.run([sys.executable, "-c", code.format(module)], capture_output=True, text=True,
+                                 cwd=directory, check=True).stdout)
+            for _ in range(repeats)
+        )
+        result[module] = round(times[len(times) // 2], 4)
+    return result
+
+def environment_info():
+    """
+    결과를 커밋끼리 비교할 수 있도록 측정 환경과 현재 커밋을 기록하는 함수
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def bench_suite(sizes, team_counts, fixed_ratios, generations, time_limit, target, seed=0):
+    """
+    명단 크기, 팀 수, 고정 선수 비율의 모든 조합에 대해 bench_case를 실행하는 함수.
+    팀당 인원이 2명보다 적은 조합은 건너뜁니다.
+
+    OUTPUT:
+    - report (dict): 측정 환경, 설정, 조합별 결과
+    """
+    cases = []
+    for num_players in sizes:
+        for num_teams in team_counts:
+            if num_players < num_teams * 2:
+                continue
+            for fixed_ratio in fixed_ratios:
+                result = bench_case(num_players, num_teams, fixed_ratio, generations, time_limit, target, seed)
+                print(json.dumps(result), file=sys.stderr)
+                cases.append(result)
+    return {
+        "environment": environment_info(),
+        "startup_seconds": bench_startup(),
+        "settings": {"generations": generations, "time_limit": time_limit, "target_fitness": target, "seed": seed,
+                     "encoding": config.ENCODING, "seed_ratio": config.SEED_RATIO},
+        "cases": cases,
+    }
+
+def compare_reports(baseline, report):
+    """
+    이전 커밋의 결과 파일과 같은 조합끼리 초당 세대 수와 목표 도달 시간을 비교하는 함수
+
+    OUTPUT:
+    - rows (list): 조합별 비교 결과 (speedup이 1보다 작으면 느려진 것)
+    """
+    key = lambda case: (case["players"], case["num_teams"], case["fixed_ratio"])
+    previous = {key(case): case for case in baseline["cases"]}
+    rows = []
+    for case in report["cases"]:
+        old = previous.get(key(case))
+        if old is None or not old["generations_per_sec"] or not case["generations_per_sec"]:
+            continue
+        rows.append({
+            "players": case["players"], "num_teams": case["num_teams"], "fixed_ratio": case["fixed_ratio"],
+            "speedup": round(case["generations_per_sec"] / old["generations_per_sec"], 2),
+            "seconds_to_target": [old["seconds_to_target"], case["seconds_to_target"]],
+            "best_fitness": [old["best_fitness"], case["best_fitness"]],
+            "peak_memory_mb": [old["peak_memory_mb"], case["peak_memory_mb"]],
+        })
+    return rows
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the team assignment genetic algorithm.")
+    parser.add_argument("--mode", choices=["parallel", "seeding", "suite", "startup"], default="parallel", help="What to benchmark.")
+    parser.add_argument("--players", type=int, default=1000, help="Number of synthetic players.")
+    parser.add_argument("--num_teams", type=int, default=4, help="Number of teams.")
+    parser.add_argument("--generations", type=int, default=200, help="Generations to run per measurement.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to compare.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the roster and the GA.")
+    parser.add_argument("--seed_ratio", type=float, default=config.SEED_RATIO, help="Share of heuristic seeds for --mode seeding.")
+    parser.add_argument("--target", type=float, default=None, help="Target fitness for --mode seeding and suite (suite default 10).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000], help="Roster sizes for --mode suite.")
+    parser.add_argument("--team_counts", type=int, nargs="+", default=[2, 8, 64], help="Team counts for --mode suite.")
+    parser.add_argument("--fixed_ratios", type=float, nargs="+", default=[0.0, 0.2], help="Fixed player ratios for --mode suite.")
+    parser.add_argument("--time_limit", type=float, default=30.0, help="Seconds of evolution per case for --mode suite.")
+    parser.add_argument("--output", type=str, default=None, help="Write the suite report to this JSON file.")
+    parser.add_argument("--compare", type=str, default=None, help="Suite report JSON from an earlier commit to compare against.")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    ensure_creator()
+    players = synthetic_roster(args.players, args.seed)
+
+    if args.mode == "startup":
+        print(json.dumps({"environment": environment_info(), "startup_seconds": bench_startup()}, indent=4))
+        raise SystemExit
+
+    if args.mode == "suite":
+        target = args.target if args.target is not None else 10.0
+        report = bench_suite(args.sizes, args.team_counts, args.fixed_ratios, args.generations, args.time_limit, target, args.seed)
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as file:
+                baseline = json.load(file)
+            report["comparison"] = {"baseline": args.compare, "cases": compare_reports(baseline, report),
+                                    "startup_seconds": [baseline.get("startup_seconds"), report["startup_seconds"]]}
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=4)
+        print(json.dumps(report, indent=4))
+        raise SystemExit
+
+    if args.mode == "seeding":
+        result = bench_seeding(args.num_teams, players, args.generations, args.seed_ratio, args.target, args.seed)
+        print(json.dumps({"players": args.players, "num_teams": args.num_teams, "generations": args.generations, **result}, indent=4))
+        raise SystemExit
+
+    results = [bench_generations(args.num_teams, players, args.generations, workers, args.seed) for workers in args.workers]
+    baseline = results[0]["generations_per_sec"]
+    for result in results:
+        result["speedup"] = round(result["generations_per_sec"] / baseline, 2)
+
+    print(json.dumps({"players": args.players, "num_teams": args.num_teams, "generations": args.generations, "results": results}, indent=4))
@@ -0,0 +1,82 @@
+import os
+import json
+import random
+import numpy as np
+from genetic_algorithm import population_to_arrays, arrays_to_population
+
+def checkpoint_path(data_path):
+    """
+    작업의 체크포인트 파일 경로 (players.json과 같은 data/{uuid}/ 디렉토리)
+    """
+    return os.path.join(os.path.dirname(data_path), "checkpoint.npz")
+
+def save_checkpoint(path, population, hof, generation, meta):
+    """
+    Population, Hall of Fame, 난수 상태, 세대 번호를 체크포인트 파일로 저장하는 함수.
+
+    팀 배정은 int16 배열로 압축 없이 저장하고, 임시 파일에 다 쓴 뒤 os.replace로 바꿔치기하므로
+    저장 도중 프로세스가 죽어도 이전 체크포인트가 깨지지 않습니다.
+
+    INPUT:
+    - path (str): 체크포인트 파일 경로
+    - population (list): 현재 세대의 개체 리스트
+    - hof (tools.HallOfFame): 지금까지의 최적 개체
+    - generation (int): 지금까지 처리한 세대 수
+    - meta (dict): 이어서 실행할 때 필요한 작업 정보 (num_teams, repeat, data_path, options, run_info)
+
+    OUTPUT:
+    - 없음
+    """
+    genes, fitness = population_to_arrays(population)
+    hof_genes, hof_fitness = population_to_arrays(list(hof))
+    version, internal, gauss_next = random.getstate()
+    meta = dict(meta, rng_version=version, rng_gauss_next=gauss_next)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        np.savez(file, genes=genes, fitness=fitness, hof_genes=hof_genes, hof_fitness=hof_fitness,
+                 generation=np.int64(generation), rng_state=np.array(internal, dtype=np.int64),
+                 meta=np.array(json.dumps(meta, ensure_ascii=False)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+def load_checkpoint(path):
+    """
+    save_checkpoint로 저장한 체크포인트를 읽는 함수. 난수 상태는 restore_random으로 되돌립니다.
+
+    INPUT:
+    - path (str): 체크포인트 파일 경로
+
+    OUTPUT:
+    - checkpoint (dict): population, hof(개체 리스트), generation, meta, rng_state
+    """
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        return {
+            "population": arrays_to_population(data["genes"], data["fitness"]),
+            "hof": arrays_to_population(data["hof_genes"], data["hof_fitness"]),
+            "generation": int(data["generation"]),
+            "meta": meta,
+            "rng_state": (meta.pop("rng_version"), tuple(data["rng_state"].tolist()), meta.pop("rng_gauss_next")),
+        }
+
+def load_checkpoint_meta(path):
+    """
+    체크포인트의 작업 정보만 읽는 함수 (Population은 읽지 않음)
+    """
+    with np.load(path) as data:
+        return json.loads(str(data["meta"]))
+
+def restore_random(checkpoint):
+    """
+    체크포인트를 저장할 때의 random 모듈 상태로 되돌리는 함수
+    """
+    random.setstate(checkpoint["rng_state"])
+
+def remove_checkpoint(path):
+    """
+    체크포인트 파일이 있으면 삭제하는 함수
+    """
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,179 @@
+import os
+
+# 병렬 실행에 사용할 워커 프로세스 수 (0 또는 1이면 단일 프로세스로 실행)
+PARALLEL_WORKERS = int(os.environ.get("TEAMBUILDER_WORKERS", "0"))
+
+# 병렬 실행 시 하위 Population들을 합치고 다시 나누는 세대 간격
+PARALLEL_SYNC_INTERVAL = int(os.environ.get("TEAMBUILDER_SYNC_INTERVAL", "20"))
+
+# 섬 모델(Island model)의 섬 개수 (0 또는 1이면 사용하지 않음)
+ISLANDS = int(os.environ.get("TEAMBUILDER_ISLANDS", "0"))
+
+# 섬 사이에 우수 개체를 교환하는 세대 간격
+MIGRATION_INTERVAL = int(os.environ.get("TEAMBUILDER_MIGRATION_INTERVAL", "25"))
+
+# 교환 시 섬마다 내보내는 우수 개체 수
+MIGRANTS = int(os.environ.get("TEAMBUILDER_MIGRANTS", "3"))
+
+# 교환 방향 ("ring": 다음 섬으로, "random": 임의의 다른 섬으로)
+MIGRATION_TOPOLOGY = os.environ.get("TEAMBUILDER_MIGRATION_TOPOLOGY", "ring")
+
+# 최고 적합도가 이 세대 수 동안 개선되지 않으면 종료 (0이면 사용하지 않음)
+STAGNATION_WINDOW = int(os.environ.get("TEAMBUILDER_STAGNATION", "0"))
+
+# 최고 적합도가 이 값 이하가 되면 종료 (0.0은 모든 팀 점수가 같은 이론적 최솟값)
+TARGET_FITNESS = float(os.environ.get("TEAMBUILDER_TARGET_FITNESS", "0.0"))
+
+# 작업당 최대 실행 시간(초) (0이면 사용하지 않음)
+TIME_BUDGET = float(os.environ.get("TEAMBUILDER_TIME_BUDGET", "0"))
+
+# 초기 Population 중 휴리스틱(스네이크 드래프트, 차분법, 인원을 맞춘 무작위 배정)으로 만드는 개체의 비율
+SEED_RATIO = float(os.environ.get("TEAMBUILDER_SEED_RATIO", "0.2"))
+
+# 개체 인코딩 ("free": 팀 번호를 자유롭게 변이, "balanced": 팀 인원이 항상 고르게 유지되는 맞바꾸기 변이와 인원 복구 교차)
+ENCODING = os.environ.get("TEAMBUILDER_ENCODING", "free")
+
+# 유전 알고리즘이 끝난 뒤 최적 개체를 선수 맞바꾸기 언덕 오르기로 다듬을지 여부
+LOCAL_SEARCH = os.environ.get("TEAMBUILDER_LOCAL_SEARCH", "0") == "1"
+
+# 언덕 오르기에서 선수 하나의 이웃을 살펴보는 최대 횟수
+LOCAL_SEARCH_ITERATIONS = int(os.environ.get("TEAMBUILDER_LOCAL_SEARCH_ITERATIONS", "10000"))
+
+# 언덕 오르기의 최대 실행 시간(초)
+LOCAL_SEARCH_TIME = float(os.environ.get("TEAMBUILDER_LOCAL_SEARCH_TIME", "2.0"))
+
+# 동시에 실행하는 작업 수 (작업마다 API 서버와 별도인 워커 프로세스에서 실행)
+CONCURRENCY = int(os.environ.get("TEAMBUILDER_CONCURRENCY", "2"))
+
+# 실행을 기다릴 수 있는 최대 작업 수 (넘으면 /start-task/가 503을 반환)
+MAX_QUEUED = int(os.environ.get("TEAMBUILDER_MAX_QUEUED", "32"))
+
+# 작업 상태 저장소 ("sqlite:<파일 경로>": 재시작해도 남고 여러 서버 워커가 공유, "memory": 프로세스 메모리)
+TASK_STORE = os.environ.get("TEAMBUILDER_TASK_STORE", "sqlite:data/tasks.db")
+
+# 마지막 변경 후 이 시간(초)이 지난 작업 상태는 삭제
+TASK_TTL = float(os.environ.get("TEAMBUILDER_TASK_TTL", "86400"))
+
+# 다른 서버 워커가 맡은 작업을 취소할 때, 이 시간(초) 넘게 진행 상황이 기록되지 않았으면 버려진 작업으로 보고 바로 끝냄
+TASK_STALE_TIME = float(os.environ.get("TEAMBUILDER_TASK_STALE_TIME", "600"))
+
+# 체크포인트(data/{uuid}/checkpoint.npz)를 저장하는 세대 간격 (0이면 저장하지 않음)
+CHECKPOINT_INTERVAL = int(os.environ.get("TEAMBUILDER_CHECKPOINT_INTERVAL", "100"))
+
+# 이전 결과로 시작할 때(warm_start) 이전 배정과 그 변이로 채우는 초기 Population의 비율
+WARM_START_RATIO = float(os.environ.get("TEAMBUILDER_WARM_START_RATIO", "0.5"))
+
+# /progress-stream/이 진행 상황을 확인해 보내는 간격(초), 그 사이의 변경은 하나로 합쳐 보냄
+PROGRESS_STREAM_INTERVAL = float(os.environ.get("TEAMBUILDER_PROGRESS_STREAM_INTERVAL", "1.0"))
+
+# 적합도 캐시에 기억할 정규화된 팀 배정 수 (0이면 사용하지 않음)
+FITNESS_CACHE_SIZE = int(os.environ.get("TEAMBUILDER_FITNESS_CACHE", "0"))
+
+# 풀이 방식 ("auto": 작은 문제는 정확 풀이 후 최적이 증명되지 않으면 유전 알고리즘으로 이어서 탐색,
+# 큰 문제는 계층 분할 풀이, "exact": 항상 정확 풀이만 사용, "ga": 항상 유전 알고리즘만 사용,
+# "hierarchical": 항상 계층 분할 풀이만 사용)
+SOLVER = os.environ.get("TEAMBUILDER_SOLVER", "auto")
+
+# "auto"에서 정확 풀이를 사용할 고정되지 않은 선수 수와 팀 수의 상한
+# (기본값은 분기 한정법이 1초 안팎에 최적을 증명하는 크기, 이보다 크면 시간 안에 증명하지 못하는 경우가 많음)
+EXACT_MAX_FREE_PLAYERS = int(os.environ.get("TEAMBUILDER_EXACT_MAX_FREE_PLAYERS", "8"))
+EXACT_MAX_TEAMS = int(os.environ.get("TEAMBUILDER_EXACT_MAX_TEAMS", "4"))
+
+# 정확 풀이의 최대 탐색 시간(초), 넘으면 그때까지의 최적 배정을 사용
+EXACT_TIME_LIMIT = float(os.environ.get("TEAMBUILDER_EXACT_TIME_LIMIT", "10.0"))
+# "auto"에서 정확 풀이에 쓰는 최대 탐색 시간(초), 증명하지 못하면 유전 알고리즘이 이어서 탐색하므로 짧게 둠
+EXACT_AUTO_TIME_LIMIT = float(os.environ.get("TEAMBUILDER_EXACT_AUTO_TIME_LIMIT", "2.0"))
+
+# 세대별 진행 로그를 남기는 세대 간격 (0이면 남기지 않음, 작업 시작/종료와 오류 로그는 항상 남김)
+GENERATION_LOG_INTERVAL = int(os.environ.get("TEAMBUILDER_GENERATION_LOG_INTERVAL", "0"))
+
+# 프로세스별 측정값(/metrics)을 기록하는 디렉토리와 파일로 내보내는 최소 간격(초)
+METRICS_DIR = os.environ.get("TEAMBUILDER_METRICS_DIR", "data/metrics")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("TEAMBUILDER_METRICS_FLUSH_INTERVAL", "5"))
+
+# 결과 JSON 저장 형식 ("pretty": 들여쓰기, "compact": 공백 없이 작게)
+RESULT_FORMAT = os.environ.get("TEAMBUILDER_RESULT_FORMAT", "pretty")
+
+# 결과 그림에 쓰는 한글 폰트 경로
+FONT_PATH = os.environ.get("TEAMBUILDER_FONT_PATH", "/usr/share/fonts/truetype/nanum/NanumGothic.ttf")
+
+# 결과 그림을 만드는 시점 ("eager": 작업이 끝나면 바로 그림 풀에서 생성, "lazy": 처음 /result/를 요청할 때 생성)
+RENDER_MODE = os.environ.get("TEAMBUILDER_RENDER", "eager")
+
+# 결과 그림의 해상도(dpi)
+RENDER_DPI = int(os.environ.get("TEAMBUILDER_RENDER_DPI", "300"))
+
+# API 서버에서 결과 그림을 만드는 워커 프로세스 수
+RENDER_WORKERS = int(os.environ.get("TEAMBUILDER_RENDER_WORKERS", "1"))
+
+# 같은 내용의 결과 그림을 다시 그리지 않도록 내용 해시로 저장해 두는 디렉토리
+# (기억할 그림 수, 0이면 사용하지 않음 / 마지막으로 쓰인 뒤 보관하는 시간(초), 0이면 만료되지 않음 / 저장 디렉토리)
+RENDER_CACHE_SIZE = int(os.environ.get("TEAMBUILDER_RENDER_CACHE_SIZE", "256"))
+RENDER_CACHE_TTL = float(os.environ.get("TEAMBUILDER_RENDER_CACHE_TTL", "86400"))
+RENDER_CACHE_DIR = os.environ.get("TEAMBUILDER_RENDER_CACHE_DIR", "data/render_cache")
+
+# 세대 진화 방식 ("deap": 개체마다 DEAP 리스트와 Fitness 객체, "array": Population 전체를 배열 하나로 다루는 ArrayEngine)
+# "array"는 같은 시드에서 증분 집계를 쓰지 않는 DEAP 경로와 같은 결과를 내면서 메모리와 할당을 줄입니다.
+ENGINE = os.environ.get("TEAMBUILDER_ENGINE", "deap")
+
+# 같은 명단/옵션으로 다시 요청하면 저장된 결과를 바로 돌려주는 결과 캐시
+# (기억할 결과 수, 0이면 사용하지 않음 / 만료 시간(초), 0이면 만료되지 않음 / 저장 디렉토리)
+RESULT_CACHE_SIZE = int(os.environ.get("TEAMBUILDER_RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_TTL = float(os.environ.get("TEAMBUILDER_RESULT_CACHE_TTL", "86400"))
+RESULT_CACHE_DIR = os.environ.get("TEAMBUILDER_RESULT_CACHE_DIR", "data/result_cache")
+
+# "auto"에서 계층 분할 풀이를 사용할 선수 수의 하한 (0이면 "auto"에서 사용하지 않음)
+HIERARCHICAL_MIN_PLAYERS = int(os.environ.get("TEAMBUILDER_HIERARCHICAL_MIN_PLAYERS", "5000"))
+
+# 계층 분할 풀이 뒤 전체 팀 사이 맞바꾸기의 최대 실행 시간(초)
+HIERARCHICAL_REFINE_TIME = float(os.environ.get("TEAMBUILDER_HIERARCHICAL_REFINE_TIME", "5.0"))
+
+# 적합도 방식 ("scalar": evaluate의 가중합 하나, "pareto": 네 목표를 NSGA-II로 함께 최소화하고 Pareto front를 결과에 저장)
+OBJECTIVES = os.environ.get("TEAMBUILDER_OBJECTIVES", "scalar")
+
+# "pareto"에서 결과 JSON에 저장할 최대 절충안 수
+PARETO_FRONT_SIZE = int(os.environ.get("TEAMBUILDER_PARETO_FRONT_SIZE", "20"))
+
+def solver_options(**overrides):
+    """
+    서버 설정값에 요청별 값을 덮어써 작업 옵션을 만드는 함수.
+    값이 None인 항목은 서버 설정값을 그대로 사용합니다.
+
+    INPUT:
+    - overrides: 요청에서 지정한 옵션 값
+
+    OUTPUT:
+    - options (dict): 작업 옵션
+    """
+    options = {
+        "workers": PARALLEL_WORKERS,
+        "sync_interval": PARALLEL_SYNC_INTERVAL,
+        "islands": ISLANDS,
+        "migration_interval": MIGRATION_INTERVAL,
+        "migrants": MIGRANTS,
+        "topology": MIGRATION_TOPOLOGY,
+        "stagnation": STAGNATION_WINDOW,
+        "target_fitness": TARGET_FITNESS,
+        "time_budget": TIME_BUDGET,
+        "seed_ratio": SEED_RATIO,
+        "encoding": ENCODING,
+        "engine": ENGINE,
+        "local_search": LOCAL_SEARCH,
+        "local_search_iterations": LOCAL_SEARCH_ITERATIONS,
+        "local_search_time": LOCAL_SEARCH_TIME,
+        "fitness_cache": FITNESS_CACHE_SIZE,
+        "checkpoint_interval": CHECKPOINT_INTERVAL,
+        "warm_start": None,
+        "warm_start_ratio": WARM_START_RATIO,
+        "solver": SOLVER,
+        "exact_max_free_players": EXACT_MAX_FREE_PLAYERS,
+        "exact_max_teams": EXACT_MAX_TEAMS,
+        "exact_time_limit": EXACT_TIME_LIMIT,
+        "exact_auto_time_limit": EXACT_AUTO_TIME_LIMIT,
+        "hierarchical_min_players": HIERARCHICAL_MIN_PLAYERS,
+        "hierarchical_refine_time": HIERARCHICAL_REFINE_TIME,
+        "objectives": OBJECTIVES,
+        "pareto_front_size": PARETO_FRONT_SIZE,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
@@ -0,0 +1,226 @@
+import time
+from deap import creator
+from genetic_algorithm import evaluate
+from seeding import team_targets, differencing_individual, snake_draft_individual, balanced_random_individual
+from local_search import local_search
+
+INITIAL_RANDOM_STARTS = 6
+
+class _Timeout(Exception):
+    pass
+
+def _filled(level, lower, upper):
+    total = 0.0
+    for low, high in zip(lower, upper):
+        total += low if level < low else high if level > high else level
+    return total
+
+def _water_level(lower, upper, total):
+    # 각 팀 합계를 [lower, upper] 범위로 자른 값의 합이 total이 되는 수위 (낮은 팀부터 채우기)
+    points = sorted(lower + upper)
+    low, high = 0, len(points) - 1
+    # 채운 양은 수위에 대해 단조 증가하므로 total을 넘는 첫 구간을 이분 탐색
+    while high - low > 1:
+        middle = (low + high) // 2
+        if _filled(points[middle], lower, upper) >= total:
+            high = middle
+        else:
+            low = middle
+    low_sum, high_sum = _filled(points[low], lower, upper), _filled(points[high], lower, upper)
+    if high_sum <= low_sum:
+        return points[high]
+    return points[low] + (points[high] - points[low]) * (total - low_sum) / (high_sum - low_sum)
+
+def _component_bound(lower, upper, total, num_teams):
+    # 팀 합계가 [lower, upper] 범위이고 합이 total일 때 (최대-최소) 차이와 분산의 하한
+    mean = total / num_teams
+    level = _water_level(lower, upper, total)
+    filled = [min(max(level, low), high) for low, high in zip(lower, upper)]
+    variance = sum((value - mean) ** 2 for value in filled) / num_teams
+    lowest = min(min(upper), mean)
+    if min(lower) <= level:
+        lowest = min(lowest, level)
+    balance = max(0.0, max(max(lower), mean) - lowest)
+    return balance, variance
+
+def lower_bound(avg_range, max_range, avg_total, max_total, num_teams):
+    """
+    일부 선수만 배정된 상태에서 남은 선수를 어떻게 배정해도 내려갈 수 없는 적합도 하한을 구하는 함수.
+    팀별 최종 합계가 가질 수 있는 범위 안에서 가장 고르게 채운 경우를 기준으로 합니다.
+
+    INPUT:
+    - avg_range (tuple): 팀별 최종 평균 점수 합계의 (하한 리스트, 상한 리스트)
+    - max_range (tuple): 팀별 최종 최고 점수 합계의 (하한 리스트, 상한 리스트)
+    - avg_total (float): 모든 선수의 평균 점수 합계
+    - max_total (float): 모든 선수의 최고 점수 합계
+    - num_teams (int): 팀의 수
+
+    OUTPUT:
+    - bound (float): evaluate 적합도의 하한
+    """
+    avg_balance, avg_variance = _component_bound(*avg_range, avg_total, num_teams)
+    max_balance, max_variance = _component_bound(*max_range, max_total, num_teams)
+    return avg_balance + max_balance + avg_variance + max_variance * 0.7
+
+def _prefix_sums(values):
+    sums = [0.0]
+    for value in values:
+        sums.append(sums[-1] + value)
+    return sums
+
+def _team_ranges(sums, counts, smallest, largest, remaining, min_team_size, max_team_size):
+    # 남은 선수 중 가장 작은/큰 점수로 인원을 채웠을 때의 팀별 최종 합계 범위
+    needs = [max(0, min_team_size - count) for count in counts]
+    total_need = sum(needs)
+    lower, upper = [], []
+    for value, count, need in zip(sums, counts, needs):
+        room = min(max_team_size - count, remaining - (total_need - need))
+        lower.append(value + smallest[need])
+        upper.append(value + largest[room])
+    return lower, upper
+
+def is_small_roster(num_teams, fixed_assignments, players, max_free_players, max_teams):
+    """
+    정확 풀이(exact_solve)로 다룰 만큼 작은 문제인지 확인하는 함수
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - max_free_players (int): 고정되지 않은 선수 수의 상한
+    - max_teams (int): 팀 수의 상한
+
+    OUTPUT:
+    - small (bool): 정확 풀이 대상 여부
+    """
+    free_players = sum(1 for player in players if player['name'] not in fixed_assignments)
+    return num_teams <= max_teams and free_players <= max_free_players
+
+def exact_solve(num_teams, fixed_assignments, players, time_limit=10.0, should_stop=None):
+    """
+    분기 한정법(branch and bound)으로 evaluate 적합도가 가장 낮은 팀 배정을 찾는 함수.
+
+    점수가 높은 선수부터 팀을 정하며, lower_bound가 지금까지의 최적값 이상인 가지와
+    남은 선수로 최소 인원을 채울 수 없는 가지는 잘라냅니다. 하한은 팀별로 남은 인원을 가장 작은/큰
+    점수로 채웠을 때의 합계 범위를 이용합니다. 상태가 같은 팀(예: 아직 아무도 없는 고정 선수 없는 팀)은
+    하나만 시도해 팀 번호만 다른 같은 배정을 반복하지 않습니다. 탐색 대상은 모든 팀이 최소 인원
+    (len(players) // num_teams)을 채운 배정이며, 고정 선수는 지정된 팀에 둡니다.
+    시작 상한은 휴리스틱 배정 여러 개를 언덕 오르기로 다듬은 값 중 가장 좋은 값입니다.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - time_limit (float): 최대 탐색 시간(초), 넘으면 지금까지의 최적 배정을 반환
+    - should_stop (callable): True를 반환하면 탐색을 멈추는 함수 (작업 취소 확인용)
+
+    OUTPUT:
+    - best (creator.Individual): 찾은 최적 개체 (적합도 포함)
+    - report (dict): 최적성 증명 여부(optimal), 탐색한 노드 수, 실행 시간
+    """
+    start_time = time.time()
+    min_team_size = len(players) // num_teams
+
+    # 휴리스틱 배정 몇 개를 언덕 오르기로 다듬어 가장 좋은 값을 시작 상한으로 사용
+    targets = team_targets(num_teams, fixed_assignments, players)
+    starts = [differencing_individual(num_teams, fixed_assignments, players, targets),
+              snake_draft_individual(num_teams, fixed_assignments, players, targets)]
+    starts += [balanced_random_individual(num_teams, fixed_assignments, players, targets)
+               for _ in range(INITIAL_RANDOM_STARTS)]
+    if any(player['name'] not in fixed_assignments for player in players):
+        polished = [local_search(start, num_teams, fixed_assignments, players,
+                                 time_budget=time_limit / 10 / len(starts))[0] for start in starts]
+    else:
+        # 모두 고정 선수면 다듬을 것이 없음
+        polished = [creator.Individual(start) for start in starts]
+        for individual in polished:
+            individual.fitness.values = evaluate(individual, num_teams, players)
+    initial = min(polished, key=lambda individual: individual.fitness.values[0])
+    best = {"fitness": initial.fitness.values[0], "assignment": list(initial)}
+
+    assignment = [0] * len(players)
+    counts = [0] * num_teams
+    avg_sums = [0.0] * num_teams
+    max_sums = [0.0] * num_teams
+    free_indices = []
+    for i, player in enumerate(players):
+        if player['name'] in fixed_assignments:
+            team = fixed_assignments[player['name']]
+            assignment[i] = team
+            counts[team] += 1
+            avg_sums[team] += player['avg']
+            max_sums[team] += player['max']
+        else:
+            free_indices.append(i)
+    free_indices.sort(key=lambda i: -(players[i]['avg'] + players[i]['max']))
+
+    avg_total = sum(player['avg'] for player in players)
+    max_total = sum(player['max'] for player in players)
+    avg_scores = [players[i]['avg'] for i in free_indices]
+    max_scores = [players[i]['max'] for i in free_indices]
+    # 깊이별로 남은 선수 점수를 정렬한 누적 합 (최소/최대 채움 계산용)
+    avg_smallest = [_prefix_sums(sorted(avg_scores[depth:])) for depth in range(len(free_indices) + 1)]
+    avg_largest = [_prefix_sums(sorted(avg_scores[depth:], reverse=True)) for depth in range(len(free_indices) + 1)]
+    max_smallest = [_prefix_sums(sorted(max_scores[depth:])) for depth in range(len(free_indices) + 1)]
+    max_largest = [_prefix_sums(sorted(max_scores[depth:], reverse=True)) for depth in range(len(free_indices) + 1)]
+    max_team_size = len(players) - (num_teams - 1) * min_team_size
+    nodes = [0]
+
+    def node_bound(depth):
+        # 앞의 depth명을 배정한 현재 상태의 하한 (최소 인원을 채울 수 없으면 inf)
+        remaining = len(free_indices) - depth
+        if sum(max(0, min_team_size - count) for count in counts) > remaining:
+            return float("inf")
+        avg_range = _team_ranges(avg_sums, counts, avg_smallest[depth], avg_largest[depth],
+                                 remaining, min_team_size, max_team_size)
+        max_range = _team_ranges(max_sums, counts, max_smallest[depth], max_largest[depth],
+                                 remaining, min_team_size, max_team_size)
+        return lower_bound(avg_range, max_range, avg_total, max_total, num_teams)
+
+    def place(depth, team, sign):
+        counts[team] += sign
+        avg_sums[team] += sign * avg_scores[depth]
+        max_sums[team] += sign * max_scores[depth]
+
+    def search(depth):
+        nodes[0] += 1
+        if nodes[0] % 1024 == 0 and (time.time() - start_time > time_limit or (should_stop and should_stop())):
+            raise _Timeout
+        if depth == len(free_indices):
+            fitness = evaluate(assignment, num_teams, players)[0]
+            if fitness < best["fitness"]:
+                best["fitness"], best["assignment"] = fitness, list(assignment)
+            return
+
+        # 자식 노드의 하한을 먼저 구해 유망한 팀부터 탐색
+        children, tried = [], set()
+        for team in range(num_teams):
+            state = (counts[team], avg_sums[team], max_sums[team])
+            if state in tried or counts[team] >= max_team_size:
+                continue
+            tried.add(state)
+            place(depth, team, 1)
+            children.append((node_bound(depth + 1), team))
+            place(depth, team, -1)
+        children.sort()
+
+        for bound, team in children:
+            if bound >= best["fitness"] - 1e-9:
+                break
+            assignment[free_indices[depth]] = team
+            place(depth, team, 1)
+            try:
+                search(depth + 1)
+            finally:
+                place(depth, team, -1)
+
+    optimal = True
+    try:
+        search(0)
+    except _Timeout:
+        optimal = False
+
+    solution = creator.Individual(best["assignment"])
+    solution.fitness.values = evaluate(solution, num_teams, players)
+    report = {"optimal": optimal, "nodes": nodes[0], "run_time": round(time.time() - start_time, 3)}
+    return solution, report
@@ -1,5 +1,36 @@
 import random
-from deap import creator
+from collections import OrderedDict
+import numpy as np
+from deap import base, creator, tools, algorithms
+import metrics
+from seeding import seed_population, warm_start_population, team_targets, balanced_random_individual, repair_sizes
+
+# 증분 집계값의 부동소수점 오차를 없애기 위해 집계값을 다시 계산하는 세대 간격
+AGGREGATE_REFRESH_INTERVAL = 100
+
+# 최소 인원을 채우지 못한 배정의 적합도에 정상 배정의 상한보다 더 얹는 벌점
+INFEASIBLE_PENALTY = 1000.0
+
+def ensure_creator():
+    """
+    DEAP creator에 FitnessMin / Individual 클래스와 다목적 모드(pareto.py)의 FitnessPareto / ParetoIndividual을 등록하는 함수.
+    API 프로세스와 워커 프로세스 어디서 호출해도 한 번만 생성됩니다.
+
+    INPUT:
+    - 없음
+
+    OUTPUT:
+    - 없음
+    """
+    if not hasattr(creator, "FitnessMin"):
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+    if not hasattr(creator, "Individual"):
+        creator.create("Individual", list, fitness=creator.FitnessMin)
+    if not hasattr(creator, "FitnessPareto"):
+        creator.create("FitnessPareto", base.Fitness, weights=(-1.0, -1.0, -1.0, -1.0))
+    if not hasattr(creator, "ParetoIndividual"):
+        creator.create("ParetoIndividual", list, fitness=creator.FitnessPareto)
+
 
 def init_individual(num_teams, fixed_assignments, players):
     """
@@ -64,7 +95,8 @@ def evaluate(individual, num_teams, players):
         team_max_scores[team] += player['max']
     
     if min(team_counts) < len(players) // num_teams:
-        return (1000,)
+        return (infeasible_fitness(sum(abs(score) for score in team_avg_scores),
+                                   sum(abs(score) for score in team_max_scores)),)
     
     team_avg_score_balance = max(team_avg_scores) - min(team_avg_scores)
     team_max_score_balance = max(team_max_scores) - min(team_max_scores)
@@ -73,3 +105,668 @@ def evaluate(individual, num_teams, players):
     max_score_variance = sum((score - sum(team_max_scores) / num_teams) ** 2 for score in team_max_scores) / num_teams
     
     return (team_avg_score_balance + team_max_score_balance + avg_score_variance + max_score_variance * 0.7,)
+
+def infeasible_fitness(avg_total, max_total):
+    """
+    최소 인원을 채우지 못한 배정의 적합도.
+    팀 합계의 차이는 팀 합계 절댓값의 합(S)을, 분산은 S^2을 넘을 수 없으므로 정상 배정의 적합도는
+    S_avg + S_max + S_avg^2 + S_max^2 * 0.7 이하입니다. 여기에 INFEASIBLE_PENALTY를 더해 어떤 정상 배정보다 나쁘게 만듭니다.
+    (선수 점수가 커서 정상 배정의 적합도가 고정 벌점보다 커도 선택이 최소 인원을 못 채운 개체로 몰리지 않음)
+
+    INPUT:
+    - avg_total (float 또는 np.ndarray): 팀별 평균 점수 합계의 절댓값 합 (S_avg)
+    - max_total (float 또는 np.ndarray): 팀별 최고 점수 합계의 절댓값 합 (S_max)
+
+    OUTPUT:
+    - fitness (float 또는 np.ndarray): 최소 인원을 못 채운 배정의 적합도
+    """
+    # evaluate와 fitness_from_team_sums의 값이 비트 단위로 같도록 ** 대신 곱셈을 씁니다.
+    return avg_total + max_total + avg_total * avg_total + max_total * max_total * 0.7 + INFEASIBLE_PENALTY
+
+def player_arrays(players):
+    """
+    선수들의 평균/최고 점수를 벡터로 미리 계산하는 함수.
+    세대마다 player dict를 다시 조회하지 않도록 작업 시작 시 한 번만 호출합니다.
+
+    INPUT:
+    - players (list): 일반 선수 리스트
+
+    OUTPUT:
+    - avg_scores (np.ndarray): 선수별 평균 점수 (float64)
+    - max_scores (np.ndarray): 선수별 최고 점수 (float64)
+    """
+    avg_scores = np.array([player['avg'] for player in players], dtype=np.float64)
+    max_scores = np.array([player['max'] for player in players], dtype=np.float64)
+    return avg_scores, max_scores
+
+def team_sums(population, num_teams, avg_scores, max_scores):
+    """
+    Population 전체의 팀별 인원 수와 점수 합계를 한 번에 계산하는 함수.
+    개체마다 팀 번호에 오프셋을 더해 bincount 한 번으로 모든 개체를 집계합니다.
+    bincount는 입력 순서대로 더하므로 evaluate의 합계와 결과가 같습니다.
+
+    INPUT:
+    - population (np.ndarray): (개체 수, 선수 수) 크기의 팀 배정 배열
+    - num_teams (int): 팀의 수
+    - avg_scores (np.ndarray): 선수별 평균 점수
+    - max_scores (np.ndarray): 선수별 최고 점수
+
+    OUTPUT:
+    - counts (np.ndarray): (개체 수, 팀 수) 팀별 인원 수
+    - avg_sums (np.ndarray): (개체 수, 팀 수) 팀별 평균 점수 합계
+    - max_sums (np.ndarray): (개체 수, 팀 수) 팀별 최고 점수 합계
+    """
+    population = np.asarray(population, dtype=np.intp)
+    num_individuals, num_players = population.shape
+    size = num_individuals * num_teams
+    bins = (population + np.arange(num_individuals)[:, None] * num_teams).ravel()
+
+    counts = np.bincount(bins, minlength=size).reshape(num_individuals, num_teams)
+    avg_sums = np.bincount(bins, weights=np.tile(avg_scores, num_individuals), minlength=size)
+    max_sums = np.bincount(bins, weights=np.tile(max_scores, num_individuals), minlength=size)
+    return counts, avg_sums.reshape(num_individuals, num_teams), max_sums.reshape(num_individuals, num_teams)
+
+def fitness_from_team_sums(counts, avg_sums, max_sums, min_team_size, exact=True):
+    """
+    팀별 집계값으로부터 적합도를 계산하는 함수.
+    evaluate와 같은 순서로 연산하여 값이 비트 단위로 일치합니다.
+
+    INPUT:
+    - counts (np.ndarray): (개체 수, 팀 수) 팀별 인원 수
+    - avg_sums (np.ndarray): (개체 수, 팀 수) 팀별 평균 점수 합계
+    - max_sums (np.ndarray): (개체 수, 팀 수) 팀별 최고 점수 합계
+    - min_team_size (int): 팀의 최소 인원 수 (len(players) // num_teams)
+    - exact (bool): False면 마지막 자리까지의 일치 대신 numpy 연산 속도를 택함 (후보 비교용)
+
+    OUTPUT:
+    - fitness (np.ndarray): 개체별 적합도 (값이 작을수록 적합함)
+    """
+    num_teams = counts.shape[1]
+
+    team_avg_score_balance = avg_sums.max(axis=1) - avg_sums.min(axis=1)
+    team_max_score_balance = max_sums.max(axis=1) - max_sums.min(axis=1)
+
+    if exact:
+        avg_score_variance = _sequential_sum(_squared(avg_sums - (_sequential_sum(avg_sums) / num_teams)[:, None])) / num_teams
+        max_score_variance = _sequential_sum(_squared(max_sums - (_sequential_sum(max_sums) / num_teams)[:, None])) / num_teams
+    else:
+        avg_score_variance = avg_sums.var(axis=1)
+        max_score_variance = max_sums.var(axis=1)
+
+    fitness = team_avg_score_balance + team_max_score_balance + avg_score_variance + max_score_variance * 0.7
+    infeasible = infeasible_fitness(_sequential_sum(np.abs(avg_sums)), _sequential_sum(np.abs(max_sums)))
+    return np.where(counts.min(axis=1) < min_team_size, infeasible, fitness)
+
+def evaluate_population(population, num_teams, avg_scores, max_scores):
+    """
+    Population 전체의 적합도를 한 번에 평가하는 함수.
+    개체마다 evaluate를 호출한 것과 같은 값을 반환합니다.
+
+    INPUT:
+    - population (np.ndarray): (개체 수, 선수 수) 크기의 팀 배정 배열
+    - num_teams (int): 팀의 수
+    - avg_scores (np.ndarray): 선수별 평균 점수
+    - max_scores (np.ndarray): 선수별 최고 점수
+
+    OUTPUT:
+    - fitness (np.ndarray): 개체별 적합도 (값이 작을수록 적합함)
+    """
+    counts, avg_sums, max_sums = team_sums(population, num_teams, avg_scores, max_scores)
+    return fitness_from_team_sums(counts, avg_sums, max_sums, len(avg_scores) // num_teams)
+
+def _sequential_sum(values):
+    # numpy의 pairwise 합산 대신 파이썬 sum()과 같은 순서로 팀별 값을 더합니다.
+    total = np.zeros(values.shape[0])
+    for team in range(values.shape[1]):
+        total += values[:, team]
+    return total
+
+def _squared(values):
+    # 파이썬의 ** 연산(libm pow)은 x * x와 마지막 자리가 다를 수 있어 원소별로 계산합니다.
+    return np.array([value ** 2 for value in values.ravel().tolist()]).reshape(values.shape)
+
+def gene_weights(avg_scores, max_scores):
+    """
+    집계값 갱신에 사용할 선수별 점수를 파이썬 리스트로 만드는 함수.
+    변이/교차에서 바뀌는 유전자는 몇십 개 수준이라 numpy 스칼라 연산보다 리스트가 빠릅니다.
+
+    INPUT:
+    - avg_scores (np.ndarray): 선수별 평균 점수
+    - max_scores (np.ndarray): 선수별 최고 점수
+
+    OUTPUT:
+    - weights (tuple): 선수별 (평균 점수, 최고 점수) 리스트
+    """
+    return avg_scores.tolist(), max_scores.tolist()
+
+def attach_aggregates(individual, num_teams, weights):
+    """
+    개체에 팀별 집계값(인원 수, 평균 점수 합, 최고 점수 합)을 붙이는 함수.
+    변이/교차 연산자는 이 집계값을 바뀐 유전자만큼만 갱신합니다.
+
+    INPUT:
+    - individual (creator.Individual): 집계값을 붙일 개체
+    - num_teams (int): 팀의 수
+    - weights (tuple): gene_weights로 만든 선수별 (평균 점수, 최고 점수) 리스트
+
+    OUTPUT:
+    - individual (creator.Individual): aggregates 속성([인원 수, 평균 점수 합, 최고 점수 합])이 추가된 개체
+    """
+    counts = [0] * num_teams
+    avg_sums = [0.0] * num_teams
+    max_sums = [0.0] * num_teams
+    for team, avg_score, max_score in zip(individual, *weights):
+        counts[team] += 1
+        avg_sums[team] += avg_score
+        max_sums[team] += max_score
+    individual.aggregates = [counts, avg_sums, max_sums]
+    return individual
+
+def refresh_aggregates(individuals, num_teams, avg_scores, max_scores):
+    """
+    개체들의 집계값을 처음부터 다시 계산하는 함수.
+    증분 갱신에서 누적되는 부동소수점 오차를 주기적으로 없애는 데 사용합니다.
+
+    INPUT:
+    - individuals (list): 집계값을 다시 계산할 개체 리스트
+    - num_teams (int): 팀의 수
+    - avg_scores (np.ndarray): 선수별 평균 점수
+    - max_scores (np.ndarray): 선수별 최고 점수
+
+    OUTPUT:
+    - 없음
+    """
+    if not individuals:
+        return
+    counts, avg_sums, max_sums = team_sums(np.array(individuals, dtype=np.intp), num_teams, avg_scores, max_scores)
+    for ind, count, avg_sum, max_sum in zip(individuals, counts.tolist(), avg_sums.tolist(), max_sums.tolist()):
+        ind.aggregates = [count, avg_sum, max_sum]
+
+def init_tracked_individual(num_teams, fixed_assignments, players, weights):
+    """
+    init_individual로 만든 개체에 팀별 집계값을 붙여 반환하는 함수.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - weights (tuple): gene_weights로 만든 선수별 (평균 점수, 최고 점수) 리스트
+
+    OUTPUT:
+    - individual (creator.Individual): 집계값이 붙은 초기 개체
+    """
+    individual = init_individual(num_teams, fixed_assignments, players)
+    return attach_aggregates(individual, num_teams, weights)
+
+def gene_delta(weights, indices, old_teams, new_teams, num_teams):
+    """
+    선수들이 old_teams에서 new_teams로 옮겨갈 때 집계값의 변화량을 계산하는 함수.
+    바뀐 유전자 수에 비례하는 시간이 걸립니다.
+
+    INPUT:
+    - weights (tuple): gene_weights로 만든 선수별 (평균 점수, 최고 점수) 리스트
+    - indices (iterable): 옮겨간 선수의 인덱스
+    - old_teams (list): 옮기기 전 팀 번호
+    - new_teams (list): 옮긴 후 팀 번호
+    - num_teams (int): 팀의 수
+
+    OUTPUT:
+    - delta (list): [인원 수, 평균 점수 합, 최고 점수 합] 순서의 팀별 변화량
+    """
+    avg_scores, max_scores = weights
+    counts = [0] * num_teams
+    avg_sums = [0.0] * num_teams
+    max_sums = [0.0] * num_teams
+    for i, old_team, new_team in zip(indices, old_teams, new_teams):
+        if old_team != new_team:
+            counts[old_team] -= 1
+            counts[new_team] += 1
+            avg_sums[old_team] -= avg_scores[i]
+            avg_sums[new_team] += avg_scores[i]
+            max_sums[old_team] -= max_scores[i]
+            max_sums[new_team] += max_scores[i]
+    return [counts, avg_sums, max_sums]
+
+def apply_delta(aggregates, delta, sign=1):
+    """
+    gene_delta로 구한 변화량을 개체의 집계값에 반영하는 함수.
+
+    INPUT:
+    - aggregates (list): 갱신할 개체의 집계값 (제자리에서 수정됨)
+    - delta (list): gene_delta의 결과
+    - sign (int): 1이면 더하고 -1이면 뺌
+
+    OUTPUT:
+    - 없음
+    """
+    for values, changes in zip(aggregates, delta):
+        for team, change in enumerate(changes):
+            values[team] += sign * change
+
+def incremental_mutate(individual, indpb, free_indices, num_teams, weights):
+    """
+    custom_mutate와 같은 변이를 적용하면서 바뀐 유전자만큼 집계값을 갱신하는 함수.
+    난수 사용 순서가 custom_mutate와 같아 같은 시드에서 같은 결과를 냅니다.
+
+    INPUT:
+    - individual (creator.Individual): 변이를 적용할 개체 (aggregates 필요)
+    - indpb (float): 변이 확률
+    - free_indices (list): 고정되지 않은 선수의 인덱스
+    - num_teams (int): 팀의 수
+    - weights (tuple): gene_weights로 만든 선수별 (평균 점수, 최고 점수) 리스트
+
+    OUTPUT:
+    - individual (creator.Individual): 변이가 적용된 개체
+    """
+    indices, old_teams, new_teams = [], [], []
+    for i in free_indices:
+        if random.random() < indpb:
+            indices.append(i)
+            old_teams.append(individual[i])
+            new_teams.append(random.randint(0, num_teams - 1))
+    for i, new_team in zip(indices, new_teams):
+        individual[i] = new_team
+    if indices:
+        apply_delta(individual.aggregates, gene_delta(weights, indices, old_teams, new_teams, num_teams))
+    return individual,
+
+def incremental_mate(ind1, ind2, weights):
+    """
+    tools.cxTwoPoint와 같은 두 점 교차를 적용하면서 교환 구간만큼 집계값을 갱신하는 함수.
+    교차점 선택은 cxTwoPoint와 같은 방식으로 난수를 사용합니다.
+
+    INPUT:
+    - ind1, ind2 (creator.Individual): 교차할 두 개체 (aggregates 필요)
+    - weights (tuple): gene_weights로 만든 선수별 (평균 점수, 최고 점수) 리스트
+
+    OUTPUT:
+    - ind1, ind2 (creator.Individual): 교차가 적용된 개체
+    """
+    size = min(len(ind1), len(ind2))
+    cxpoint1 = random.randint(1, size)
+    cxpoint2 = random.randint(1, size - 1)
+    if cxpoint2 >= cxpoint1:
+        cxpoint2 += 1
+    else:
+        cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+
+    segment1, segment2 = ind1[cxpoint1:cxpoint2], ind2[cxpoint1:cxpoint2]
+    ind1[cxpoint1:cxpoint2], ind2[cxpoint1:cxpoint2] = segment2, segment1
+
+    delta = gene_delta(weights, range(cxpoint1, cxpoint2), segment1, segment2, len(ind1.aggregates[0]))
+    apply_delta(ind1.aggregates, delta)
+    apply_delta(ind2.aggregates, delta, sign=-1)
+    return ind1, ind2
+
+def init_balanced_individual(num_teams, fixed_assignments, players, targets, weights=None):
+    """
+    팀별 목표 인원을 지키는 초기 개체를 만드는 함수. (balanced 인코딩)
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - targets (list): 팀별 목표 인원 수
+    - weights (tuple): 주어지면 증분 집계값을 붙임
+
+    OUTPUT:
+    - individual (creator.Individual): 초기화된 개체
+    """
+    individual = creator.Individual(balanced_random_individual(num_teams, fixed_assignments, players, targets))
+    if weights is not None:
+        attach_aggregates(individual, num_teams, weights)
+    return individual
+
+def swap_mutate(individual, indpb, free_indices, weights=None):
+    """
+    고정되지 않은 선수 두 명의 팀을 맞바꾸는 변이 함수. (balanced 인코딩)
+    고정되지 않은 선수마다 indpb 확률로 다른 임의의 선수와 팀을 맞바꾸므로 팀 인원은 바뀌지 않습니다.
+
+    INPUT:
+    - individual (creator.Individual): 변이를 적용할 개체
+    - indpb (float): 변이 확률
+    - free_indices (list): 고정되지 않은 선수의 인덱스
+    - weights (tuple): 주어지면 개체의 증분 집계값을 함께 갱신
+
+    OUTPUT:
+    - individual (creator.Individual): 변이가 적용된 개체
+    """
+    indices, old_teams, new_teams = [], [], []
+    for i in free_indices:
+        if random.random() < indpb:
+            j = random.choice(free_indices)
+            if individual[i] != individual[j]:
+                indices += [i, j]
+                old_teams += [individual[i], individual[j]]
+                new_teams += [individual[j], individual[i]]
+                individual[i], individual[j] = individual[j], individual[i]
+    if weights is not None and indices:
+        apply_delta(individual.aggregates, gene_delta(weights, indices, old_teams, new_teams, len(individual.aggregates[0])))
+    return individual,
+
+def balanced_mate(ind1, ind2, targets, free_indices, players, weights=None):
+    """
+    두 점 교차 후 팀 인원을 목표 인원으로 되돌리는 교차 함수. (balanced 인코딩)
+    고정 선수는 두 부모가 같은 팀이므로 교차로 바뀌지 않고, 복구 단계에서도 옮기지 않습니다.
+
+    INPUT:
+    - ind1, ind2 (creator.Individual): 교차할 두 개체
+    - targets (list): 팀별 목표 인원 수
+    - free_indices (list): 고정되지 않은 선수의 인덱스
+    - players (list): 일반 선수 리스트
+    - weights (tuple): 주어지면 개체의 증분 집계값을 함께 갱신
+
+    OUTPUT:
+    - ind1, ind2 (creator.Individual): 교차가 적용된 개체
+    """
+    if weights is not None:
+        incremental_mate(ind1, ind2, weights)
+    else:
+        tools.cxTwoPoint(ind1, ind2)
+
+    for ind in (ind1, ind2):
+        moves = []
+        repair_sizes(ind, targets, free_indices, players, moves)
+        if weights is not None and moves:
+            indices, old_teams, new_teams = zip(*moves)
+            apply_delta(ind.aggregates, gene_delta(weights, indices, old_teams, new_teams, len(ind.aggregates[0])))
+    return ind1, ind2
+
+def clone_individual(individual):
+    """
+    개체를 복제하는 함수.
+    varAnd가 기본으로 사용하는 deepcopy는 유전자 하나하나를 복사하므로, 리스트와 적합도,
+    집계값만 얕게 복사합니다.
+
+    INPUT:
+    - individual (creator.Individual): 복제할 개체
+
+    OUTPUT:
+    - clone (creator.Individual): 복제된 개체
+    """
+    clone = creator.Individual(individual)
+    clone.fitness.wvalues = individual.fitness.wvalues
+    aggregates = getattr(individual, 'aggregates', None)
+    if aggregates is not None:
+        clone.aggregates = [list(values) for values in aggregates]
+    return clone
+
+def evaluate_individuals(individuals, num_teams, avg_scores, max_scores):
+    """
+    개체 리스트를 배열로 바꿔 evaluate_population으로 평가하는 함수.
+
+    INPUT:
+    - individuals (list): 평가할 개체 리스트
+    - num_teams (int): 팀의 수
+    - avg_scores (np.ndarray): 선수별 평균 점수
+    - max_scores (np.ndarray): 선수별 최고 점수
+
+    OUTPUT:
+    - fitness (list): 개체별 적합도
+    """
+    if not individuals:
+        return []
+    return evaluate_population(np.array(individuals, dtype=np.intp), num_teams, avg_scores, max_scores).tolist()
+
+def evaluate_aggregates(individuals, min_team_size):
+    """
+    개체에 붙은 팀별 집계값만으로 적합도를 계산하는 함수.
+    선수 명단을 다시 훑지 않으므로 개체당 O(팀 수)입니다.
+
+    INPUT:
+    - individuals (list): 평가할 개체 리스트 (aggregates 필요)
+    - min_team_size (int): 팀의 최소 인원 수
+
+    OUTPUT:
+    - fitness (list): 개체별 적합도
+    """
+    if not individuals:
+        return []
+    aggregates = np.array([ind.aggregates for ind in individuals], dtype=np.float64)
+    return fitness_from_team_sums(aggregates[:, 0], aggregates[:, 1], aggregates[:, 2], min_team_size).tolist()
+
+def canonical_keys(genes, num_teams):
+    """
+    팀 번호만 다른 같은 팀 구성이 같은 키를 갖도록 개체를 정규화하는 함수.
+    팀 번호를 처음 등장하는 순서대로 0, 1, 2, ...로 다시 붙입니다.
+
+    고정 선수가 있으면 팀 번호를 바꾼 개체는 실제로는 만들어지지 않지만, 적합도는 팀 번호의 순서와
+    무관하므로 적합도 캐시의 키로는 모든 팀 번호를 정규화해도 같은 값을 가리킵니다.
+
+    INPUT:
+    - genes (np.ndarray): (개체 수, 선수 수) 모양의 팀 배정 배열
+    - num_teams (int): 팀의 수
+
+    OUTPUT:
+    - keys (list): 개체별 정규화된 배정의 bytes 키
+    """
+    num_individuals, num_players = genes.shape
+    rows = np.arange(num_individuals)[:, None]
+    # 팀별 첫 등장 위치 (없는 팀은 선수 수)
+    first_seen = np.full((num_individuals, num_teams), num_players)
+    np.minimum.at(first_seen, (np.broadcast_to(rows, genes.shape), genes), np.arange(num_players))
+    order = np.argsort(first_seen, axis=1, kind="stable")
+    labels = np.empty_like(order)
+    labels[rows, order] = np.arange(num_teams)
+    canonical = labels[rows, genes].astype(np.uint8 if num_teams <= 256 else np.int32)
+    return [row.tobytes() for row in canonical]
+
+class FitnessCache:
+    """
+    정규화된 팀 배정을 키로 적합도를 기억하는 LRU 캐시.
+
+    Population이 수렴하면 varAnd가 같은 개체나 팀 번호만 바뀐 개체를 많이 만들기 때문에,
+    이미 평가한 배정은 다시 계산하지 않고 캐시에서 꺼냅니다.
+    """
+
+    def __init__(self, num_teams, maxsize):
+        """
+        INPUT:
+        - num_teams (int): 팀의 수
+        - maxsize (int): 기억할 최대 배정 수 (넘으면 가장 오래 쓰지 않은 항목부터 삭제)
+        """
+        self.num_teams = num_teams
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, individuals, evaluate_population):
+        """
+        캐시에 없는 개체만 evaluate_population으로 평가하고 결과를 캐시에 넣는 함수.
+        같은 호출 안에서 겹치는 배정은 한 번만 평가합니다.
+
+        INPUT:
+        - individuals (list): 평가할 개체 리스트
+        - evaluate_population (callable): 개체 리스트를 받아 적합도 리스트를 반환하는 평가 함수
+
+        OUTPUT:
+        - fitness (list): 개체별 적합도
+        """
+        if not individuals:
+            return []
+        keys = canonical_keys(np.array(individuals, dtype=np.intp), self.num_teams)
+        fitness = [None] * len(individuals)
+        pending = {}
+        for i, key in enumerate(keys):
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                fitness[i] = self.entries[key]
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(i)
+                self.hits += 1
+            else:
+                pending[key] = [i]
+                self.misses += 1
+
+        if pending:
+            firsts = [positions[0] for positions in pending.values()]
+            for (key, positions), fit in zip(pending.items(), evaluate_population([individuals[i] for i in firsts])):
+                for i in positions:
+                    fitness[i] = fit
+                self.entries[key] = fit
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return fitness
+
+    def stats(self):
+        """
+        OUTPUT:
+        - stats (dict): 캐시 적중(hits)/실패(misses) 횟수와 현재 크기(size)
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+def population_to_arrays(population):
+    """
+    개체 리스트를 팀 배정 배열과 적합도 벡터로 바꾸는 함수.
+    프로세스 간에 Population을 주고받을 때 개체 객체 대신 이 배열을 보냅니다.
+
+    INPUT:
+    - population (list): 개체 리스트
+
+    OUTPUT:
+    - genes (np.ndarray): (개체 수, 선수 수) 크기의 팀 배정 배열 (int16)
+    - fitness (np.ndarray): 개체별 적합도 (평가되지 않은 개체는 nan)
+    """
+    if hasattr(population, "arrays"):
+        # array_engine.ArrayPopulation은 이미 배열로 들고 있음
+        return population.arrays()
+    genes = np.array(population, dtype=np.int16)
+    fitness = np.array([ind.fitness.values[0] if ind.fitness.valid else np.nan for ind in population], dtype=np.float64)
+    return genes, fitness
+
+def arrays_to_population(genes, fitness):
+    """
+    population_to_arrays의 결과를 다시 개체 리스트로 만드는 함수.
+
+    INPUT:
+    - genes (np.ndarray): (개체 수, 선수 수) 크기의 팀 배정 배열
+    - fitness (np.ndarray): 개체별 적합도 (nan이면 평가되지 않은 개체)
+
+    OUTPUT:
+    - population (list): creator.Individual 리스트
+    """
+    population = []
+    for row, fit in zip(genes.tolist(), fitness.tolist()):
+        individual = creator.Individual(row)
+        if fit == fit:
+            individual.fitness.values = (fit,)
+        population.append(individual)
+    return population
+
+def setup_toolbox(num_teams, fixed_assignments, players, incremental=True, encoding="free", cache_size=0):
+    """
+    유전 알고리즘을 실행하기 위한 Toolbox 설정
+
+    INPUT:
+    - num_teams : 팀의 수
+    - fixed_assignments : 
+    - players : 
+    - incremental : True면 개체가 팀별 집계값을 들고 다니며 변이/교차 시 바뀐 유전자만큼만 갱신
+    - encoding : "free"면 팀 번호를 자유롭게 바꾸고, "balanced"면 팀 인원이 항상 목표 인원으로 유지되도록
+                 맞바꾸기 변이와 인원 복구 교차를 사용
+    - cache_size : 0보다 크면 이 개수만큼 정규화된 배정의 적합도를 FitnessCache에 기억 (toolbox.fitness_cache)
+
+    OUTPUT:
+    - toolbox
+    """
+
+    avg_scores, max_scores = player_arrays(players)
+
+    toolbox = base.Toolbox()
+    toolbox.register("evaluate", evaluate, num_teams=num_teams, players=players)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+    toolbox.register("clone", clone_individual)
+    toolbox.register("refresh", refresh_aggregates, num_teams=num_teams, avg_scores=avg_scores, max_scores=max_scores)
+
+    if incremental:
+        weights = gene_weights(avg_scores, max_scores)
+        free_indices = [i for i, p in enumerate(players) if p['name'] not in fixed_assignments]
+        toolbox.register("individual", init_tracked_individual, num_teams, fixed_assignments, players, weights)
+        toolbox.register("mutate", incremental_mutate, indpb=0.2, free_indices=free_indices, num_teams=num_teams, weights=weights)
+        toolbox.register("mate", incremental_mate, weights=weights)
+        toolbox.register("evaluate_population", evaluate_aggregates, min_team_size=len(players) // num_teams)
+        toolbox.register("seed_population", seed_population, num_teams=num_teams, fixed_assignments=fixed_assignments, players=players,
+                         track=lambda individual: attach_aggregates(individual, num_teams, weights))
+        toolbox.register("warm_start_population", warm_start_population, fixed_assignments=fixed_assignments, players=players,
+                         track=lambda individual: attach_aggregates(individual, num_teams, weights))
+    else:
+        toolbox.register("individual", init_individual, num_teams, fixed_assignments, players)
+        toolbox.register("mutate", custom_mutate, indpb=0.2, fixed_assignments=fixed_assignments, players=players, num_teams=num_teams)
+        toolbox.register("mate", tools.cxTwoPoint)
+        toolbox.register("evaluate_population", evaluate_individuals, num_teams=num_teams, avg_scores=avg_scores, max_scores=max_scores)
+        toolbox.register("seed_population", seed_population, num_teams=num_teams, fixed_assignments=fixed_assignments, players=players)
+        toolbox.register("warm_start_population", warm_start_population, fixed_assignments=fixed_assignments, players=players)
+
+    if encoding == "balanced":
+        targets = team_targets(num_teams, fixed_assignments, players)
+        free_indices = [i for i, p in enumerate(players) if p['name'] not in fixed_assignments]
+        tracked = weights if incremental else None
+        toolbox.register("individual", init_balanced_individual, num_teams, fixed_assignments, players, targets, tracked)
+        toolbox.register("mutate", swap_mutate, indpb=0.2 / 2, free_indices=free_indices, weights=tracked)
+        toolbox.register("mate", balanced_mate, targets=targets, free_indices=free_indices, players=players, weights=tracked)
+    elif encoding != "free":
+        raise ValueError(f"Unknown encoding: {encoding}")
+
+    toolbox.fitness_cache = FitnessCache(num_teams, cache_size) if cache_size > 0 else None
+    if toolbox.fitness_cache is not None:
+        toolbox.register("evaluate_population", toolbox.fitness_cache.evaluate, evaluate_population=toolbox.evaluate_population)
+
+    toolbox.incremental = incremental
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    return toolbox
+
+def initialize_population(toolbox, seed_ratio=0.0, size=300):
+    """
+    초기 Population 설정
+
+    INPUT:
+    - toolbox
+    - seed_ratio : 휴리스틱(스네이크 드래프트, 차분법 등)으로 만든 개체의 비율
+    - size : Population 크기
+
+    OUTPUT:
+    - population
+    - hof
+    - stats
+    """
+
+    num_seeds = int(size * seed_ratio)
+    population = toolbox.seed_population(num_seeds) + toolbox.population(n=size - num_seeds)
+    hof = tools.HallOfFame(1)
+    stats = tools.Statistics(lambda ind: ind.fitness.values)
+    stats.register("avg", np.mean)
+    stats.register("min", min)
+    return population, hof, stats
+
+def evolve_generation(population, toolbox, gen):
+    """
+    한 세대의 변이/교차, 평가, 선택을 수행하는 함수.
+    진행률 갱신 없이 Population만 다루므로 워커 프로세스에서도 그대로 사용합니다.
+
+    INPUT:
+    - population (list): 현재 세대의 개체 리스트
+    - toolbox: setup_toolbox로 만든 Toolbox
+    - gen (int): 현재 세대 번호
+
+    OUTPUT:
+    - population (list): 선택된 다음 세대의 개체 리스트
+    """
+    with metrics.timer("variation"):
+        population = algorithms.varAnd(population, toolbox, cxpb=0.5, mutpb=0.2)
+        if toolbox.incremental and (gen + 1) % AGGREGATE_REFRESH_INTERVAL == 0:
+            toolbox.refresh(population)
+            for ind in population:
+                del ind.fitness.values
+
+    with metrics.timer("evaluation"):
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fits = toolbox.evaluate_population(invalid_ind)
+        for fit, ind in zip(fits, invalid_ind):
+            ind.fitness.values = (fit,)
+    metrics.inc("teambuilder_generations_total")
+    metrics.inc("teambuilder_evaluations_total", len(invalid_ind))
+
+    with metrics.timer("selection"):
+        return toolbox.select(population, len(population))
@@ -0,0 +1,261 @@
+import time
+import random
+import numpy as np
+from deap import creator
+from genetic_algorithm import player_arrays, evaluate
+from seeding import team_targets
+from parallel import shared_executor, write_context, read_context, remove_context
+
+# 두 그룹으로 나눈 뒤 맞바꾸기로 다듬는 최대 횟수와 한 번에 살펴보는 양쪽의 선수 수
+SPLIT_SWAPS = 20
+SWAP_SAMPLE = 256
+
+def _sample(indices, rng):
+    # 맞바꾸기 후보가 많으면 SWAP_SAMPLE명만 무작위로 골라 살펴봅니다.
+    return indices if len(indices) <= SWAP_SAMPLE else rng.choice(indices, SWAP_SAMPLE, replace=False)
+
+class Bisector:
+    """
+    선수 그룹과 그 그룹이 맡을 팀들을 두 쪽으로 나누는 객체.
+    워커 프로세스에서도 쓰도록 선수 점수와 고정 팀, 팀별 목표 인원을 배열로 들고 있습니다.
+    """
+
+    def __init__(self, avg_scores, max_scores, fixed_teams, targets):
+        """
+        INPUT:
+        - avg_scores, max_scores (np.ndarray): 선수별 평균/최고 점수
+        - fixed_teams (np.ndarray): 선수별 고정 팀 번호 (고정되지 않은 선수는 -1)
+        - targets (list): 팀별 목표 인원 수 (team_targets)
+        """
+        self.avg_scores = avg_scores
+        self.max_scores = max_scores
+        self.fixed_teams = fixed_teams
+        self.targets = np.asarray(targets)
+
+    def split(self, teams, members, seed=0):
+        """
+        팀 목록을 앞/뒤 절반으로 나누고, 선수들을 두 쪽의 팀 수에 비례하는 점수 합계가 되도록 나누는 함수.
+        고정 선수는 자기 팀이 있는 쪽으로 보내고, 각 쪽의 인원은 그쪽 팀들의 목표 인원 합계와 같게 맞춥니다.
+
+        INPUT:
+        - teams (list): 이 그룹이 맡을 팀 번호 리스트 (2개 이상)
+        - members (np.ndarray): 이 그룹의 선수 인덱스 배열
+        - seed (int): 맞바꾸기 후보를 고르는 난수 시드 (워커 수와 관계없이 같은 결과를 내도록 그룹마다 받음)
+
+        OUTPUT:
+        - groups (list): [(왼쪽 팀들, 왼쪽 선수들), (오른쪽 팀들, 오른쪽 선수들)]
+        """
+        half = len(teams) // 2
+        left_teams, right_teams = teams[:half], teams[half:]
+        left_weight, right_weight = len(left_teams), len(right_teams)
+
+        fixed = self.fixed_teams[members]
+        left_fixed = members[np.isin(fixed, left_teams)]
+        right_fixed = members[np.isin(fixed, right_teams)]
+        free = members[fixed < 0]
+        capacity = int(self.targets[left_teams].sum()) - len(left_fixed)
+
+        # 차이 d = (오른쪽 팀 수) * 왼쪽 합계 - (왼쪽 팀 수) * 오른쪽 합계 (평균, 최고 점수), 0이면 팀당 합계가 같음
+        values = np.stack([self.avg_scores, self.max_scores], axis=1)
+        diff = right_weight * values[left_fixed].sum(axis=0) - left_weight * values[right_fixed].sum(axis=0)
+
+        # 점수가 높은 선수부터 차이를 줄이는 쪽에 넣는 탐욕 배정 (남은 자리가 없으면 다른 쪽)
+        order = free[np.argsort(-(values[free, 0] + values[free, 1]), kind="stable")]
+        combined = (self.avg_scores[order] + self.max_scores[order]).tolist()
+        balance = float(diff.sum())
+        sides = []
+        left_room, right_room = capacity, len(free) - capacity
+        for value in combined:
+            if left_room > 0 and (right_room == 0 or balance < 0):
+                sides.append(True)
+                balance += right_weight * value
+                left_room -= 1
+            else:
+                sides.append(False)
+                balance -= left_weight * value
+                right_room -= 1
+        sides = np.array(sides, dtype=bool)
+        left, right = order[sides], order[~sides]
+        diff = diff + right_weight * values[left].sum(axis=0) - left_weight * values[right].sum(axis=0)
+        left, right = self._refine(left, right, diff, values, left_weight + right_weight, np.random.default_rng(seed))
+
+        return [(left_teams, np.concatenate([left_fixed, left])), (right_teams, np.concatenate([right_fixed, right]))]
+
+    def _refine(self, left, right, diff, values, weight, rng):
+        # 왼쪽 i와 오른쪽 j를 맞바꾸면 d는 weight * (j - i)만큼 바뀝니다. |d|의 합이 가장 많이 줄어드는 쌍을 반복해서 맞바꿉니다.
+        if len(left) == 0 or len(right) == 0:
+            return left, right
+        cost = np.abs(diff).sum()
+        for _ in range(SPLIT_SWAPS):
+            rows, cols = _sample(left, rng), _sample(right, rng)
+            delta = values[cols][None, :, :] - values[rows][:, None, :]
+            candidates = np.abs(diff + weight * delta).sum(axis=2)
+            best = np.unravel_index(int(np.argmin(candidates)), candidates.shape)
+            if candidates[best] >= cost - 1e-9:
+                break
+            i, j = rows[best[0]], cols[best[1]]
+            left[left == i], right[right == j] = j, i
+            diff = diff + weight * (values[j] - values[i])
+            cost = candidates[best]
+        return left, right
+
+# 워커 프로세스에서 지금 맡고 있는 작업의 Bisector와 그 작업의 식별자
+_bisector_context = None
+_bisector = None
+
+def _split_in_worker(context_id, context_path, teams, members, seed):
+    # 공유 풀의 워커는 작업이 바뀔 때만 작업 정보 파일을 읽어 Bisector를 만듭니다.
+    global _bisector_context, _bisector
+    if _bisector_context != context_id:
+        _bisector = Bisector(*read_context(context_path))
+        _bisector_context = context_id
+    return _bisector.split(teams, members, seed)
+
+def refine_swaps(assignment, num_teams, avg_scores, max_scores, free_mask, time_budget=5.0, should_stop=None, seed=0):
+    """
+    전체 배정을 팀 사이 선수 맞바꾸기로 다듬는 함수.
+
+    평균 점수 합계와 최고 점수 합계가 가장 큰 팀과 가장 작은 팀의 쌍마다, 두 팀의 고정되지 않은 선수를
+    맞바꾸는 모든 경우의 적합도를 바뀌는 두 팀의 합계만으로 한 번에 계산해 가장 좋은 맞바꾸기를 적용합니다.
+    맞바꾸기만 하므로 팀 인원은 바뀌지 않습니다.
+
+    INPUT:
+    - assignment (np.ndarray): 선수별 팀 번호 (제자리에서 바뀜)
+    - num_teams (int): 팀의 수
+    - avg_scores, max_scores (np.ndarray): 선수별 평균/최고 점수
+    - free_mask (np.ndarray): 고정되지 않은 선수 여부
+    - time_budget (float): 최대 실행 시간(초)
+    - should_stop (callable): True를 반환하면 멈추는 함수 (작업 취소 확인용)
+    - seed (int): 맞바꾸기 후보를 고르는 난수 시드
+
+    OUTPUT:
+    - swaps (int): 맞바꾼 횟수
+    """
+    start_time = time.time()
+    rng = np.random.default_rng(seed)
+    values = np.stack([avg_scores, max_scores], axis=1)
+    sums = np.zeros((num_teams, 2))
+    np.add.at(sums, assignment, values)
+    # evaluate와 같은 가중치: 합계 범위(평균, 최고) + 평균 합계의 분산 + 최고 합계의 분산 * 0.7
+    weights = np.array([1.0, 0.7])
+    # 맞바꾸기는 전체 평균을 바꾸지 않으므로 분산은 고정된 평균에서의 편차 제곱합으로 계산합니다.
+    mean = sums.mean(axis=0)
+    current = float((sums.max(axis=0) - sums.min(axis=0)).sum() + (sums.var(axis=0) * weights).sum())
+    swaps = 0
+    while time.time() - start_time < time_budget and not (should_stop and should_stop()):
+        best = None
+        deviations = sums - mean
+        squares = (deviations ** 2).sum(axis=0)
+        pairs = {(int(sums[:, k].argmax()), int(sums[:, k].argmin())) for k in range(2)}
+        for high, low in pairs:
+            if high == low:
+                continue
+            rows = np.flatnonzero((assignment == high) & free_mask)
+            cols = np.flatnonzero((assignment == low) & free_mask)
+            if len(rows) == 0 or len(cols) == 0:
+                continue
+            rows, cols = _sample(rows, rng), _sample(cols, rng)
+            # high의 i와 low의 j를 맞바꾸면 두 팀의 합계만 바뀌고 전체 평균은 그대로이므로,
+            # 나머지 팀의 최대/최소와 두 팀의 편차 제곱 변화량만으로 모든 경우의 적합도를 계산합니다.
+            delta = values[cols][None, :, :] - values[rows][:, None, :]
+            new_high, new_low = sums[high] + delta, sums[low] - delta
+            others = np.delete(sums, [high, low], axis=0)
+            upper = np.maximum(new_high, new_low)
+            lower = np.minimum(new_high, new_low)
+            if len(others):
+                upper = np.maximum(upper, others.max(axis=0))
+                lower = np.minimum(lower, others.min(axis=0))
+            # (dh + delta)^2 - dh^2 + (dl - delta)^2 - dl^2 = 2 * delta * (delta + dh - dl)
+            change = 2 * delta * (delta + deviations[high] - deviations[low])
+            variance = (squares + change) / num_teams
+            scores = (upper - lower).sum(axis=2) + (variance * weights).sum(axis=2)
+            index = np.unravel_index(int(np.argmin(scores)), scores.shape)
+            if best is None or scores[index] < best[0]:
+                best = (scores[index], rows[index[0]], cols[index[1]], high, low)
+        if best is None or best[0] >= current - 1e-9:
+            break
+        current, i, j, high, low = best
+        assignment[i], assignment[j] = low, high
+        sums[high] += values[j] - values[i]
+        sums[low] += values[i] - values[j]
+        swaps += 1
+    return swaps
+
+def is_large_roster(players, min_players):
+    """
+    계층 분할 풀이(hierarchical_solve)를 사용할 만큼 큰 문제인지 확인하는 함수 (min_players가 0이면 사용하지 않음)
+    """
+    return min_players > 0 and len(players) >= min_players
+
+def hierarchical_solve(num_teams, fixed_assignments, players, workers=0, refine_time=5.0, should_stop=None):
+    """
+    선수 명단을 두 그룹씩 재귀적으로 나누어 큰 명단을 빠르게 배정하는 함수.
+
+    팀 목록을 절반씩 나누면서 선수 그룹도 팀 수에 비례하는 평균/최고 점수 합계가 되도록 나누고(Bisector.split),
+    팀이 하나 남은 그룹은 그 팀에 배정합니다. 같은 단계의 그룹들은 서로 독립이므로 workers가 2 이상이면
+    공유 워커 풀(parallel.shared_executor)에서 함께 나눕니다. 선수 점수 배열은 작업마다 임시 파일로 한 번만 넘깁니다. 마지막으로 refine_swaps로 전체 팀 사이의 맞바꾸기를 적용합니다.
+    고정 선수는 처음부터 자기 팀 쪽으로만 나누므로 옮겨지지 않고, 팀 인원은 team_targets를 따릅니다.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - workers (int): 그룹을 나누는 워커 프로세스 수 (1 이하이면 현재 프로세스에서 실행)
+    - refine_time (float): 전체 맞바꾸기의 최대 실행 시간(초)
+    - should_stop (callable): True를 반환하면 맞바꾸기를 멈추는 함수 (작업 취소 확인용)
+
+    OUTPUT:
+    - best (creator.Individual): 찾은 개체 (적합도 포함)
+    - report (dict): 분할 단계 수, 나눈 그룹 수, 맞바꾸기 전후 적합도, 맞바꾼 횟수, 실행 시간
+    """
+    start_time = time.time()
+    avg_scores, max_scores = player_arrays(players)
+    fixed_teams = np.array([fixed_assignments.get(player['name'], -1) for player in players], dtype=np.intp)
+    targets = team_targets(num_teams, fixed_assignments, players)
+    bisector = Bisector(avg_scores, max_scores, fixed_teams, targets)
+
+    assignment = np.empty(len(players), dtype=np.intp)
+    groups = [(list(range(num_teams)), np.arange(len(players), dtype=np.intp))]
+    levels = splits = 0
+    executor = context_path = None
+    if workers > 1 and num_teams > 2:
+        executor = shared_executor(workers)
+        context_id, context_path = write_context((avg_scores, max_scores, fixed_teams, targets))
+    try:
+        while groups:
+            for teams, members in groups:
+                if len(teams) == 1:
+                    assignment[members] = teams[0]
+            pending = [group for group in groups if len(group[0]) > 1]
+            if not pending:
+                break
+            # 난수 시드는 그룹마다 random에서 받아 워커 수와 관계없이 같은 결과를 냄
+            pending = [(teams, members, random.getrandbits(32)) for teams, members in pending]
+            if executor is not None and len(pending) > 1:
+                futures = [executor.submit(_split_in_worker, context_id, context_path, *group) for group in pending]
+                results = [future.result() for future in futures]
+            else:
+                results = [bisector.split(*group) for group in pending]
+            groups = [group for result in results for group in result]
+            levels += 1
+            splits += len(pending)
+    finally:
+        if context_path is not None:
+            remove_context(context_path)
+    split_time = time.time() - start_time
+
+    before = evaluate(assignment.tolist(), num_teams, players)
+    swaps = refine_swaps(assignment, num_teams, avg_scores, max_scores, fixed_teams < 0, refine_time, should_stop,
+                         random.getrandbits(32))
+    solution = creator.Individual(assignment.tolist())
+    solution.fitness.values = evaluate(solution, num_teams, players)
+    report = {
+        "levels": levels,
+        "splits": splits,
+        "split_time": round(split_time, 3),
+        "before": before[0],
+        "after": solution.fitness.values[0],
+        "swaps": swaps,
+        "run_time": round(time.time() - start_time, 3),
+    }
+    return solution, report
@@ -1,3 +1,5 @@
+import os
+import glob
 import json
 
 def load_data(file_path):
@@ -26,4 +28,55 @@ def load_data(file_path):
 
 def load_prev_json(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
\ No newline at end of file
+        return json.load(f)
+# 디렉토리마다 다음에 저장할 결과 버전 번호를 기록하는 파일
+VERSION_FILE = ".result_version"
+
+def result_json_path(directory, version):
+    """
+    결과 버전 번호에 해당하는 결과 JSON 경로 (0번은 result.json, 그 뒤로 result1.json, result2.json, ...)
+    """
+    return os.path.join(directory, "result.json" if version == 0 else f"result{version}.json")
+
+def scan_result_version(directory):
+    """
+    버전 파일이 없는 예전 디렉토리에서 result*.json 파일 이름을 보고 다음 버전 번호를 구하는 함수
+    """
+    versions = [-1]
+    for path in glob.glob(os.path.join(directory, "result*.json")):
+        suffix = os.path.basename(path)[len("result"):-len(".json")]
+        if suffix == "":
+            versions.append(0)
+        elif suffix.isdigit():
+            versions.append(int(suffix))
+    return max(versions) + 1
+
+def latest_result_version(directory):
+    """
+    디렉토리에 마지막으로 저장된 결과의 버전 번호를 구하는 함수.
+
+    INPUT:
+    - directory (str): 결과가 저장된 디렉토리 (data/{uuid})
+
+    OUTPUT:
+    - version (int): 마지막 결과 버전 번호, 결과가 없으면 None
+    """
+    try:
+        with open(os.path.join(directory, VERSION_FILE), "r") as file:
+            next_version = int(file.read().strip() or 0)
+    except FileNotFoundError:
+        next_version = scan_result_version(directory)
+    return next_version - 1 if next_version > 0 else None
+
+def latest_result_path(directory):
+    """
+    디렉토리에서 가장 최근에 저장된 결과 JSON의 경로를 찾는 함수.
+
+    INPUT:
+    - directory (str): 결과가 저장된 디렉토리 (data/{uuid})
+
+    OUTPUT:
+    - path (str): 가장 최근 결과 JSON 경로, 없으면 None
+    """
+    version = latest_result_version(directory)
+    return result_json_path(directory, version) if version is not None else None
@@ -0,0 +1,102 @@
+import time
+import random
+import numpy as np
+from deap import creator
+from genetic_algorithm import player_arrays, team_sums, fitness_from_team_sums, evaluate
+
+def local_search(individual, num_teams, fixed_assignments, players, max_iterations=10000, time_budget=2.0):
+    """
+    최적 개체를 선수 맞바꾸기/옮기기 언덕 오르기(hill climbing)로 다듬는 함수.
+
+    고정되지 않은 선수를 하나씩 골라, 그 선수와 다른 팀 선수를 맞바꾸는 모든 경우와 다른 팀으로 옮기는 모든 경우를
+    팀 합계만 갱신해 한 번에 평가하고, 가장 좋은 개선을 적용합니다. 한 바퀴를 돌아도 개선이 없거나
+    반복 횟수나 시간 제한에 닿으면 멈춥니다. 고정 선수는 옮기지 않습니다.
+
+    INPUT:
+    - individual (list): 다듬을 팀 배정 (hof[0])
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - max_iterations (int): 선수 하나의 이웃을 살펴보는 횟수의 최대값
+    - time_budget (float): 최대 실행 시간(초)
+
+    OUTPUT:
+    - best (creator.Individual): 다듬어진 개체 (적합도 포함)
+    - report (dict): 개선 전후 적합도, 맞바꾼/옮긴 횟수, 반복 횟수, 실행 시간
+    """
+    start_time = time.time()
+    avg_scores, max_scores = player_arrays(players)
+    min_team_size = len(players) // num_teams
+    teams = np.array(individual, dtype=np.intp)
+    free_indices = [i for i, player in enumerate(players) if player['name'] not in fixed_assignments]
+
+    counts, avg_sums, max_sums = (values[0] for values in team_sums(teams[None, :], num_teams, avg_scores, max_scores))
+    counts = counts.astype(np.float64)
+    before = evaluate(individual, num_teams, players)[0]
+    current = fitness_from_team_sums(counts[None], avg_sums[None], max_sums[None], min_team_size, exact=False)[0]
+
+    free = np.array(free_indices, dtype=np.intp)
+    swaps = moves = iterations = 0
+    improved = True
+    while improved and free.size:
+        improved = False
+        for i in random.sample(free_indices, len(free_indices)):
+            if iterations >= max_iterations or time.time() - start_time >= time_budget:
+                improved = False
+                break
+            iterations += 1
+            team = teams[i]
+
+            # i와 다른 팀 선수 j를 맞바꾸는 후보: team은 (j - i)만큼, teams[j]는 (i - j)만큼 바뀝니다.
+            partners = free[teams[free] != team]
+            # i를 다른 팀으로 옮기는 후보 (최소 인원 아래가 되면 벌점을 받으므로 후보에서 뺌)
+            if counts[team] - 1 >= min_team_size:
+                destinations = np.array([t for t in range(num_teams) if t != team], dtype=np.intp)
+            else:
+                destinations = np.array([], dtype=np.intp)
+            num_swaps = partners.size
+            num_candidates = num_swaps + destinations.size
+            if num_candidates == 0:
+                # 나머지 자유 선수가 모두 같은 팀이고 옮기면 최소 인원 아래가 되는 경우 (예: 고정 선수가 다른 팀을 채움)
+                continue
+            rows = np.arange(num_candidates)
+
+            cand_counts = np.tile(counts, (num_candidates, 1))
+            cand_avg = np.tile(avg_sums, (num_candidates, 1))
+            cand_max = np.tile(max_sums, (num_candidates, 1))
+
+            other = np.concatenate([teams[partners], destinations])
+            delta_avg = np.concatenate([avg_scores[partners] - avg_scores[i], np.full(destinations.size, -avg_scores[i])])
+            delta_max = np.concatenate([max_scores[partners] - max_scores[i], np.full(destinations.size, -max_scores[i])])
+            cand_avg[:, team] += delta_avg
+            cand_avg[rows, other] -= delta_avg
+            cand_max[:, team] += delta_max
+            cand_max[rows, other] -= delta_max
+            cand_counts[num_swaps:, team] -= 1
+            cand_counts[rows[num_swaps:], destinations] += 1
+
+            fitness = fitness_from_team_sums(cand_counts, cand_avg, cand_max, min_team_size, exact=False)
+            best = int(np.argmin(fitness))
+            if fitness[best] < current - 1e-9:
+                current = fitness[best]
+                counts, avg_sums, max_sums = cand_counts[best], cand_avg[best], cand_max[best]
+                if best < num_swaps:
+                    j = partners[best]
+                    teams[i], teams[j] = teams[j], teams[i]
+                    swaps += 1
+                else:
+                    teams[i] = destinations[best - num_swaps]
+                    moves += 1
+                improved = True
+
+    polished = creator.Individual(teams.tolist())
+    polished.fitness.values = evaluate(polished, num_teams, players)
+    report = {
+        "before": before,
+        "after": polished.fitness.values[0],
+        "swaps": swaps,
+        "moves": moves,
+        "iterations": iterations,
+        "run_time": round(time.time() - start_time, 3),
+    }
+    return polished, report
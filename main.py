@@ -1,221 +1,93 @@
 import os
+import json
 import time
-import numpy as np
 import shutil
+import asyncio
 import logging
-from fastapi import FastAPI, UploadFile, Form, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
-from deap import base, creator, tools, algorithms
-from load import load_data, load_prev_json
-from save import save_results, json_to_png, save_update_team
-from util import ensure_directory_exists
-from genetic_algorithm import init_individual, custom_mutate, evaluate
-
-class TaskState:
-    def __init__(self):
-        self.cancelled = False
-        self.progress = 0.0
-        self.remaining_time = 0
-        self.result_path = None
-
-app = FastAPI()
-tasks = {}
-
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
-
-# 로그 설정
-logging.basicConfig(
-    filename='api.log',  # 로그를 저장할 파일명
-    level=logging.DEBUG,  # 로그 레벨 설정 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    format='%(asctime)s %(levelname)s:%(message)s'  # 로그 포맷 설정
-)
-
-def log_task_event(task_id: str, message: str, level: str = "debug"):
+from fastapi import FastAPI, UploadFile, Form
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, PlainTextResponse
+from load import load_prev_json, latest_result_path, latest_result_version, result_json_path
+from save import save_update_team
+from util import ensure_directory_exists, setup_logging, log_task_event
+from scheduler import JobScheduler, QueueFull
+from task_store import TaskState, open_task_store
+from renderer import RenderPool
+import result_cache
+import metrics
+import config
+
+def render_result(task_id):
     """
-    로깅 유틸리티 함수
+    작업의 결과 JSON을 그림 풀에 맡기고, 다 그려지면 task.result_path를 기록하는 함수
 
     INPUT:
-    - task_id (str): 요청하는 uuid의 값
-    - message (str): 로그 메세지
-    - level (str): 로그의 레벨을 나타냄
+    - task_id (str): 작업 uuid
 
     OUTPUT:
-    - 
+    - future (concurrent.futures.Future): PNG 경로를 돌려주는 Future, 결과 JSON이 없으면 None
     """
-    log_message = f"Task {task_id} - {message}"
-    if level == "debug":
-        logging.debug(log_message)
-    elif level == "error":
-        logging.error(log_message)
-
-def execute_genetic(task_id: str, num_teams, repeat, data_path):
+    task = tasks.get(task_id)
+    if task is None or task.result_json is None:
+        return None
+    json_path = task.result_json
+    future = renderer.submit(json_path)
+
+    def done(future):
+        task = tasks.get(task_id)
+        # 그리는 동안 /swap/으로 결과가 바뀌었으면 예전 그림은 기록하지 않음
+        if task is not None and task.result_json == json_path and future.exception() is None:
+            task.result_path = future.result()
+
+    future.add_done_callback(done)
+    return future
+
+def render_finished_task(task_id):
+    if config.RENDER_MODE == "eager":
+        render_result(task_id)
+
+def finish_task(task_id):
     """
-    실제 유전 알고리즘을 실행시키는 함수
-
-    INPUT:
-    - task_id (str): 요청하는 uuid의 값
-    - num_teams : 팀의 수
-    - repeat : 반복 횟수
-    - data_path : players.json 파일의 위치
-
-    OUTPUT:
-    - result.json : 자세한 결과를 담은 json 파일
-    - result.png : 공유를 위해 간략하게 시각화한 이미지 파일
+    작업이 정상적으로 끝나면 결과를 결과 캐시에 저장하고 결과 그림을 만드는 함수 (JobScheduler의 on_finished)
     """
-
-    task = tasks[task_id]
-    
-    try:
-        logging.debug("Task {task_id} started")
-        start_time = time.time()
-        logging.debug("Loading data...")
-        fixed_assignments, players = load_data(data_path)
-        logging.debug("Setting up toolbox...")
-        toolbox = setup_toolbox(num_teams, fixed_assignments, players)
-
-        logging.debug("Creating population...")
-        population, hof, stats = initialize_population(toolbox)
-
-        for gen in range(repeat):
-            if task.cancelled:
-                logging.debug("Task {task_id} was cancelled.")
-                break
-            logging.debug(f"Generation {gen+1}...")
-
-            process_generation(task_id, task, toolbox, population, hof, gen, repeat, start_time)
-    except Exception as e:
-        logging.error(f"Task {task_id} failed: {e}")
-        task.result_path = None
-    finally:
-        finalize_task(task_id, task, hof, num_teams, players, repeat, data_path, start_time)
-
-def setup_toolbox(num_teams, fixed_assignments, players):
+    key = cache_keys.pop(task_id, None)
+    task = tasks.get(task_id)
+    if key is not None and task is not None and task.result_json is not None:
+        # 취소로 중간에 끝난 결과는 같은 요청의 결과로 돌려주지 않음
+        if load_prev_json(task.result_json).get('parameters', {}).get('stop_reason') != "cancelled":
+            result_cache.store(key, task.result_json)
+    render_finished_task(task_id)
+
+def start_cached_task(uuid, data_path, data):
     """
-    유전 알고리즘을 실행하기 위한 Toolbox 설정
-
-    INPUT:
-    - num_teams : 팀의 수
-    - fixed_assignments : 
-    - players : 
-
-    OUTPUT:
-    - toolbox
-    """
-
-    toolbox = base.Toolbox()
-    toolbox.register("individual", init_individual, num_teams, fixed_assignments, players)
-    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-    toolbox.register("mutate", custom_mutate, indpb=0.2, fixed_assignments=fixed_assignments, players=players, num_teams=num_teams)
-    toolbox.register("evaluate", evaluate, num_teams=num_teams, players=players)
-    toolbox.register("mate", tools.cxTwoPoint)
-    toolbox.register("select", tools.selTournament, tournsize=3)
-    return toolbox
-
-def initialize_population(toolbox):
-    """
-    초기 Population 설정
-
-    INPUT:
-    - toolbox
-
-    OUTPUT:
-    - population
-    - hof
-    - stats
-    """
-
-    population = toolbox.population(n=300)
-    hof = tools.HallOfFame(1)
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("avg", np.mean)
-    stats.register("min", min)
-    return population, hof, stats
-
-def process_generation(task_id, task, toolbox, population, hof, gen, repeat, start_time):
-    """
-    세대별 작업 처리
-
-    INPUT:
-    - task_id (str): 요청하는 uuid의 값
-    - task
-    - toolbox
-    - population
-    - hof
-    - gen
-    - repeat
-    - start_time
-
-    OUTPUT:
-    - population
-    - hof
-    """
-
-    gen_start_time = time.time()
-
-    population = algorithms.varAnd(population, toolbox, cxpb=0.5, mutpb=0.2)
-    fits = toolbox.map(toolbox.evaluate, population)
-    for fit, ind in zip(fits, population):
-        ind.fitness.values = fit
-    population = toolbox.select(population, len(population))
-    hof.update(population)
-
-    update_progress(task_id, task, gen, repeat, start_time, gen_start_time)
-
-def update_progress(task_id, task, gen, repeat, start_time, gen_start_time):
-    """
-    작업 진행률 및 남은 시간 업데이트
-
-    INPUT:
-    - task_id (str): 요청하는 uuid의 값
-    - task
-    - gen
-    - repeat
-    - start_time
-    - gen_start_time
-
-    OUTPUT:
-    - task.progress
-    - task.remaining_time
+    결과 캐시에서 찾은 결과를 새 결과 버전으로 저장하고, 작업을 실행하지 않고 끝난 상태로 기록하는 함수
     """
+    task = TaskState()
+    task.result_json = save_update_team(data_path, result_cache.cached_result(data, data_path))
+    task.progress = 100.0
+    tasks[uuid] = task
+    log_task_event(uuid, f"Result cache hit, saved to {task.result_json}")
+    render_finished_task(uuid)
 
-    task.progress = (gen + 1) / repeat * 100
+app = FastAPI()
+tasks = open_task_store(config.TASK_STORE, config.TASK_TTL)
+renderer = RenderPool(config.RENDER_WORKERS)
+scheduler = JobScheduler(tasks, config.CONCURRENCY, config.MAX_QUEUED, on_finished=finish_task,
+                         stale_after=config.TASK_STALE_TIME)
+# 실행 중인 작업의 결과 캐시 키 (작업이 끝나면 finish_task에서 결과를 이 키로 저장)
+cache_keys = {}
 
-    elapsed_time = time.time() - start_time
-    gen_time = time.time() - gen_start_time
-    remaining_time = gen_time * (repeat - gen - 1)
-    task.remaining_time = int(remaining_time)
+# 로그 설정
+setup_logging()
 
-    log_task_event(task_id, f"Progress: {task.progress:.2f}%, Remaining Time: {task.remaining_time} seconds")
+@app.on_event("startup")
+def start_scheduler():
+    renderer.start()
+    scheduler.start()
 
-def finalize_task(task_id, task, hof, num_teams, players, repeat, data_path, start_time):
-    """
-    작업 종료 후 처리
-    
-    INPUT:
-    - task_id (str): 요청하는 uuid의 값
-    - task
-    - hof
-    - num_teams
-    - players
-    - repeat
-    - data_path
-    - start_time
-
-    OUTPUT:
-    - total_processing_time
-    - task.result_path
-    - task.progress
-    - task.remaining_time
-    """
-    total_processing_time = time.time() - start_time
-    result_path = save_results(hof[0], num_teams, players, repeat, data_path, total_processing_time)
-    task.result_path = json_to_png(result_path)
-    
-    log_task_event(task_id, f"Results saved to {task.result_path}")
-    
-    task.progress = 100.0
-    task.remaining_time = 0
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.stop()
+    renderer.stop()
 
 def swap_members(data, swap_info):
     """
@@ -261,11 +133,25 @@ def swap_members(data, swap_info):
 
 @app.post("/start-task/")
 async def start_task(
-    background_tasks: BackgroundTasks,
     uuid: str = Form(...),
     file: UploadFile = Form(...),
     num_teams: int = Form(...),
     repeat: int = Form(...),
+    workers: int = Form(None),
+    islands: int = Form(None),
+    topology: str = Form(None),
+    stagnation: int = Form(None),
+    target_fitness: float = Form(None),
+    time_budget: float = Form(None),
+    seed_ratio: float = Form(None),
+    encoding: str = Form(None),
+    engine: str = Form(None),
+    objectives: str = Form(None),
+    local_search: bool = Form(None),
+    solver: str = Form(None),
+    fitness_cache: int = Form(None),
+    warm_start: bool = Form(False),
+    fresh: bool = Form(False),
 ):
     """
     작업을 시작하는 부분
@@ -274,12 +160,29 @@ async def start_task(
     file: 계삭하려는 players.json 파일이 담겨있음
     num_teams: 팀의 수
     repeat: 반복 횟수
+    workers: 병렬 실행에 사용할 워커 프로세스 수 (생략하면 서버 설정값)
+    islands: 섬 모델의 섬 개수 (생략하면 서버 설정값)
+    topology: 섬 사이의 개체 교환 방향, "ring" 또는 "random" (생략하면 서버 설정값)
+    stagnation: 최고 적합도가 이 세대 수 동안 개선되지 않으면 종료 (0이면 사용하지 않음)
+    target_fitness: 최고 적합도가 이 값 이하가 되면 종료
+    time_budget: 최대 실행 시간(초) (0이면 사용하지 않음)
+    seed_ratio: 초기 Population 중 휴리스틱으로 만드는 개체의 비율 (0이면 모두 무작위)
+    encoding: "free" 또는 팀 인원이 항상 고르게 유지되는 "balanced"
+    engine: "deap" 또는 Population을 배열 하나로 진화시키는 "array" (생략하면 서버 설정값)
+    objectives: "scalar" 또는 NSGA-II로 Pareto front를 함께 돌려주는 "pareto" (생략하면 서버 설정값)
+    local_search: 유전 알고리즘 후 선수 맞바꾸기 언덕 오르기로 결과를 다듬을지 여부 (생략하면 서버 설정값, 기본값 false)
+    solver: "auto", 분기 한정법으로 최적 배정을 찾는 "exact", 유전 알고리즘만 쓰는 "ga",
+            큰 명단을 두 그룹씩 나누어 푸는 "hierarchical" (생략하면 서버 설정값)
+    fitness_cache: 적합도 캐시에 기억할 배정 수 (0이면 사용하지 않음)
+    warm_start: True면 data/{uuid}/의 가장 최근 결과 JSON의 팀 구성에서 시작
+    fresh: True면 결과 캐시를 쓰지 않고 다시 실행 (실행 결과는 캐시에 저장)
     """
     if uuid in tasks and tasks[uuid].progress < 100:
         return JSONResponse({"message": "Another task is already running. Please wait until it finishes or cancel it first."}, status_code=400)
 
     data_path = f"data/{uuid}/{file.filename}"
     ensure_directory_exists(f"data/{uuid}")
+    previous_result = latest_result_path(f"data/{uuid}") if warm_start else None
     try:
         with open(data_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
@@ -287,10 +190,46 @@ async def start_task(
         logging.error(f"Failed to save file: {e}")
         return JSONResponse({"message:": "Failed to save file."}, status_code=500)
 
+    options = config.solver_options(workers=workers, islands=islands, topology=topology,
+                                    stagnation=stagnation, target_fitness=target_fitness, time_budget=time_budget,
+                                    seed_ratio=seed_ratio, encoding=encoding, engine=engine, objectives=objectives,
+                                    local_search=local_search,
+                                    solver=solver, fitness_cache=fitness_cache, warm_start=previous_result)
+
+    # 이전 결과에서 시작하는 요청은 결과가 이전 결과에 따라 달라지므로 캐시를 쓰지 않음
+    key = None
+    if config.RESULT_CACHE_SIZE > 0 and previous_result is None:
+        try:
+            key = result_cache.task_key(data_path, num_teams, repeat, options)
+        except Exception as e:
+            # 잘못된 파일은 작업에서 오류로 처리되도록 캐시 없이 진행
+            logging.warning(f"Failed to compute result cache key: {e}")
+    if key is not None and not fresh:
+        cached = result_cache.lookup(key)
+        metrics.inc("teambuilder_result_cache_total", result="hit" if cached is not None else "miss")
+        if cached is not None:
+            start_cached_task(uuid, data_path, cached)
+            return {"message": "Task cached", "uuid": uuid, "queue position": 0}
+
     tasks[uuid] = TaskState()
-    background_tasks.add_task(execute_genetic, uuid, num_teams, repeat, data_path)
+    if key is not None:
+        cache_keys[uuid] = key
+    try:
+        position = scheduler.submit(uuid, (num_teams, repeat, data_path, options))
+    except QueueFull:
+        del tasks[uuid]
+        cache_keys.pop(uuid, None)
+        return JSONResponse({"message": "Too many tasks are waiting. Please try again later."}, status_code=503)
 
-    return {"message": "Task started", "uuid": uuid}
+    return {"message": "Task started" if position == 0 else "Task queued", "uuid": uuid, "queue position": position}
+
+def progress_snapshot(task, uuid):
+    """
+    /progress/와 /progress-stream/이 보내는 진행 상황
+    """
+    return {"progress": task.progress, "remaining time": task.remaining_time, "best fitness": task.best_fitness,
+            "best team sums": task.best_team_sums, "fitness cache": task.cache_stats,
+            "queue position": scheduler.position(uuid)}
 
 @app.get("/progress/")
 async def get_progress(uuid: str = Form(...)):
@@ -304,30 +243,106 @@ async def get_progress(uuid: str = Form(...)):
     if not task:
         return {"error": "Invalid UUID or task not found"}
     
-    return {"progress": task.progress, "remaining time": task.remaining_time}
+    return progress_snapshot(task, uuid)
+
+@app.get("/progress-stream/")
+async def progress_stream(uuid: str):
+    """
+    작업 진행 상황을 Server-Sent Events로 보내는 엔드포인트.
+    TEAMBUILDER_PROGRESS_STREAM_INTERVAL초마다 상태를 확인해 바뀐 경우에만 보내므로, 세대 수와 관계없이
+    메시지 수가 실행 시간에 비례합니다. 작업이 끝나면 "done" 이벤트를 보내고 연결을 닫습니다.
+    
+    uuid: 클라이언트가 제공한 고유 식별자 (UUID), EventSource에서 쓸 수 있도록 쿼리 문자열로 받음
+    """
+    if uuid not in tasks:
+        return JSONResponse({"error": "Invalid UUID or task not found"}, status_code=404)
+
+    async def events():
+        last, last_sent = None, time.time()
+        while True:
+            task = tasks.get(uuid)
+            if task is None:
+                return
+            snapshot = progress_snapshot(task, uuid)
+            if task.progress >= 100:
+                yield f"event: done\ndata: {json.dumps(dict(snapshot, result=task.result_json is not None))}\n\n"
+                return
+            if snapshot != last:
+                yield f"data: {json.dumps(snapshot)}\n\n"
+                last, last_sent = snapshot, time.time()
+            elif time.time() - last_sent > 15:
+                # 프록시가 연결을 끊지 않도록 보내는 주석 줄
+                yield ": keep-alive\n\n"
+                last_sent = time.time()
+            await asyncio.sleep(config.PROGRESS_STREAM_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 @app.post("/cancel-task/")
-async def cancel_task(uuid: str = Form(...)):
+async def cancel_task(uuid: str = Form(...), keep_checkpoint: bool = Form(False)):
     """
     작업을 취소하는 엔드포인트.
     
     uuid: 클라이언트가 제공한 고유 식별자 (UUID)
+    keep_checkpoint: True면 체크포인트를 남겨 /resume-task/로 이어서 실행할 수 있게 함
     """
     task = tasks.get(uuid)
     
     if not task:
         return {"error": "Invalid UUID or task not found"}
     
+    task.keep_checkpoint = keep_checkpoint
     task.cancelled = True
+    # 다른 서버 워커가 실행 중인 작업은 그 워커가 취소 여부를 보고 마무리함
+    scheduler.cancel(uuid, keep_checkpoint)
     return {"message": f"Task {uuid} cancelled."}
 
+@app.post("/resume-task/")
+async def resume_task(uuid: str = Form(...)):
+    """
+    취소되었거나 서버 재시작 등으로 중단된 작업을 마지막 체크포인트부터 이어서 실행하는 엔드포인트.
+    
+    uuid: 클라이언트가 제공한 고유 식별자 (UUID)
+    """
+    if uuid in tasks and tasks[uuid].progress < 100:
+        return JSONResponse({"message": "Another task is already running. Please wait until it finishes or cancel it first."}, status_code=400)
+
+    path = f"data/{uuid}/checkpoint.npz"
+    if not os.path.exists(path):
+        return JSONResponse({"message": "No checkpoint found for this task."}, status_code=404)
+    # 체크포인트 모듈은 numpy와 DEAP을 불러오므로 API 서버 시작 시간에 포함되지 않도록 처음 쓸 때 불러옴
+    from checkpoint import load_checkpoint_meta
+    meta = load_checkpoint_meta(path)
+
+    tasks[uuid] = TaskState()
+    try:
+        position = scheduler.submit(uuid, (meta["num_teams"], meta["repeat"], meta["data_path"], meta["options"], True))
+    except QueueFull:
+        del tasks[uuid]
+        return JSONResponse({"message": "Too many tasks are waiting. Please try again later."}, status_code=503)
+
+    return {"message": "Task resumed" if position == 0 else "Task queued", "uuid": uuid, "queue position": position}
+
 @app.get("/result/")
-async def get_result(uuid: str = Form(...)):
+async def get_result(uuid: str = Form(...), version: int = Form(None), format: str = Form("png")):
     """
     작업 결과와 진행 상황을 가져오는 엔드포인트.
     
     uuid: 클라이언트가 제공한 고유 식별자 (UUID)
+    version: 지정하면 작업 상태와 관계없이 그 버전의 결과 (0은 처음 결과, /swap/마다 1씩 증가)
+    format: version을 지정했을 때 "png"(그림) 또는 "json"(결과 JSON)
     """
+    if version is not None:
+        json_path = result_json_path(f"data/{uuid}", version)
+        if not os.path.exists(json_path):
+            return JSONResponse({"message": "Result version not found."}, status_code=404)
+        if format == "json":
+            return FileResponse(json_path, media_type='application/json', filename=f"result{version}.json")
+        result_path = await asyncio.wrap_future(renderer.submit(json_path))
+        if result_path is None:
+            return JSONResponse({"message": "Failed to render result."}, status_code=500)
+        return FileResponse(result_path, media_type='image/png', filename=f"result{version}.png")
+
     task = tasks.get(uuid)
     
     if not task:
@@ -336,10 +351,40 @@ async def get_result(uuid: str = Form(...)):
     if task.result_path:
         # 결과가 준비되었으면 파일 경로와 함께 응답
         return FileResponse(task.result_path, media_type='image/png', filename="result.png")
+    elif task.result_json and task.progress >= 100:
+        # 그림이 아직 없으면 (lazy 모드이거나 그리는 중) 그림 풀의 결과를 기다림
+        result_path = await asyncio.wrap_future(render_result(uuid))
+        if result_path is None:
+            return JSONResponse({"message": "Failed to render result."}, status_code=500)
+        return FileResponse(result_path, media_type='image/png', filename="result.png")
     else:
         # 진행 상황을 반환
         return {"status": "Task in progress", "progress": task.progress, "remaining time": task.remaining_time}
 
+@app.get("/result-versions/")
+async def get_result_versions(uuid: str = Form(...)):
+    """
+    저장된 결과 버전 목록을 반환하는 엔드포인트. 각 버전은 /result/에 version으로 지정해 받을 수 있습니다.
+
+    uuid: 클라이언트가 제공한 고유 식별자 (UUID)
+    """
+    directory = f"data/{uuid}"
+    latest = latest_result_version(directory)
+    if latest is None:
+        return JSONResponse({"message": "No results found for this task."}, status_code=404)
+    versions = [version for version in range(latest + 1) if os.path.exists(result_json_path(directory, version))]
+    return {"latest": latest, "versions": versions}
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus 형식의 측정값을 반환하는 엔드포인트.
+    대기/실행 중인 작업 수와 함께 워커 프로세스들이 기록한 단계별 소요 시간, 세대/평가 횟수를 합쳐 보냅니다.
+    """
+    queued, running = scheduler.counts()
+    text = metrics.render({"teambuilder_tasks_queued": queued, "teambuilder_tasks_running": running})
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
 @app.get("/init-file/")
 async def get_initial_file():
     """
@@ -364,9 +409,8 @@ async def swap_teams(uuid: str = Form(...),
     if not task:
         return {"error": "Invalid UUID or task not found"}
 
-    if task.result_path != None:
-        prev_png_path = task.result_path
-        prev_json_path = os.path.splitext(prev_png_path)[0] + ".json"
+    if task.result_json != None:
+        prev_json_path = task.result_json
 
         data = load_prev_json(prev_json_path)
 
@@ -380,11 +424,13 @@ async def swap_teams(uuid: str = Form(...),
 
         update_data = swap_members(data, swap_info)
         new_json_path = save_update_team(prev_json_path, update_data)
-        task.result_path = json_to_png(new_json_path)
+        task.result_json = new_json_path
+        task.result_path = None
+        render_finished_task(uuid)
 
         task.progress = 100
         task.remaining_time = 0
-        return {"update team data"}
+        return {"message": "update team data", "version": update_data['parameters']['version']}
 
     else:
         log_task_event(uuid, f"else")
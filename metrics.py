@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import fcntl
+import bisect
+from contextlib import contextmanager
+import config
+
+# 구간별 소요 시간 히스토그램의 버킷 경계(초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "teambuilder_tasks_queued": "Tasks waiting in the job queue",
+    "teambuilder_tasks_running": "Tasks running on worker processes",
+    "teambuilder_stage_seconds": "Time spent in each solver stage",
+    "teambuilder_generations_total": "Generations evolved (counted per sub-population in parallel runs)",
+    "teambuilder_evaluations_total": "Individuals evaluated",
+    "teambuilder_tasks_submitted_total": "Tasks accepted by the job queue",
+    "teambuilder_tasks_rejected_total": "Tasks rejected because the job queue was full",
+    "teambuilder_result_cache_total": "Result cache lookups on /start-task/ by result (hit, miss)",
+}
+
+_counters = {}
+_histograms = {}
+_last_flush = 0.0
+# 같은 pid가 재사용되어도 이전 프로세스의 파일을 덮어쓰지 않도록 파일 이름에 시작 시각을 붙입니다.
+_started = int(time.time())
+
+# 끝난 프로세스의 측정값을 모아 두는 파일. 프로세스 파일을 지워도 /metrics의 카운터가 줄어들지 않도록 지우기 전에 여기에 더합니다.
+RETIRED_FILE = "metrics-retired.json"
+
+def _reset_after_fork():
+    # fork로 만든 프로세스(병렬 실행 워커 등)는 부모의 측정값을 물려받으므로, 부모의 값이 두 번 합쳐지지 않도록 비우고 시작합니다.
+    global _last_flush, _started
+    _counters.clear()
+    _histograms.clear()
+    _last_flush = 0.0
+    _started = int(time.time())
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _key(name, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in sorted(labels.items())) + "}"
+
+def inc(name, value=1, **labels):
+    """
+    카운터를 value만큼 늘리는 함수
+    """
+    key = _key(name, labels)
+    _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, value, **labels):
+    """
+    히스토그램에 측정값 하나를 기록하는 함수
+    """
+    key = _key(name, labels)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        histogram = _histograms[key] = {"buckets": [0] * (len(DEFAULT_BUCKETS) + 1), "sum": 0.0, "count": 0}
+    histogram["buckets"][bisect.bisect_left(DEFAULT_BUCKETS, value)] += 1
+    histogram["sum"] += value
+    histogram["count"] += 1
+
+@contextmanager
+def timer(stage):
+    """
+    with 블록의 실행 시간을 teambuilder_stage_seconds{stage=...} 히스토그램에 기록하는 컨텍스트 매니저
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("teambuilder_stage_seconds", time.perf_counter() - start, stage=stage)
+
+def flush(force=False):
+    """
+    이 프로세스의 측정값을 METRICS_DIR/metrics-{pid}-{시작 시각}.json에 기록하는 함수.
+    작업 워커 프로세스의 값은 이 파일을 통해 /metrics에 합쳐집니다. force가 아니면 METRICS_FLUSH_INTERVAL초에 한 번만 기록합니다.
+    """
+    global _last_flush
+    now = time.time()
+    if not force and now - _last_flush < config.METRICS_FLUSH_INTERVAL:
+        return
+    _last_flush = now
+    os.makedirs(config.METRICS_DIR, exist_ok=True)
+    path = os.path.join(config.METRICS_DIR, f"metrics-{os.getpid()}-{_started}.json")
+    with open(path + ".tmp", "w") as file:
+        json.dump({"counters": _counters, "histograms": _histograms}, file)
+    os.replace(path + ".tmp", path)
+
+def _read(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def _add(total, snapshot):
+    # snapshot의 카운터와 히스토그램을 total에 더합니다.
+    counters, histograms = total["counters"], total["histograms"]
+    for key, value in snapshot["counters"].items():
+        counters[key] = counters.get(key, 0) + value
+    for key, histogram in snapshot["histograms"].items():
+        merged = histograms.setdefault(key, {"buckets": [0] * (len(DEFAULT_BUCKETS) + 1), "sum": 0.0, "count": 0})
+        merged["buckets"] = [a + b for a, b in zip(merged["buckets"], histogram["buckets"])]
+        merged["sum"] += histogram["sum"]
+        merged["count"] += histogram["count"]
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _file_pid(filename):
+    # metrics-{pid}-{시작 시각}.json에서 pid를 읽습니다. (RETIRED_FILE 등은 None)
+    parts = filename[:-len(".json")].split("-")
+    if len(parts) == 3 and parts[0] == "metrics" and parts[1].isdigit():
+        return int(parts[1])
+    return None
+
+def retire_dead_processes():
+    """
+    끝난 프로세스의 측정값 파일을 RETIRED_FILE에 더하고 지우는 함수.
+    작업마다 새로 뜨는 워커의 파일이 METRICS_DIR에 계속 쌓이지 않게 합니다.
+    여러 API 서버 워커가 동시에 호출해도 같은 파일을 두 번 더하지 않도록 잠금 파일을 잡고 처리합니다.
+    """
+    if not os.path.isdir(config.METRICS_DIR):
+        return
+    with open(os.path.join(config.METRICS_DIR, ".retire.lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = [
+            filename for filename in os.listdir(config.METRICS_DIR)
+            if filename.endswith(".json") and _file_pid(filename) is not None and not _alive(_file_pid(filename))
+        ]
+        if not dead:
+            return
+        retired_path = os.path.join(config.METRICS_DIR, RETIRED_FILE)
+        retired = _read(retired_path) or {"counters": {}, "histograms": {}}
+        for filename in dead:
+            snapshot = _read(os.path.join(config.METRICS_DIR, filename))
+            if snapshot is not None:
+                _add(retired, snapshot)
+        with open(retired_path + ".tmp", "w") as file:
+            json.dump(retired, file)
+        os.replace(retired_path + ".tmp", retired_path)
+        for filename in dead:
+            os.remove(os.path.join(config.METRICS_DIR, filename))
+
+def _merged():
+    # 모든 프로세스의 측정값 파일을 읽어 더합니다.
+    total = {"counters": {}, "histograms": {}}
+    if not os.path.isdir(config.METRICS_DIR):
+        return total["counters"], total["histograms"]
+    for filename in os.listdir(config.METRICS_DIR):
+        if not filename.endswith(".json"):
+            continue
+        snapshot = _read(os.path.join(config.METRICS_DIR, filename))
+        if snapshot is not None:
+            _add(total, snapshot)
+    return total["counters"], total["histograms"]
+
+def render(gauges=None):
+    """
+    모든 프로세스의 측정값을 Prometheus 텍스트 형식으로 만드는 함수
+
+    INPUT:
+    - gauges (dict): 함께 내보낼 현재 값 (이름 -> 값), 예: 대기/실행 중인 작업 수
+
+    OUTPUT:
+    - text (str): Prometheus 텍스트 형식의 측정값
+    """
+    flush(force=True)
+    retire_dead_processes()
+    counters, histograms = _merged()
+    lines = []
+    described = set()
+
+    def describe(name, kind):
+        if name not in described:
+            described.add(name)
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for name, value in sorted((gauges or {}).items()):
+        describe(name, "gauge")
+        lines.append(f"{name} {value}")
+    for key, value in sorted(counters.items()):
+        describe(key.split("{")[0], "counter")
+        lines.append(f"{key} {value}")
+    for key, histogram in sorted(histograms.items()):
+        name, _, labels = key.partition("{")
+        labels = labels.rstrip("}")
+        describe(name, "histogram")
+        cumulative = 0
+        for bound, count in zip(list(DEFAULT_BUCKETS) + ["+Inf"], histogram["buckets"]):
+            cumulative += count
+            bucket_labels = f'{labels},le="{bound}"' if labels else f'le="{bound}"'
+            lines.append(f"{name}_bucket{{{bucket_labels}}} {cumulative}")
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {histogram['sum']}")
+        lines.append(f"{name}_count{suffix} {histogram['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,262 @@
+import os
+import uuid
+import pickle
+import random
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import metrics
+from genetic_algorithm import ensure_creator, setup_toolbox, evolve_generation, population_to_arrays, arrays_to_population
+from array_engine import ArrayEngine
+
+# 워커 프로세스에서 지금 맡고 있는 작업의 Toolbox (engine="array"면 ArrayEngine)와 그 작업의 식별자
+_context = None
+_toolbox = None
+_engine = None
+
+# 스케줄러 워커(또는 CLI/배치 프로세스)마다 하나씩 만들어 작업이 바뀌어도 다시 쓰는 프로세스 풀
+_executor = None
+_executor_workers = 0
+
+def shared_executor(workers):
+    """
+    프로세스 안에서 공유하는 워커 풀을 반환하는 함수.
+    워커 프로세스 기동(numpy/DEAP import) 비용을 작업마다 치르지 않도록 풀은 작업이 끝나도 닫지 않으며,
+    워커 수가 달라졌거나 풀이 깨진 경우에만 새로 만듭니다.
+
+    INPUT:
+    - workers (int): 워커 프로세스 수
+
+    OUTPUT:
+    - executor (ProcessPoolExecutor)
+    """
+    global _executor, _executor_workers
+    if _executor is not None and (_executor_workers != workers or getattr(_executor, "_broken", False)):
+        _executor.shutdown()
+        _executor = None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers, initializer=ensure_creator)
+        _executor_workers = workers
+    return _executor
+
+def shutdown_executor():
+    """
+    공유 워커 풀을 닫는 함수 (프로세스 종료 전이나 테스트에서 사용)
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+def write_context(value):
+    """
+    워커에 보낼 작업 정보를 임시 파일에 한 번만 pickle해 두는 함수.
+    워커에는 매번 정보 대신 (context_id, 파일 경로)만 보내고, 워커는 처음 받는 context_id일 때만 파일을 읽습니다.
+    작업이 끝나면 remove_context로 파일을 지웁니다.
+
+    INPUT:
+    - value : 워커에서 쓸 작업 정보 (pickle 가능한 값)
+
+    OUTPUT:
+    - context_id (str): 작업 정보의 식별자
+    - path (str): 작업 정보를 저장한 임시 파일 경로
+    """
+    descriptor, path = tempfile.mkstemp(prefix="teambuilder-context-", suffix=".pkl")
+    with os.fdopen(descriptor, "wb") as file:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    return uuid.uuid4().hex, path
+
+def read_context(path):
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+def remove_context(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _use_context(context_id, path):
+    """
+    워커 프로세스가 작업의 Toolbox를 준비하는 함수.
+    워커가 이미 같은 작업을 맡고 있으면 작업 정보 파일을 다시 읽거나 Toolbox를 다시 만들지 않습니다.
+    """
+    global _context, _toolbox, _engine
+    if _context == context_id:
+        return
+    num_teams, fixed_assignments, players, toolbox_options, engine = read_context(path)
+    _toolbox = _engine = None
+    if engine == "array":
+        _engine = ArrayEngine(num_teams, fixed_assignments, players, encoding=toolbox_options.get("encoding", "free"),
+                              cache_size=toolbox_options.get("cache_size", 0))
+    else:
+        _toolbox = setup_toolbox(num_teams, fixed_assignments, players, **toolbox_options)
+    _context = context_id
+
+def _evolve_slice(context_id, context_path, genes, fitness, start_gen, generations, seed):
+    """
+    워커 프로세스에서 하위 Population을 여러 세대 진화시키는 함수.
+    """
+    _use_context(context_id, context_path)
+    random.seed(seed)
+    cache = _engine.fitness_cache if _engine is not None else _toolbox.fitness_cache
+    before = cache.stats() if cache is not None else None
+    if _engine is not None:
+        population = _engine.from_arrays(genes, fitness)
+        for gen in range(start_gen, start_gen + generations):
+            population = _engine.evolve_generation(population, gen)
+        genes, fitness = population.arrays()
+    else:
+        population = arrays_to_population(genes, fitness)
+        if _toolbox.incremental:
+            _toolbox.refresh(population)
+        for gen in range(start_gen, start_gen + generations):
+            population = evolve_generation(population, _toolbox, gen)
+        genes, fitness = population_to_arrays(population)
+    # 이번 호출에서 늘어난 적합도 캐시 적중/실패 횟수
+    cache_delta = None
+    if cache is not None:
+        after = cache.stats()
+        cache_delta = {"hits": after["hits"] - before["hits"], "misses": after["misses"] - before["misses"]}
+    # 풀의 워커는 종료 시점을 알 수 없으므로 호출마다 측정값을 파일로 내보냄
+    metrics.flush(force=True)
+    return genes, fitness, cache_delta
+
+class SubPopulationPool:
+    """
+    Population을 워커 수만큼 나누어 각 워커 프로세스에서 진화시키는 프로세스 풀.
+
+    워커 프로세스는 shared_executor의 풀을 작업 사이에 다시 쓰며, 작업마다 바뀌는 선수 정보는
+    임시 파일(write_context)로 한 번만 넘기고 워커가 처음 받을 때 한 번만 Toolbox로 만듭니다.
+    동기화할 때마다 전체 Population을 섞어 다시 나누므로 하위 Population 사이에 개체가 오갑니다.
+    """
+
+    def __init__(self, workers, num_teams, fixed_assignments, players, engine="deap", **toolbox_options):
+        """
+        INPUT:
+        - workers (int): 워커 프로세스 수
+        - num_teams (int): 팀의 수
+        - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+        - players (list): 일반 선수 리스트
+        - engine (str): 워커에서 진화시키는 방식 ("deap": DEAP 개체, "array": ArrayEngine)
+        - toolbox_options: 워커의 setup_toolbox에 그대로 전달할 옵션 (incremental, encoding, cache_size)
+        """
+        self.workers = workers
+        # 워커들의 적합도 캐시 적중/실패 누적 횟수 (캐시를 쓰지 않으면 None)
+        self.cache_stats = None
+        self.executor = shared_executor(workers)
+        # 호출마다 선수 정보를 다시 보내지 않도록 작업 정보는 임시 파일에 한 번만 저장해 둡니다.
+        self.context_id, self.context_path = write_context((num_teams, fixed_assignments, players, toolbox_options, engine))
+
+    def evolve(self, population, start_gen, generations):
+        """
+        Population을 나누어 generations 세대만큼 병렬로 진화시키는 함수.
+
+        INPUT:
+        - population (list): 현재 세대의 개체 리스트
+        - start_gen (int): 시작 세대 번호
+        - generations (int): 동기화 전까지 진화시킬 세대 수
+
+        OUTPUT:
+        - population (list): 진화된 개체 리스트
+        """
+        population = list(population)
+        random.shuffle(population)
+        genes, fitness = population_to_arrays(population)
+
+        results = self._run(genes, fitness, np.array_split(np.arange(len(population)), self.workers), start_gen, generations)
+
+        genes = np.concatenate([result[0] for result in results])
+        fitness = np.concatenate([result[1] for result in results])
+        return arrays_to_population(genes, fitness)
+
+    def _run(self, genes, fitness, chunks, start_gen, generations):
+        # 나눈 구간마다 워커에 진화를 맡기고 (genes, fitness) 결과를 순서대로 모읍니다.
+        futures = [
+            self.executor.submit(_evolve_slice, self.context_id, self.context_path, genes[chunk], fitness[chunk], start_gen,
+                                 generations, random.getrandbits(32))
+            for chunk in chunks
+        ]
+        results = [future.result() for future in futures]
+        for _, _, cache_delta in results:
+            if cache_delta is not None:
+                self.cache_stats = self.cache_stats or {"hits": 0, "misses": 0}
+                self.cache_stats["hits"] += cache_delta["hits"]
+                self.cache_stats["misses"] += cache_delta["misses"]
+        return [(genes, fitness) for genes, fitness, _ in results]
+
+    def close(self):
+        # 공유 풀은 다음 작업이 다시 쓰므로 닫지 않고 작업 정보 파일만 지웁니다.
+        self.executor = None
+        remove_context(self.context_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class IslandPool(SubPopulationPool):
+    """
+    섬 모델(Island model)로 여러 Population을 독립적으로 진화시키는 프로세스 풀.
+
+    Population 리스트는 섬 크기만큼씩 차례로 이어 붙인 형태로 주고받으며,
+    evolve를 한 번 호출할 때마다 섬끼리 우수 개체를 교환합니다.
+    """
+
+    def __init__(self, workers, islands, num_teams, fixed_assignments, players, migrants=3, topology="ring", engine="deap",
+                 **toolbox_options):
+        """
+        INPUT:
+        - workers (int): 워커 프로세스 수
+        - islands (int): 섬의 개수
+        - num_teams (int): 팀의 수
+        - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+        - players (list): 일반 선수 리스트
+        - migrants (int): 교환 시 섬마다 내보내는 우수 개체 수
+        - topology (str): "ring"이면 다음 섬으로, "random"이면 임의의 다른 섬으로 보냄
+        - engine (str): 워커에서 진화시키는 방식 ("deap" 또는 "array")
+        - toolbox_options: 워커의 setup_toolbox에 그대로 전달할 옵션 (incremental, encoding, cache_size)
+        """
+        if topology not in ("ring", "random"):
+            raise ValueError(f"Unknown migration topology: {topology}")
+        super().__init__(workers, num_teams, fixed_assignments, players, engine, **toolbox_options)
+        self.islands = islands
+        self.migrants = migrants
+        self.topology = topology
+
+    def evolve(self, population, start_gen, generations):
+        """
+        섬마다 generations 세대만큼 병렬로 진화시킨 뒤 우수 개체를 교환하는 함수.
+
+        INPUT:
+        - population (list): 모든 섬의 개체를 섬 순서대로 이어 붙인 리스트
+        - start_gen (int): 시작 세대 번호
+        - generations (int): 교환 전까지 진화시킬 세대 수
+
+        OUTPUT:
+        - population (list): 진화와 교환이 끝난 개체 리스트 (섬 순서 유지)
+        """
+        genes, fitness = population_to_arrays(population)
+        results = self._run(genes, fitness, np.array_split(np.arange(len(population)), self.islands), start_gen, generations)
+        self._migrate(results)
+
+        genes = np.concatenate([result[0] for result in results])
+        fitness = np.concatenate([result[1] for result in results])
+        return arrays_to_population(genes, fitness)
+
+    def _migrate(self, results):
+        # 각 섬의 상위 개체를 목적지 섬의 하위 개체 자리에 복사합니다. (평가되지 않은 개체는 가장 나쁜 것으로 취급)
+        ranked = [np.argsort(np.nan_to_num(fitness, nan=np.inf), kind="stable") for _, fitness in results]
+        migrants = [
+            (genes[order[:self.migrants]].copy(), fitness[order[:self.migrants]].copy())
+            for (genes, fitness), order in zip(results, ranked)
+        ]
+        for source in range(self.islands):
+            if self.topology == "ring":
+                target = (source + 1) % self.islands
+            else:
+                target = random.choice([island for island in range(self.islands) if island != source])
+            genes, fitness = results[target]
+            worst = ranked[target][::-1][:len(migrants[source][0])]
+            genes[worst], fitness[worst] = migrants[source]
@@ -0,0 +1,159 @@
+import numpy as np
+from deap import creator, tools, algorithms
+import metrics
+from genetic_algorithm import setup_toolbox, player_arrays, team_sums, _sequential_sum, _squared
+
+# 다목적 모드의 목표 (모두 작을수록 좋음), evaluate는 이 값들을 SCALAR_WEIGHTS로 더한 값
+OBJECTIVES = ("avg_balance", "max_balance", "avg_variance", "max_variance")
+SCALAR_WEIGHTS = (1.0, 1.0, 1.0, 0.7)
+
+# 최소 인원을 못 채운 개체의 목표 값. 점수 합계가 큰 정상 배정에도 지배되도록 충분히 큰 값을 씁니다.
+INFEASIBLE = 1e12
+
+def objectives_from_team_sums(counts, avg_sums, max_sums, min_team_size):
+    """
+    팀별 집계값으로부터 목표별 값을 계산하는 함수.
+    fitness_from_team_sums와 같은 순서로 연산하므로 scalar_fitness로 더하면 evaluate와 값이 같습니다.
+
+    INPUT:
+    - counts, avg_sums, max_sums (np.ndarray): (개체 수, 팀 수) 팀별 인원 수와 점수 합계 (team_sums)
+    - min_team_size (int): 팀의 최소 인원 수
+
+    OUTPUT:
+    - objectives (np.ndarray): (개체 수, 4) OBJECTIVES 순서의 값, 최소 인원을 못 채운 개체는 모두 INFEASIBLE
+    """
+    num_teams = counts.shape[1]
+    avg_balance = avg_sums.max(axis=1) - avg_sums.min(axis=1)
+    max_balance = max_sums.max(axis=1) - max_sums.min(axis=1)
+    avg_variance = _sequential_sum(_squared(avg_sums - (_sequential_sum(avg_sums) / num_teams)[:, None])) / num_teams
+    max_variance = _sequential_sum(_squared(max_sums - (_sequential_sum(max_sums) / num_teams)[:, None])) / num_teams
+    objectives = np.stack([avg_balance, max_balance, avg_variance, max_variance], axis=1)
+    objectives[counts.min(axis=1) < min_team_size] = INFEASIBLE
+    return objectives
+
+def scalar_fitness(values):
+    """
+    목표별 값을 evaluate와 같은 가중치로 더한 단일 적합도 (진행률, Hall of Fame, 결과 비교용)
+    """
+    if values[0] >= INFEASIBLE:
+        # evaluate처럼 어떤 정상 배정보다도 나쁜 값
+        return INFEASIBLE
+    return values[0] + values[1] + values[2] + values[3] * SCALAR_WEIGHTS[3]
+
+def evaluate_objectives(individuals, num_teams, avg_scores, max_scores):
+    """
+    개체 리스트의 목표별 값을 한 번에 평가하는 함수
+
+    OUTPUT:
+    - objectives (list): 개체별 OBJECTIVES 순서의 튜플
+    """
+    if not individuals:
+        return []
+    counts, avg_sums, max_sums = team_sums(np.array(individuals, dtype=np.intp), num_teams, avg_scores, max_scores)
+    objectives = objectives_from_team_sums(counts, avg_sums, max_sums, len(avg_scores) // num_teams)
+    return [tuple(values) for values in objectives.tolist()]
+
+def clone_pareto(individual):
+    clone = creator.ParetoIndividual(individual)
+    clone.fitness.wvalues = individual.fitness.wvalues
+    return clone
+
+def setup_pareto_toolbox(num_teams, fixed_assignments, players, encoding="free"):
+    """
+    NSGA-II 다목적 모드용 Toolbox를 만드는 함수.
+    변이/교차는 setup_toolbox(incremental=False)의 것을 그대로 쓰고, 평가는 목표별 값, 선택은 selNSGA2로 바꿉니다.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - encoding (str): "free" 또는 "balanced"
+
+    OUTPUT:
+    - toolbox
+    """
+    toolbox = setup_toolbox(num_teams, fixed_assignments, players, incremental=False, encoding=encoding)
+    avg_scores, max_scores = player_arrays(players)
+    toolbox.register("evaluate_population", evaluate_objectives, num_teams=num_teams, avg_scores=avg_scores, max_scores=max_scores)
+    toolbox.register("select", tools.selNSGA2)
+    toolbox.register("clone", clone_pareto)
+    return toolbox
+
+def to_pareto_population(population):
+    """
+    initialize_population으로 만든 creator.Individual 리스트를 다목적 개체로 바꾸는 함수 (적합도는 다시 평가)
+    """
+    return [creator.ParetoIndividual(individual) for individual in population]
+
+def evaluate_invalid(population, toolbox):
+    # 적합도가 없는 개체만 평가하고 평가한 개체 수를 돌려줍니다.
+    invalid = [ind for ind in population if not ind.fitness.valid]
+    for values, ind in zip(toolbox.evaluate_population(invalid), invalid):
+        ind.fitness.values = values
+    return len(invalid)
+
+def evolve_pareto_generation(population, toolbox, gen):
+    """
+    NSGA-II 한 세대: 현재 세대에서 자손을 만들고, 부모와 자손을 합쳐 빠른 비지배 정렬과 밀집 거리로 다음 세대를 고르는 함수
+
+    INPUT:
+    - population (list): 현재 세대 (평가된 creator.ParetoIndividual 리스트)
+    - toolbox: setup_pareto_toolbox로 만든 Toolbox
+    - gen (int): 현재 세대 번호
+
+    OUTPUT:
+    - population (list): 선택된 다음 세대
+    """
+    with metrics.timer("variation"):
+        offspring = algorithms.varAnd(population, toolbox, cxpb=0.5, mutpb=0.2)
+
+    with metrics.timer("evaluation"):
+        evaluated = evaluate_invalid(offspring, toolbox)
+    metrics.inc("teambuilder_generations_total")
+    metrics.inc("teambuilder_evaluations_total", evaluated)
+
+    with metrics.timer("selection"):
+        return toolbox.select(population + offspring, len(population))
+
+def select_front(front, size):
+    """
+    Pareto front가 size개보다 많으면 밀집 거리가 큰(서로 다른 절충안인) 개체를 size개 고르는 함수.
+    고른 개체는 단일 적합도 순으로 정렬합니다.
+    """
+    front = list(front)
+    if len(front) > size:
+        front = tools.selNSGA2(front, size)
+    return sorted(front, key=lambda ind: scalar_fitness(ind.fitness.values))
+
+def best_scalar_individual(population):
+    """
+    단일 적합도가 가장 낮은 개체를 Hall of Fame에 넣을 creator.Individual로 바꾸는 함수
+    """
+    best = min(population, key=lambda ind: scalar_fitness(ind.fitness.values))
+    individual = creator.Individual(best)
+    individual.fitness.values = (scalar_fitness(best.fitness.values),)
+    return individual
+
+def front_entries(population, size):
+    """
+    마지막 세대의 첫 번째 비지배 front를 결과 JSON에 저장할 형식으로 바꾸는 함수.
+    팀 배정이 같은 개체는 하나만 남깁니다.
+
+    INPUT:
+    - population (list): 마지막 세대 (평가된 creator.ParetoIndividual 리스트)
+    - size (int): 저장할 최대 절충안 수
+
+    OUTPUT:
+    - entries (list): {"objectives": 목표별 값, "fitness": 단일 적합도, "assignment": 팀 배정} 리스트 (단일 적합도 순)
+    """
+    front, seen = [], set()
+    for ind in tools.sortNondominated(population, len(population), first_front_only=True)[0]:
+        key = tuple(ind)
+        if key not in seen and ind.fitness.values[0] < INFEASIBLE:
+            seen.add(key)
+            front.append(ind)
+    return [
+        {"objectives": dict(zip(OBJECTIVES, ind.fitness.values)), "fitness": scalar_fitness(ind.fitness.values),
+         "assignment": list(ind)}
+        for ind in select_front(front, size)
+    ]
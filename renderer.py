@@ -0,0 +1,75 @@
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from save import json_to_png, result_render_key
+import metrics
+
+def _render(json_path, dpi):
+    """
+    그림 워커 프로세스에서 결과 그림 하나를 만드는 함수
+    """
+    with metrics.timer("json_to_png"):
+        png_path = json_to_png(json_path, dpi)
+    metrics.flush(force=True)
+    return png_path
+
+class RenderPool:
+    """
+    결과 그림(json_to_png)을 API 서버와 별도인 워커 프로세스에서 만드는 풀.
+
+    같은 결과 JSON의 표를 동시에 요청하면 진행 중인 렌더링 하나를 함께 기다리고,
+    이미 그린 표는 (다른 작업의 결과라도) json_to_png가 내용 해시 캐시에서 복사하므로 다시 그리지 않습니다.
+    """
+
+    def __init__(self, workers=1, dpi=None):
+        """
+        INPUT:
+        - workers (int): 그림 워커 프로세스 수
+        - dpi (int): 해상도 (None이면 TEAMBUILDER_RENDER_DPI)
+        """
+        self.workers = workers
+        self.dpi = dpi
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def start(self):
+        """
+        그림 워커 프로세스 풀을 시작하는 함수
+        """
+        if self.executor is None:
+            context = multiprocessing.get_context("spawn")
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def stop(self):
+        """
+        진행 중인 렌더링이 끝나기를 기다린 뒤 워커를 정리하는 함수
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def submit(self, json_path):
+        """
+        결과 JSON의 그림 생성을 워커에 맡기는 함수
+
+        INPUT:
+        - json_path (str): 결과 JSON 파일 경로
+
+        OUTPUT:
+        - future (concurrent.futures.Future): 생성된 PNG 경로 (폰트가 없으면 None)를 돌려주는 Future
+        """
+        self.start()
+        # 내용이 같아도 PNG는 결과 JSON 옆에 저장되므로 경로별로 기다림 (결과 캐시로 같은 내용이 여러 작업에 생김)
+        key = (json_path, result_render_key(json_path, self.dpi))
+        with self.lock:
+            future = self.pending.get(key)
+            if future is None:
+                future = self.executor.submit(_render, json_path, self.dpi)
+                self.pending[key] = future
+                future.add_done_callback(lambda future, key=key: self._done(key))
+            return future
+
+    def _done(self, key):
+        with self.lock:
+            self.pending.pop(key, None)
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import hashlib
+from load import load_data, load_prev_json
+from save import write_json_atomic
+import config
+
+# 결과에 영향을 주지 않는 작업 옵션 (캐시 키에서 제외)
+IGNORED_OPTIONS = ("checkpoint_interval", "warm_start", "warm_start_ratio")
+# 캐시에 남기는 결과 JSON의 parameters 항목 (업로드 경로, 실행 시간, 결과 버전 등 요청마다 다른 값은 남기지 않음)
+CACHED_PARAMETERS = ("num_teams", "repeat", "solver", "stop_reason", "generations")
+
+def task_key(data_path, num_teams, repeat, options):
+    """
+    명단, 고정 배정, 풀이 옵션이 같은 요청이 같은 값을 갖는 캐시 키를 만드는 함수.
+    선수 순서와 JSON의 공백/키 순서는 키에 영향을 주지 않습니다.
+
+    INPUT:
+    - data_path (str): 업로드된 players.json 경로
+    - num_teams (int): 팀의 수
+    - repeat (int): 반복 횟수
+    - options (dict): config.solver_options로 만든 작업 옵션
+
+    OUTPUT:
+    - key (str): sha256 해시 문자열
+    """
+    fixed_assignments, players = load_data(data_path)
+    normalized = {
+        "players": sorted(players, key=lambda player: json.dumps(player, sort_keys=True)),
+        "fixed_assignments": fixed_assignments,
+        "num_teams": num_teams,
+        "repeat": repeat,
+        "options": {name: value for name, value in options.items() if name not in IGNORED_OPTIONS},
+    }
+    text = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def entry_path(key):
+    return os.path.join(config.RESULT_CACHE_DIR, f"{key}.json")
+
+def lookup(key):
+    """
+    캐시에 저장된 결과 JSON을 찾는 함수.
+    TEAMBUILDER_RESULT_CACHE_TTL보다 오래된 항목은 지우고 없는 것으로 취급하며,
+    찾은 항목은 수정 시각을 갱신해 크기 제한으로 지울 때 가장 나중에 지워지도록 합니다.
+
+    INPUT:
+    - key (str): task_key로 만든 캐시 키
+
+    OUTPUT:
+    - data (dict): 저장된 결과 JSON, 없으면 None
+    """
+    if config.RESULT_CACHE_SIZE <= 0:
+        return None
+    path = entry_path(key)
+    try:
+        if expired(os.path.getmtime(path)):
+            os.remove(path)
+            return None
+        data = load_prev_json(path)
+        os.utime(path)
+        return data
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def store(key, json_path):
+    """
+    작업의 결과 JSON을 캐시에 저장하고, 만료되었거나 개수 제한을 넘은 항목을 지우는 함수
+
+    INPUT:
+    - key (str): task_key로 만든 캐시 키
+    - json_path (str): 저장할 결과 JSON 경로
+    """
+    if config.RESULT_CACHE_SIZE <= 0:
+        return
+    os.makedirs(config.RESULT_CACHE_DIR, exist_ok=True)
+    write_json_atomic(entry_path(key), cache_entry(load_prev_json(json_path)))
+    evict()
+
+def cache_entry(data):
+    """
+    결과 JSON에서 다른 요청과 공유해도 되는 항목(results, pareto_front, CACHED_PARAMETERS)만 남기는 함수
+
+    INPUT:
+    - data (dict): 결과 JSON
+
+    OUTPUT:
+    - entry (dict): 캐시에 저장할 결과
+    """
+    parameters = data.get('parameters', {})
+    entry = {
+        'parameters': {name: parameters[name] for name in CACHED_PARAMETERS if name in parameters},
+        'results': data['results'],
+    }
+    if 'pareto_front' in data:
+        entry['pareto_front'] = data['pareto_front']
+    return entry
+
+def cached_result(data, data_path):
+    """
+    캐시에서 찾은 결과를 새 요청의 결과 JSON으로 만드는 함수.
+    parameters는 새 요청의 업로드 경로로 다시 만들고 cached를 표시합니다. (version은 저장할 때 save_update_team이 기록)
+
+    INPUT:
+    - data (dict): lookup으로 찾은 캐시 항목
+    - data_path (str): 새 요청의 players.json 경로
+
+    OUTPUT:
+    - result (dict): 저장할 결과 JSON
+    """
+    result = cache_entry(data)
+    result['parameters'].update({'data_path': data_path, 'run_time': 0.0, 'cached': True})
+    return result
+
+def expired(mtime, now=None):
+    return config.RESULT_CACHE_TTL > 0 and (now or time.time()) - mtime > config.RESULT_CACHE_TTL
+
+def evict():
+    """
+    만료된 항목을 지우고, 남은 항목이 TEAMBUILDER_RESULT_CACHE_SIZE개를 넘으면 가장 오래 쓰이지 않은 것부터 지우는 함수
+    """
+    entries = []
+    now = time.time()
+    for name in os.listdir(config.RESULT_CACHE_DIR):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(config.RESULT_CACHE_DIR, name)
+        try:
+            mtime = os.path.getmtime(path)
+            if expired(mtime, now):
+                os.remove(path)
+            else:
+                entries.append((mtime, path))
+        except FileNotFoundError:
+            # 다른 프로세스가 먼저 지운 항목
+            continue
+    entries.sort()
+    for _, path in entries[:max(0, len(entries) - config.RESULT_CACHE_SIZE)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
@@ -1,7 +1,70 @@
 import os
 import json
+import time
+import fcntl
+import shutil
+import hashlib
+from functools import lru_cache
+from load import VERSION_FILE, result_json_path, scan_result_version
+import config
 
-def save_results(best_individual, num_teams, players, repeat, data_path, elapsed_time):
+def next_result_version(directory):
+    """
+    디렉토리의 다음 결과 버전 번호를 받아 오는 함수.
+    버전 파일을 잠근 상태에서 번호를 하나 올리므로, 저장이 동시에 일어나도 같은 번호를 받지 않고
+    결과가 많아져도 파일 이름을 하나씩 확인하지 않습니다.
+
+    INPUT:
+    - directory (str): 결과를 저장할 디렉토리 (data/{uuid})
+
+    OUTPUT:
+    - version (int): 이번에 저장할 결과의 버전 번호
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, VERSION_FILE), "a+") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        file.seek(0)
+        text = file.read().strip()
+        version = int(text) if text else scan_result_version(directory)
+        file.seek(0)
+        file.truncate()
+        file.write(str(version + 1))
+        file.flush()
+    return version
+
+def write_json_atomic(path, data):
+    """
+    JSON을 임시 파일에 다 쓴 뒤 os.replace로 바꿔치기해, 읽는 쪽이 덜 쓴 파일을 보지 않게 하는 함수.
+    TEAMBUILDER_RESULT_FORMAT이 "compact"면 들여쓰기와 공백 없이 저장합니다.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding='utf-8') as f:
+        if config.RESULT_FORMAT == "compact":
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(temp_path, path)
+
+def team_results(individual, num_teams, players):
+    """
+    팀 배정을 결과 JSON의 results 형식(팀별 총점과 점수순 선수 목록)으로 바꾸는 함수
+    """
+    teams = [[] for _ in range(num_teams)]
+    for player, team_number in zip(players, individual):
+        teams[team_number].append(player)
+    
+    for team in teams:
+        team.sort(key=lambda x: x['avg'], reverse=True)
+
+    return {
+        f"Team {i+1}": {
+            "Total Score": round(sum(p['avg'] for p in team), 1),
+            "Members": {p["name"]: round(p["avg"], 1) for p in team}
+        } for i, team in enumerate(teams)
+    }
+
+def save_results(best_individual, num_teams, players, repeat, data_path, elapsed_time, extra_parameters=None, pareto_front=None):
     """
     최적의 팀 배정 결과를 JSON 파일로 저장하는 함수.
 
@@ -12,127 +75,112 @@ def save_results(best_individual, num_teams, players, repeat, data_path, elapsed
     - repeat (int): 유전자 알고리즘의 반복 횟수
     - data_path (str): 데이터 파일 경로
     - elapsed_time (float): 알고리즘 수행 시간
+    - extra_parameters (dict): parameters 항목에 함께 기록할 실행 정보 (종료 사유 등)
+    - pareto_front (list): 다목적 모드의 Pareto front ({"objectives", "fitness", "assignment"} 리스트), 주어지면 pareto_front 항목에 기록
 
     OUTPUT:
     - filename (str): 결과 JSON 파일의 경로
     """
-    teams = [[] for _ in range(num_teams)]
-    for player, team_number in zip(players, best_individual):
-        teams[team_number].append(player)
-    
-    for team in teams:
-        team.sort(key=lambda x: x['avg'], reverse=True)
-    
     result_data = {
         'parameters': {
             'num_teams': num_teams,
             'repeat': repeat,
             'data_path': data_path,
-            'run_time': round(elapsed_time, 2)
+            'run_time': round(elapsed_time, 2),
+            **(extra_parameters or {})
         },
-        'results': {
-            f"Team {i+1}": {
-                "Total Score": round(sum(p['avg'] for p in team), 1),
-                "Members": {p["name"]: round(p["avg"], 1) for p in team}
-            } for i, team in enumerate(teams)
-        }
+        'results': team_results(best_individual, num_teams, players)
     }
+    if pareto_front is not None:
+        # 클라이언트가 다시 계산하지 않고 절충안을 고를 수 있도록 front의 배정마다 results와 같은 형식으로 저장
+        result_data['pareto_front'] = [
+            {"objectives": entry["objectives"], "fitness": entry["fitness"],
+             "results": team_results(entry["assignment"], num_teams, players)}
+            for entry in pareto_front
+        ]
     
     dirname = os.path.dirname(data_path)
-    if not os.path.exists(dirname):
-        os.makedirs(dirname)
-    filename = os.path.join(dirname, "result.json")
-    index = 1
-    while os.path.exists(filename):
-        filename = os.path.join(dirname, f"result{index}.json")
-        index += 1
-    
-    with open(filename, "w", encoding='utf-8') as f:
-        json.dump(result_data, f, ensure_ascii=False, indent=4)
+    version = next_result_version(dirname)
+    result_data['parameters']['version'] = version
+    filename = result_json_path(dirname, version)
+    write_json_atomic(filename, result_data)
     
     print(f"Save Json : {filename}")
 
     return filename
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from PIL import Image
-def json_to_png(json_path):
+@lru_cache(maxsize=1)
+def load_fonts():
     """
-    JSON 파일을 읽어 팀 배정 결과를 시각화하여 PNG 파일로 저장하는 함수.
-
-    INPUT:
-    - json_path (str): JSON 파일 경로
+    표에 쓰는 기본 폰트와 머리글용 굵은 폰트를 한 번만 읽어 두는 함수.
 
     OUTPUT:
-    - png_image_path (str): 생성된 PNG 이미지 파일의 경로
+    - fonts (tuple): (기본 FontProperties, 굵은 FontProperties), 폰트가 없으면 None
     """
-    # JSON 파일을 읽어와 데이터를 로드합니다.
-    with open(json_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
+    if not os.path.exists(config.FONT_PATH):
+        return None
+    import matplotlib.font_manager as fm
+    fontprop = fm.FontProperties(fname=config.FONT_PATH)
+    bold_fontprop = fontprop.copy()
+    bold_fontprop.set_weight('bold')
+    bold_fontprop.set_size(14)
+    return fontprop, bold_fontprop
 
-    # 모든 팀의 이름을 추출합니다.
-    teams = list(data['results'].keys())
+def render_key(data, dpi):
+    """
+    결과 표 그림의 캐시 키. 팀 구성과 점수(표에 그려지는 내용)와 해상도가 같으면 같은 키가 됩니다.
+    """
+    content = json.dumps(data['results'], ensure_ascii=False) + f"|dpi={dpi}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-    # 팀 이름과 총점, 멤버, 점수를 저장할 리스트 초기화
-    team_names = []
-    total_scores = []
-    member_lists = []
-    score_lists = []
+def result_render_key(json_path, dpi=None):
+    """
+    결과 JSON 파일의 그림 캐시 키를 구하는 함수
+    """
+    with open(json_path, 'r', encoding='utf-8') as file:
+        return render_key(json.load(file), dpi or config.RENDER_DPI)
 
-    # 각 팀에 대해 데이터를 추출하여 리스트에 저장합니다.
-    for team in teams:
-        team_names.append(team)
-        total_scores.append(data['results'][team]["Total Score"])
-        member_lists.append(list(data['results'][team]["Members"].keys()))
-        score_lists.append(list(data['results'][team]["Members"].values()))
+def render_table(data, png_image_path, dpi, fonts):
+    """
+    결과 데이터를 표 그림으로 그려 PNG 파일로 저장하는 함수.
+    pyplot의 전역 상태를 쓰지 않고 Figure와 Agg 캔버스를 직접 만들므로, 호출이 끝나면 그림이 메모리에 남지 않습니다.
 
-    # 가장 많은 멤버를 가진 팀의 멤버 수를 구합니다.
-    max_members = max(len(members) for members in member_lists)
+    INPUT:
+    - data (dict): 결과 JSON 데이터
+    - png_image_path (str): 저장할 PNG 파일 경로
+    - dpi (int): 해상도
+    - fonts (tuple): load_fonts의 (기본, 굵은) 폰트
+    """
+    # matplotlib은 불러오는 데 오래 걸리므로 그림을 처음 그릴 때 불러옵니다. (그림 워커 프로세스)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-    # 멤버 수가 적은 팀의 리스트에 빈 문자열을 추가하여 길이를 맞춥니다.
-    for i in range(len(member_lists)):
-        while len(member_lists[i]) < max_members:
-            member_lists[i].append('')
-            score_lists[i].append('')
+    fontprop, bold_fontprop = fonts
 
-    # 컬럼을 생성하고, 팀 이름과 총점을 헤더로 사용하여 DataFrame을 구성합니다.
+    # 팀마다 (팀 이름, 총점)을 머리글로 하는 멤버/점수 두 열을 만듭니다.
     columns = []
-    data_dict = {}
-
-    for i in range(len(teams)):
-        columns.append(f"{team_names[i]}")
-        columns.append(f"{total_scores[i]}")
-        data_dict[columns[-2]] = member_lists[i]
-        data_dict[columns[-1]] = score_lists[i]
-
-    df = pd.DataFrame(data_dict)
-
-    # 한글을 지원하는 폰트를 불러옵니다.
-    font_path = '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'
-    if not os.path.exists(font_path):
-        print("Error: 폰트를 불러올 수 없습니다. 시스템에 'NanumGothic' 폰트가 설치되지 않았을 수 있습니다.")
-        print("설치하려면 터미널에 다음 명령어를 실행하세요: sudo apt-get install fonts-nanum")
-        return  # 폰트가 없으면 작업을 중지합니다.
+    column_values = []
+    for team, result in data['results'].items():
+        columns += [f"{team}", f"{result['Total Score']}"]
+        column_values += [list(result["Members"].keys()), list(result["Members"].values())]
 
-    fontprop = fm.FontProperties(fname=font_path)
+    # 멤버 수가 적은 팀의 열은 빈 문자열로 길이를 맞춥니다.
+    max_members = max(len(values) for values in column_values)
+    rows = [[values[i] if i < len(values) else '' for values in column_values] for i in range(max_members)]
 
     # Excel 스타일의 표를 이미지로 생성합니다.
-    fig, ax = plt.subplots(figsize=(10, len(df) * 0.5))  # 이미지 크기를 데이터에 맞춰 동적으로 설정합니다.
+    fig = Figure(figsize=(10, max_members * 0.5))  # 이미지 크기를 데이터에 맞춰 동적으로 설정합니다.
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     ax.axis('tight')  # 그래프의 축을 타이트하게 조정합니다.
     ax.axis('off')  # 그래프의 축을 숨깁니다.
-    the_table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
+    the_table = ax.table(cellText=rows, colLabels=columns, cellLoc='center', loc='center')
 
     # 테이블의 모든 셀에 폰트를 적용합니다.
     the_table.auto_set_font_size(False)
     the_table.set_fontsize(12)
 
     # team_names와 total_scores의 컬럼에 대해 폰트 크기를 키우고 굵게 설정하며 셀의 높이를 조정합니다.
-    bold_fontprop = fontprop.copy()
-    bold_fontprop.set_weight('bold')
-    bold_fontprop.set_size(14)  # 폰트 크기를 14로 설정
-
     for col_idx in range(0, len(columns), 2):  # team_names와 total_scores의 인덱스는 짝수입니다.
         the_table[0, col_idx].set_text_props(fontproperties=bold_fontprop)
         the_table[0, col_idx + 1].set_text_props(fontproperties=bold_fontprop)
@@ -146,27 +194,91 @@ def json_to_png(json_path):
         if key[0] > 0:  # 첫 번째 행은 건너뜁니다.
             cell.set_text_props(fontproperties=fontprop)
 
-    # 이미지를 PNG 파일로 저장합니다.
+    fig.savefig(png_image_path, bbox_inches='tight', dpi=dpi)
+
+def json_to_png(json_path, dpi=None):
+    """
+    JSON 파일을 읽어 팀 배정 결과를 시각화하여 PNG 파일로 저장하는 함수.
+    같은 내용의 표는 RENDER_CACHE_DIR에 저장해 둔 그림을 복사하므로 다시 그리지 않습니다.
+
+    INPUT:
+    - json_path (str): JSON 파일 경로
+    - dpi (int): 해상도 (None이면 TEAMBUILDER_RENDER_DPI)
+
+    OUTPUT:
+    - png_image_path (str): 생성된 PNG 이미지 파일의 경로
+    """
+    # JSON 파일을 읽어와 데이터를 로드합니다.
+    with open(json_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    dpi = dpi or config.RENDER_DPI
+
+    fonts = load_fonts()
+    if fonts is None:
+        print("Error: 폰트를 불러올 수 없습니다. 시스템에 'NanumGothic' 폰트가 설치되지 않았을 수 있습니다.")
+        print("설치하려면 터미널에 다음 명령어를 실행하세요: sudo apt-get install fonts-nanum")
+        return  # 폰트가 없으면 작업을 중지합니다.
+
     png_image_path = json_path.replace('.json', '.png')
-    plt.savefig(png_image_path, bbox_inches='tight', dpi=300)
+    cached_path = os.path.join(config.RENDER_CACHE_DIR, render_key(data, dpi) + '.png')
+    if config.RENDER_CACHE_SIZE > 0:
+        try:
+            shutil.copyfile(cached_path, png_image_path)
+            # 크기 제한으로 지울 때 최근에 쓴 그림이 가장 나중에 지워지도록 수정 시각을 갱신
+            os.utime(cached_path)
+            print(f"Save Png (cached) : {png_image_path}")
+            return png_image_path
+        except FileNotFoundError:
+            # 캐시에 없거나 다른 프로세스가 방금 지운 그림
+            pass
+
+    render_table(data, png_image_path, dpi, fonts)
+
+    if config.RENDER_CACHE_SIZE > 0:
+        # 다른 프로세스가 덜 쓴 캐시 파일을 읽지 않도록 임시 파일에 복사한 뒤 바꿔치기합니다.
+        os.makedirs(config.RENDER_CACHE_DIR, exist_ok=True)
+        temp_path = f"{cached_path}.{os.getpid()}.tmp"
+        shutil.copyfile(png_image_path, temp_path)
+        os.replace(temp_path, cached_path)
+        evict_render_cache()
 
     print(f"Save Png : {png_image_path}")
 
     # 생성된 PNG 파일의 경로를 반환합니다.
     return png_image_path
 
+def evict_render_cache():
+    """
+    TEAMBUILDER_RENDER_CACHE_TTL보다 오래 쓰이지 않은 그림을 지우고, 남은 그림이 TEAMBUILDER_RENDER_CACHE_SIZE개를 넘으면
+    가장 오래 쓰이지 않은 것부터 지우는 함수
+    """
+    now = time.time()
+    entries = []
+    for name in os.listdir(config.RENDER_CACHE_DIR):
+        if not name.endswith('.png'):
+            continue
+        path = os.path.join(config.RENDER_CACHE_DIR, name)
+        try:
+            mtime = os.path.getmtime(path)
+            if config.RENDER_CACHE_TTL > 0 and now - mtime > config.RENDER_CACHE_TTL:
+                os.remove(path)
+            else:
+                entries.append((mtime, path))
+        except FileNotFoundError:
+            # 다른 프로세스가 먼저 지운 그림
+            continue
+    entries.sort()
+    for _, path in entries[:max(0, len(entries) - config.RENDER_CACHE_SIZE)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+
 def save_update_team(filepath, data):
     dirname = os.path.dirname(filepath)
-    if not os.path.exists(dirname):
-        os.makedirs(dirname)
-    
-    filename = os.path.join(dirname, "result.json")
-    index = 1
-    while os.path.exists(filename):
-        filename = os.path.join(dirname, f"result{index}.json")
-        index += 1
-    
-    with open(filename, "w", encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    version = next_result_version(dirname)
+    data.setdefault('parameters', {})['version'] = version
+    filename = result_json_path(dirname, version)
+    write_json_atomic(filename, data)
 
     return filename
\ No newline at end of file
@@ -0,0 +1,249 @@
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from util import setup_logging
+from task_store import open_task_store, process_owner, is_orphaned, TASK_FIELDS, SHARED_FIELDS
+import metrics
+
+class QueueFull(Exception):
+    """
+    대기열이 가득 차 작업을 더 받을 수 없을 때 발생하는 예외
+    """
+
+class RemoteTaskState:
+    """
+    워커 프로세스에서 TaskState 대신 사용하는 객체.
+
+    속성을 바꾸면 변경 내용을 API 서버 프로세스로 보내고, cancelled는 서버가 기록한 취소 여부를 읽습니다.
+    """
+
+    def __init__(self, task_id, updates, cancelled):
+        """
+        INPUT:
+        - task_id (str): 작업 uuid
+        - updates (multiprocessing.Queue): (task_id, 속성 이름, 값)을 서버로 보내는 큐
+        - cancelled (dict): 서버와 공유하는 작업별 취소 여부 ("keep"이면 체크포인트를 남기고 취소)
+        """
+        object.__setattr__(self, "task_id", task_id)
+        object.__setattr__(self, "updates", updates)
+        object.__setattr__(self, "cancelled_flags", cancelled)
+        # solver가 읽는 필드(cache_stats 등)는 TaskState와 같은 기본값으로 시작 (서버에 보내지 않음)
+        for name, value in TASK_FIELDS.items():
+            if name not in SHARED_FIELDS:
+                object.__setattr__(self, name, value)
+
+    @property
+    def cancelled(self):
+        return bool(self.cancelled_flags.get(self.task_id, False))
+
+    @property
+    def keep_checkpoint(self):
+        return self.cancelled_flags.get(self.task_id) == "keep"
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        self.updates.put((self.task_id, name, value))
+
+def _init_worker():
+    setup_logging()
+    # 유전 알고리즘 모듈(numpy, DEAP)은 API 서버가 아닌 워커 프로세스에서 미리 불러 첫 작업이 기다리지 않게 함
+    import solver
+    solver.ensure_creator()
+
+def _run_job(task_id, args, updates, cancelled, store):
+    """
+    워커 프로세스에서 작업 하나를 실행하는 함수.
+    작업 저장소를 다른 프로세스에서 열 수 있으면 진행 상황을 저장소에 직접 기록하고,
+    그렇지 않으면 RemoteTaskState로 서버에 보냅니다.
+    """
+    from solver import execute_genetic
+    if store is not None:
+        task = open_task_store(*store)[task_id]
+    else:
+        task = RemoteTaskState(task_id, updates, cancelled)
+    execute_genetic(task_id, task, *args)
+
+class JobScheduler:
+    """
+    유전 알고리즘 작업을 API 서버와 별도인 워커 프로세스에서 실행하는 스케줄러.
+
+    동시에 실행하는 작업 수(concurrency)와 대기열 길이(max_queued)를 제한합니다.
+    작업은 uuid마다 하나만 대기하거나 실행할 수 있으며, 들어온 순서대로 실행되므로
+    한 사용자가 여러 자리를 차지하지 못합니다. 워커가 보내는 진행 상황은 별도 스레드가 받아
+    서버의 TaskState에 반영합니다.
+    """
+
+    def __init__(self, tasks, concurrency=2, max_queued=32, on_finished=None, stale_after=600.0):
+        """
+        INPUT:
+        - tasks : 작업 저장소 (task_store.open_task_store로 연 MemoryTaskStore 또는 SQLiteTaskStore)
+        - concurrency (int): 동시에 실행하는 작업 수
+        - max_queued (int): 실행을 기다릴 수 있는 최대 작업 수
+        - on_finished (callable): 작업이 정상적으로 끝나면 task_id를 받아 호출할 함수 (예: 결과 그림 생성)
+        - stale_after (float): 다른 서버 워커가 맡은 작업을 이 시간(초) 넘게 진행 기록이 없으면 버려진 것으로 봄 (cancel)
+        """
+        self.tasks = tasks
+        self.stale_after = stale_after
+        # 이 스케줄러가 맡은 작업의 owner 값 (다른 서버 워커가 취소할 때 실행 중인지 판단하는 데 사용)
+        self.owner = process_owner()
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.on_finished = on_finished
+        self.queue = OrderedDict()
+        self.running = {}
+        self.lock = threading.RLock()
+        self.executor = None
+
+    def start(self):
+        """
+        워커 프로세스 풀과 진행 상황 수신 스레드를 시작하는 함수
+        """
+        if self.executor is not None:
+            return
+        # API 서버의 스레드를 물려받지 않도록 워커는 spawn으로 만듭니다.
+        context = multiprocessing.get_context("spawn")
+        self.manager = context.Manager()
+        self.updates = self.manager.Queue()
+        self.cancelled = self.manager.dict()
+        self.executor = ProcessPoolExecutor(max_workers=self.concurrency, mp_context=context, initializer=_init_worker)
+        self.listener = threading.Thread(target=self._listen, daemon=True)
+        self.listener.start()
+
+    def stop(self):
+        """
+        실행 중인 작업이 끝나기를 기다린 뒤 워커와 수신 스레드를 정리하는 함수
+        """
+        if self.executor is None:
+            return
+        with self.lock:
+            self.queue.clear()
+        self.executor.shutdown()
+        self.updates.put(None)
+        self.listener.join()
+        self.manager.shutdown()
+        self.executor = None
+
+    def submit(self, task_id, args):
+        """
+        작업을 대기열에 넣고 자리가 있으면 바로 실행하는 함수
+
+        INPUT:
+        - task_id (str): 작업 uuid
+        - args (tuple): execute_genetic에 task 다음으로 넘길 인자 (num_teams, repeat, data_path, options[, resume])
+
+        OUTPUT:
+        - position (int): 대기 순서 (0이면 바로 실행)
+        """
+        with self.lock:
+            if len(self.queue) >= self.max_queued:
+                metrics.inc("teambuilder_tasks_rejected_total")
+                raise QueueFull(f"{len(self.queue)} tasks are already waiting")
+            self.cancelled[task_id] = False
+            self.queue[task_id] = args
+            task = self.tasks.get(task_id)
+            if task is not None:
+                task.owner = self.owner
+            metrics.inc("teambuilder_tasks_submitted_total")
+            self._dispatch()
+            return self._position(task_id)
+
+    def counts(self):
+        """
+        대기 중인 작업 수와 실행 중인 작업 수를 반환하는 함수
+        """
+        with self.lock:
+            return len(self.queue), len(self.running)
+
+    def position(self, task_id):
+        """
+        작업의 대기 순서를 반환하는 함수
+
+        OUTPUT:
+        - position (int): 실행 중이면 0, 대기 중이면 1부터 시작하는 순서, 스케줄러에 없으면 None
+        """
+        with self.lock:
+            return self._position(task_id)
+
+    def cancel(self, task_id, keep_checkpoint=False):
+        """
+        작업을 취소하는 함수. 대기 중이면 대기열에서 빼고, 실행 중이면 워커에 취소를 알립니다.
+        다른 서버 워커가 맡은 작업은 저장소의 취소 여부만 보고 그 서버 워커가 마무리하도록 두며,
+        맡은 서버 프로세스가 없는 작업(서버 재시작 등, is_orphaned)만 바로 끝난 것으로 기록합니다.
+
+        INPUT:
+        - task_id (str): 작업 uuid
+        - keep_checkpoint (bool): True면 워커가 멈추면서 체크포인트를 남김
+        """
+        with self.lock:
+            if task_id in self.queue:
+                del self.queue[task_id]
+                # 워커로 보내지 않은 작업은 _finished가 호출되지 않으므로 여기서 취소 여부를 지움
+                self.cancelled.pop(task_id, None)
+                task = self.tasks.get(task_id)
+                if task is not None:
+                    task.progress = 100.0
+                    task.remaining_time = 0
+            elif task_id in self.running:
+                self.cancelled[task_id] = "keep" if keep_checkpoint else True
+            else:
+                task = self.tasks.get(task_id)
+                if task is not None and task.progress < 100 and is_orphaned(task, self.stale_after):
+                    task.progress = 100.0
+                    task.remaining_time = 0
+
+    def _position(self, task_id):
+        if task_id in self.running:
+            return 0
+        for position, queued_id in enumerate(self.queue, start=1):
+            if queued_id == task_id:
+                return position
+        return None
+
+    def _dispatch(self):
+        # lock을 잡은 상태에서 호출: 빈 자리만큼 대기열 앞의 작업을 워커로 보냅니다.
+        store = (self.tasks.url, self.tasks.ttl) if self.tasks.url is not None else None
+        while self.queue and len(self.running) < self.concurrency:
+            task_id, args = self.queue.popitem(last=False)
+            # 대기 중에 다른 서버 워커에서 취소되었거나 만료된 작업은 건너뜀
+            task = self.tasks.get(task_id)
+            if task is None or task.cancelled:
+                self.cancelled.pop(task_id, None)
+                if task is not None:
+                    task.progress = 100.0
+                continue
+            future = self.executor.submit(_run_job, task_id, args, self.updates, self.cancelled, store)
+            self.running[task_id] = future
+            future.add_done_callback(lambda future, task_id=task_id: self._finished(task_id, future))
+
+    def _finished(self, task_id, future):
+        with self.lock:
+            self.running.pop(task_id, None)
+            self.cancelled.pop(task_id, None)
+            error = future.exception()
+            if error is not None:
+                logging.error(f"Task {task_id} failed in worker: {error}")
+                task = self.tasks.get(task_id)
+                if task is not None:
+                    task.result_path = None
+                    task.progress = 100.0
+                    task.remaining_time = 0
+            elif self.on_finished is not None:
+                try:
+                    self.on_finished(task_id)
+                except Exception as e:
+                    logging.error(f"Task {task_id} post-processing failed: {e}")
+            if self.executor is not None:
+                self._dispatch()
+
+    def _listen(self):
+        # 워커가 보낸 (task_id, 속성 이름, 값)을 서버의 TaskState에 반영합니다.
+        while True:
+            update = self.updates.get()
+            if update is None:
+                return
+            task_id, name, value = update
+            task = self.tasks.get(task_id)
+            if task is not None:
+                setattr(task, name, value)
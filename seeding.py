@@ -0,0 +1,340 @@
+import heapq
+import random
+from deap import creator
+
+def team_targets(num_teams, fixed_assignments, players):
+    """
+    팀별 목표 인원 수를 정하는 함수.
+    모든 팀이 len(players) // num_teams 이상이 되도록 하고, 남는 자리는 고정 선수가 많은 팀부터 채웁니다.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+
+    OUTPUT:
+    - targets (list): 팀별 목표 인원 수 (합계는 선수 수와 같음)
+    """
+    num_players = len(players)
+    fixed_counts = [0] * num_teams
+    for player in players:
+        if player['name'] in fixed_assignments:
+            fixed_counts[fixed_assignments[player['name']]] += 1
+
+    targets = [max(num_players // num_teams, count) for count in fixed_counts]
+    order = sorted(range(num_teams), key=lambda team: -fixed_counts[team])
+    surplus = num_players - sum(targets)
+    while surplus > 0:
+        for team in sorted(order, key=lambda team: targets[team]):
+            if surplus == 0:
+                break
+            targets[team] += 1
+            surplus -= 1
+    # 고정 선수가 한 팀에 너무 몰려 있으면 최소 인원을 지킬 수 없으므로 고정 선수가 없는 자리부터 줄입니다.
+    while surplus < 0:
+        team = max((team for team in range(num_teams) if targets[team] > fixed_counts[team]), key=lambda team: targets[team])
+        targets[team] -= 1
+        surplus += 1
+    return targets
+
+def _split_players(fixed_assignments, players):
+    # 고정 선수는 팀 번호가 정해진 배정으로, 나머지는 인덱스 리스트로 나눕니다.
+    individual = [0] * len(players)
+    free_indices = []
+    for i, player in enumerate(players):
+        if player['name'] in fixed_assignments:
+            individual[i] = fixed_assignments[player['name']]
+        else:
+            free_indices.append(i)
+    return individual, free_indices
+
+def _fixed_sums(individual, free_indices, num_teams, players):
+    # 고정 선수만으로 계산한 팀별 평균 점수 합계
+    free = set(free_indices)
+    sums = [0.0] * num_teams
+    for i, team in enumerate(individual):
+        if i not in free:
+            sums[team] += players[i]['avg']
+    return sums
+
+def _free_slots(individual, free_indices, targets):
+    # 팀별 목표 인원에서 고정 선수 수를 뺀 남은 자리
+    slots = list(targets)
+    free = set(free_indices)
+    for i, team in enumerate(individual):
+        if i not in free:
+            slots[team] -= 1
+    return [max(0, slot) for slot in slots]
+
+def balanced_random_individual(num_teams, fixed_assignments, players, targets):
+    """
+    팀별 목표 인원을 지키면서 나머지 선수를 무작위로 배정하는 함수.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - targets (list): team_targets로 구한 팀별 목표 인원 수
+
+    OUTPUT:
+    - individual (list): 팀 배정 리스트
+    """
+    individual, free_indices = _split_players(fixed_assignments, players)
+    slots = [team for team, count in enumerate(_free_slots(individual, free_indices, targets)) for _ in range(count)]
+    random.shuffle(slots)
+    for i, team in zip(free_indices, slots):
+        individual[i] = team
+    return individual
+
+def snake_draft_individual(num_teams, fixed_assignments, players, targets):
+    """
+    평균 점수가 높은 선수부터 스네이크 드래프트(0→k-1, k-1→0 ...)로 배정하는 함수.
+    고정 선수 점수 합이 낮은 팀이 먼저 뽑고, 목표 인원이 찬 팀은 건너뜁니다.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - targets (list): team_targets로 구한 팀별 목표 인원 수
+
+    OUTPUT:
+    - individual (list): 팀 배정 리스트
+    """
+    individual, free_indices = _split_players(fixed_assignments, players)
+    fixed_sums = _fixed_sums(individual, free_indices, num_teams, players)
+    slots = _free_slots(individual, free_indices, targets)
+
+    order = sorted(range(num_teams), key=lambda team: fixed_sums[team])
+    picks = []
+    while len(picks) < len(free_indices):
+        for team in order:
+            if slots[team] > 0:
+                picks.append(team)
+                slots[team] -= 1
+        order.reverse()
+
+    for i, team in zip(sorted(free_indices, key=lambda i: -players[i]['avg']), picks):
+        individual[i] = team
+    return individual
+
+def differencing_individual(num_teams, fixed_assignments, players, targets):
+    """
+    Karmarkar-Karp 방식의 다중 분할 차분법(largest differencing)으로 배정하는 함수.
+
+    평균 점수 순으로 num_teams명씩 묶어 한 명씩 다른 팀에 두는 부분 분할을 만들고,
+    팀 합계의 편차가 가장 큰 두 부분 분할을 큰 팀과 작은 팀끼리 짝지어 합치는 과정을 반복합니다.
+    묶음마다 팀당 한 명씩이므로 팀 인원이 고르게 유지됩니다. 마지막에 고정 선수의 팀과 합칠 때도
+    같은 방식으로 짝지은 뒤, 고정 선수 때문에 어긋난 인원은 repair_sizes로 맞춥니다.
+
+    INPUT:
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - targets (list): team_targets로 구한 팀별 목표 인원 수
+
+    OUTPUT:
+    - individual (list): 팀 배정 리스트
+    """
+    individual, free_indices = _split_players(fixed_assignments, players)
+    fixed_sums = _fixed_sums(individual, free_indices, num_teams, players)
+    ranked = sorted(free_indices, key=lambda i: -players[i]['avg'])
+
+    # 부분 분할: 팀 합계 내림차순으로 정렬된 (합계, 선수 인덱스 리스트) 목록
+    heap = []
+    for start in range(0, len(ranked), num_teams):
+        group = ranked[start:start + num_teams]
+        subsets = [(players[i]['avg'], [i]) for i in group] + [(0.0, []) for _ in range(num_teams - len(group))]
+        heapq.heappush(heap, (-(subsets[0][0] - subsets[-1][0]), start, subsets))
+
+    while len(heap) > 1:
+        _, order, first = heapq.heappop(heap)
+        _, _, second = heapq.heappop(heap)
+        merged = [(a[0] + b[0], a[1] + b[1]) for a, b in zip(first, reversed(second))]
+        merged.sort(key=lambda subset: -subset[0])
+        heapq.heappush(heap, (-(merged[0][0] - merged[-1][0]), order, merged))
+
+    if heap:
+        subsets = heap[0][2]
+        for team, (_, members) in zip(sorted(range(num_teams), key=lambda team: fixed_sums[team]), subsets):
+            for i in members:
+                individual[i] = team
+    return repair_sizes(individual, targets, free_indices, players)
+
+def repair_sizes(individual, targets, free_indices, players, moves=None):
+    """
+    팀 인원을 목표 인원에 맞추는 함수.
+    인원이 넘치는 팀에서 고정되지 않은 선수를 인원이 모자란 팀으로 옮기며,
+    두 팀의 평균 점수 합 차이를 가장 줄이는 선수를 고릅니다. 고정 선수는 옮기지 않습니다.
+
+    INPUT:
+    - individual (list): 팀 배정 리스트 (제자리에서 수정됨)
+    - targets (list): 팀별 목표 인원 수
+    - free_indices (list): 고정되지 않은 선수의 인덱스
+    - players (list): 일반 선수 리스트
+    - moves (list): 주어지면 옮긴 선수를 (인덱스, 이전 팀, 새 팀)으로 추가
+
+    OUTPUT:
+    - individual (list): 인원이 맞춰진 팀 배정 리스트
+    """
+    num_teams = len(targets)
+    counts = [0] * num_teams
+    sums = [0.0] * num_teams
+    for player, team in zip(players, individual):
+        counts[team] += 1
+        sums[team] += player['avg']
+
+    over = [team for team in range(num_teams) if counts[team] > targets[team]]
+    under = [team for team in range(num_teams) if counts[team] < targets[team]]
+    while over and under:
+        source = max(over, key=lambda team: sums[team])
+        target = min(under, key=lambda team: sums[team])
+        gap = (sums[source] - sums[target]) / 2
+        candidates = [i for i in free_indices if individual[i] == source]
+        if not candidates:
+            over.remove(source)
+            continue
+        moved = min(candidates, key=lambda i: abs(players[i]['avg'] - gap))
+        individual[moved] = target
+        if moves is not None:
+            moves.append((moved, source, target))
+        counts[source] -= 1
+        counts[target] += 1
+        sums[source] -= players[moved]['avg']
+        sums[target] += players[moved]['avg']
+        if counts[source] == targets[source]:
+            over.remove(source)
+        if counts[target] == targets[target]:
+            under.remove(target)
+    return individual
+
+def swap_mutant(individual, free_indices, swaps):
+    """
+    서로 다른 팀의 고정되지 않은 선수 두 명을 swaps번 맞바꾼 복사본을 만드는 함수.
+    팀 인원은 바뀌지 않습니다.
+
+    INPUT:
+    - individual (list): 원본 팀 배정 리스트
+    - free_indices (list): 고정되지 않은 선수의 인덱스
+    - swaps (int): 맞바꿀 횟수
+
+    OUTPUT:
+    - mutant (list): 맞바꾼 팀 배정 리스트
+    """
+    mutant = list(individual)
+    if len(free_indices) < 2:
+        return mutant
+    for _ in range(swaps):
+        i, j = random.sample(free_indices, 2)
+        mutant[i], mutant[j] = mutant[j], mutant[i]
+    return mutant
+
+def seed_population(n, num_teams, fixed_assignments, players, track=None):
+    """
+    휴리스틱으로 만든 초기 개체들을 반환하는 함수.
+    스네이크 드래프트와 차분법 결과 각 1개, 그 둘을 조금씩 바꾼 개체, 인원을 맞춘 무작위 개체를 섞습니다.
+
+    INPUT:
+    - n (int): 만들 개체 수
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - track (callable): 만든 개체에 적용할 함수 (증분 집계값을 붙이는 데 사용)
+
+    OUTPUT:
+    - seeds (list): creator.Individual 리스트
+    """
+    if n <= 0:
+        return []
+    targets = team_targets(num_teams, fixed_assignments, players)
+    free_indices = [i for i, player in enumerate(players) if player['name'] not in fixed_assignments]
+
+    heuristics = [
+        snake_draft_individual(num_teams, fixed_assignments, players, targets),
+        differencing_individual(num_teams, fixed_assignments, players, targets),
+    ]
+    seeds = heuristics[:n]
+    num_mutants = (n - len(seeds)) // 2
+    for k in range(num_mutants):
+        seeds.append(swap_mutant(heuristics[k % len(heuristics)], free_indices, random.randint(1, 3)))
+    while len(seeds) < n:
+        seeds.append(balanced_random_individual(num_teams, fixed_assignments, players, targets))
+
+    seeds = [creator.Individual(seed) for seed in seeds]
+    if track is not None:
+        seeds = [track(seed) for seed in seeds]
+    return seeds
+
+def assignment_from_result(result, num_teams, fixed_assignments, players):
+    """
+    이전 결과 JSON의 팀 구성을 새 선수 명단에 옮기는 함수.
+
+    이름이 같은 선수는 이전 팀에 그대로 두고, 새로 추가되었거나 없는 팀에 있던 선수는 평균 점수가 높은 순서로
+    목표 인원이 남은 팀 중 평균 점수 합이 가장 낮은 팀에 넣습니다. 고정 선수는 지정된 팀을 따르며,
+    마지막으로 팀 인원을 목표 인원에 맞춥니다.
+
+    INPUT:
+    - result (dict): load_prev_json으로 읽은 이전 결과 ("results"의 "Team N" -> "Members")
+    - num_teams (int): 팀의 수
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+
+    OUTPUT:
+    - individual (list): 팀 배정 리스트
+    - matched (int): 이전 팀을 그대로 이어받은 고정되지 않은 선수 수
+    """
+    previous = {}
+    for team_name, team_info in result['results'].items():
+        team = int(team_name.split()[-1]) - 1
+        for name in team_info['Members']:
+            previous[name] = team
+
+    targets = team_targets(num_teams, fixed_assignments, players)
+    individual, free_indices = _split_players(fixed_assignments, players)
+    free = set(free_indices)
+    unplaced = []
+    for i in free_indices:
+        team = previous.get(players[i]['name'])
+        if team is None or team >= num_teams:
+            unplaced.append(i)
+        else:
+            individual[i] = team
+
+    counts = [0] * num_teams
+    sums = [0.0] * num_teams
+    pending = set(unplaced)
+    for i, team in enumerate(individual):
+        if i not in pending:
+            counts[team] += 1
+            sums[team] += players[i]['avg']
+    for i in sorted(unplaced, key=lambda i: -players[i]['avg']):
+        team = min(range(num_teams), key=lambda team: (counts[team] >= targets[team], sums[team]))
+        individual[i] = team
+        counts[team] += 1
+        sums[team] += players[i]['avg']
+
+    repair_sizes(individual, targets, free_indices, players)
+    return individual, len(free) - len(unplaced)
+
+def warm_start_population(n, base, fixed_assignments, players, track=None):
+    """
+    이전 결과에서 옮긴 배정과 그 배정의 선수 몇 명을 맞바꾼 개체들을 반환하는 함수.
+
+    INPUT:
+    - n (int): 만들 개체 수
+    - base (list): assignment_from_result로 만든 팀 배정
+    - fixed_assignments (dict): 고정된 선수의 팀 배정 정보
+    - players (list): 일반 선수 리스트
+    - track (callable): 만든 개체에 적용할 함수 (증분 집계값을 붙이는 데 사용)
+
+    OUTPUT:
+    - seeds (list): creator.Individual 리스트
+    """
+    if n <= 0:
+        return []
+    free_indices = [i for i, player in enumerate(players) if player['name'] not in fixed_assignments]
+    seeds = [list(base)] + [swap_mutant(base, free_indices, random.randint(1, 3)) for _ in range(n - 1)]
+
+    seeds = [creator.Individual(seed) for seed in seeds]
+    if track is not None:
+        seeds = [track(seed) for seed in seeds]
+    return seeds
@@ -0,0 +1,523 @@
+import time
+import logging
+from deap import tools
+from load import load_data, load_prev_json
+from save import save_results
+from genetic_algorithm import ensure_creator, setup_toolbox, initialize_population, evolve_generation
+from parallel import SubPopulationPool, IslandPool
+from array_engine import ArrayEngine
+from local_search import local_search
+from seeding import assignment_from_result
+from exact_solver import exact_solve, is_small_roster
+from hierarchical_solver import hierarchical_solve, is_large_roster
+from pareto import setup_pareto_toolbox, to_pareto_population, evaluate_invalid, evolve_pareto_generation, best_scalar_individual, front_entries
+from checkpoint import checkpoint_path, save_checkpoint, load_checkpoint, restore_random, remove_checkpoint
+from util import log_task_event
+import metrics
+import config
+
+class StopCondition:
+    """
+    세대 반복을 일찍 끝낼지 판단하는 클래스.
+    취소, 목표 적합도 도달, 정체(개선 없는 세대 수), 실행 시간 초과를 확인합니다.
+    """
+
+    def __init__(self, start_time, stagnation=0, target_fitness=None, time_budget=0):
+        """
+        INPUT:
+        - start_time : 작업 시작 시각
+        - stagnation : 최고 적합도가 개선되지 않아도 되는 최대 세대 수 (0이면 사용하지 않음)
+        - target_fitness : 이 값 이하의 적합도에 도달하면 종료 (None이면 사용하지 않음)
+        - time_budget : 최대 실행 시간(초) (0이면 사용하지 않음)
+        """
+        self.start_time = start_time
+        self.stagnation = stagnation
+        self.target_fitness = target_fitness
+        self.time_budget = time_budget
+        self.best_fitness = None
+        self.best_gen = 0
+
+    def check(self, task, hof, gen):
+        """
+        gen 세대를 시작하기 전에 종료 여부를 확인하는 함수
+
+        INPUT:
+        - task
+        - hof
+        - gen : 다음에 처리할 세대 번호 (지금까지 처리한 세대 수)
+
+        OUTPUT:
+        - reason (str): 종료 사유, 계속 진행하면 None
+        """
+        if task.cancelled:
+            return "cancelled"
+
+        if len(hof) > 0:
+            best = hof[0].fitness.values[0]
+            if self.best_fitness is None or best < self.best_fitness:
+                self.best_fitness, self.best_gen = best, gen
+            if self.target_fitness is not None and best <= self.target_fitness:
+                return "target_fitness"
+            if self.stagnation and gen - self.best_gen >= self.stagnation:
+                return "stagnation"
+
+        if self.time_budget and time.time() - self.start_time >= self.time_budget:
+            return "time_budget"
+        return None
+
+    def remaining_time(self):
+        """
+        실행 시간 제한까지 남은 시간(초), 제한이 없으면 None
+        """
+        if not self.time_budget:
+            return None
+        return max(0.0, self.time_budget - (time.time() - self.start_time))
+
+class CheckpointWriter:
+    """
+    정해진 세대 간격마다 체크포인트를 저장하는 클래스
+    """
+
+    def __init__(self, path, interval, meta):
+        """
+        INPUT:
+        - path : 체크포인트 파일 경로
+        - interval : 저장 간격(세대 수) (0이면 저장하지 않음)
+        - meta : 이어서 실행할 때 필요한 작업 정보 (num_teams, repeat, data_path, options)
+        """
+        self.path = path
+        self.interval = interval
+        self.meta = meta
+        self.last_saved = None
+
+    def maybe_save(self, population, hof, gen, run_info):
+        """
+        마지막 저장 이후 interval 세대 이상 지났으면 저장하는 함수 (gen: 지금까지 처리한 세대 수)
+        """
+        if not self.interval:
+            return
+        if self.last_saved is None:
+            self.last_saved = gen - gen % self.interval
+        if gen - self.last_saved >= self.interval:
+            self.save(population, hof, gen, run_info)
+
+    def save(self, population, hof, gen, run_info):
+        save_checkpoint(self.path, population, hof, gen, dict(self.meta, run_info=run_info))
+        self.last_saved = gen
+
+def should_log_generation(gen, generations=1):
+    """
+    세대 gen부터 generations개 세대를 처리한 뒤 진행 로그를 남길지 여부.
+    세대마다 로그를 쓰면 짧은 세대에서 로그가 실행 시간의 상당 부분을 차지하므로
+    GENERATION_LOG_INTERVAL 세대마다 한 번만 남깁니다 (0이면 남기지 않음).
+    """
+    interval = config.GENERATION_LOG_INTERVAL
+    return interval > 0 and (gen + generations) // interval > gen // interval
+
+def execute_genetic(task_id: str, task, num_teams, repeat, data_path, options=None, resume=False):
+    """
+    실제 유전 알고리즘을 실행시키는 함수
+
+    INPUT:
+    - task_id (str): 요청하는 uuid의 값
+    - task : 진행 상황을 기록할 TaskState (워커 프로세스에서는 RemoteTaskState)
+    - num_teams : 팀의 수
+    - repeat : 반복 횟수
+    - data_path : players.json 파일의 위치
+    - options : config.solver_options로 만든 작업 옵션 (None이면 서버 설정값)
+    - resume : True면 data/{uuid}/checkpoint.npz의 Population과 세대 번호부터 이어서 실행
+
+    OUTPUT:
+    - result.json : 자세한 결과를 담은 json 파일
+    - result.png : 공유를 위해 간략하게 시각화한 이미지 파일
+    """
+
+    run_info = {"stop_reason": "completed", "generations": 0}
+    pareto_front = None
+    ensure_creator()
+    # 도중에 실패해도 finally의 finalize_task가 원래 오류를 가리지 않도록 미리 만들어 둠
+    start_time = time.time()
+    hof = tools.HallOfFame(1)
+    players = []
+
+    try:
+        logging.debug("Task {task_id} started")
+        logging.debug("Loading data...")
+        fixed_assignments, players = load_data(data_path)
+        options = options or config.solver_options()
+        stop = StopCondition(start_time, options["stagnation"], options["target_fitness"], options["time_budget"])
+        workers, islands = options["workers"], options["islands"]
+
+        if options["objectives"] == "pareto":
+            # 다목적 모드는 직렬 DEAP 경로에서만 실행 (정확/계층 풀이, 병렬 실행, 체크포인트 없음)
+            pareto_front = run_pareto(task_id, task, num_teams, fixed_assignments, players, repeat, start_time,
+                                      stop, options, hof, run_info)
+            return
+
+        checkpoint_file = checkpoint_path(data_path)
+        checkpoint = load_checkpoint(checkpoint_file) if resume else None
+        start_gen = 0
+
+        exact_report = hierarchical_report = None
+        if checkpoint is not None:
+            # 체크포인트에서 이어서 실행할 때는 정확 풀이 결과도 체크포인트에 기록된 것을 사용
+            start_gen = checkpoint["generation"]
+            run_info = dict(checkpoint["meta"]["run_info"], stop_reason="completed", resumed_from=start_gen)
+            log_task_event(task_id, f"Resuming from generation {start_gen}")
+        elif options["solver"] == "hierarchical" or (options["solver"] == "auto" and is_large_roster(
+                players, options["hierarchical_min_players"])):
+            logging.debug("Running hierarchical solver...")
+            solution, hierarchical_report = hierarchical_solve(num_teams, fixed_assignments, players, workers,
+                                                               options["hierarchical_refine_time"], lambda: task.cancelled)
+            run_info["hierarchical"] = hierarchical_report
+            log_task_event(task_id, f"Hierarchical solver: {hierarchical_report}")
+        elif options["solver"] == "exact" or (options["solver"] == "auto" and is_small_roster(
+                num_teams, fixed_assignments, players, options["exact_max_free_players"], options["exact_max_teams"])):
+            logging.debug("Running exact solver...")
+            time_limit = options["exact_time_limit"]
+            if options["solver"] == "auto":
+                time_limit = min(time_limit, options["exact_auto_time_limit"])
+            solution, exact_report = exact_solve(num_teams, fixed_assignments, players, time_limit,
+                                                 lambda: task.cancelled)
+            run_info["exact"] = exact_report
+            log_task_event(task_id, f"Exact solver: {exact_report}, fitness {solution.fitness.values[0]}")
+        # 계층 분할 풀이를 썼거나, 최적이 증명됐거나 정확 풀이만 요청한 경우 유전 알고리즘을 건너뜀
+        skip_ga = hierarchical_report is not None or (
+            exact_report is not None and (exact_report["optimal"] or options["solver"] == "exact"))
+        if hierarchical_report is not None:
+            run_info["solver"] = "hierarchical"
+        elif checkpoint is None:
+            run_info["solver"] = "exact" if skip_ga else "exact+ga" if exact_report is not None else "ga"
+        ga_repeat = 0 if skip_ga else repeat
+        saver = CheckpointWriter(checkpoint_file, options["checkpoint_interval"],
+                                 {"num_teams": num_teams, "repeat": repeat, "data_path": data_path, "options": options})
+
+        logging.debug("Setting up toolbox...")
+        toolbox = setup_toolbox(num_teams, fixed_assignments, players, encoding=options["encoding"],
+                                cache_size=options["fitness_cache"])
+
+        if checkpoint is not None:
+            population = checkpoint["population"]
+            if toolbox.incremental:
+                toolbox.refresh(population)
+            hof.update(checkpoint["hof"])
+            task.best_fitness = hof[0].fitness.values[0]
+            restore_random(checkpoint)
+        elif hierarchical_report is not None:
+            # 큰 명단에서는 쓰지 않을 초기 Population을 만들지 않음
+            population = []
+        else:
+            logging.debug("Creating population...")
+            population, _, stats = initialize_population(toolbox, options["seed_ratio"])
+            if options["warm_start"]:
+                # 이전 결과의 팀 구성을 새 명단에 옮겨 초기 Population 앞부분을 채움
+                base, matched = assignment_from_result(load_prev_json(options["warm_start"]), num_teams, fixed_assignments, players)
+                # 추가/변경된 선수 때문에 깨진 균형은 언덕 오르기로 먼저 맞춤
+                base, _ = local_search(base, num_teams, fixed_assignments, players,
+                                       options["local_search_iterations"], options["local_search_time"])
+                warm = toolbox.warm_start_population(int(len(population) * options["warm_start_ratio"]), base)
+                population[:len(warm)] = warm
+                run_info["warm_start"] = {"path": options["warm_start"], "matched_players": matched}
+                log_task_event(task_id, f"Warm start from {options['warm_start']}: {matched} players matched")
+        if exact_report is not None or hierarchical_report is not None:
+            hof.update([solution])
+            task.best_fitness = hof[0].fitness.values[0]
+        if hierarchical_report is not None:
+            run_info["stop_reason"] = "cancelled" if task.cancelled else "completed"
+            pool = None
+        elif skip_ga:
+            run_info["stop_reason"] = "optimal" if exact_report["optimal"] else "exact_time_limit"
+            pool = None
+        elif islands > 1:
+            logging.debug(f"Creating {islands} islands...")
+            for _ in range(islands - 1 if checkpoint is None else 0):
+                population += initialize_population(toolbox, options["seed_ratio"])[0]
+            pool = IslandPool(workers if workers > 1 else islands, islands, num_teams, fixed_assignments, players,
+                              migrants=options["migrants"], topology=options["topology"], engine=options["engine"],
+                              encoding=options["encoding"], cache_size=options["fitness_cache"])
+            interval = options["migration_interval"]
+        elif workers > 1:
+            pool = SubPopulationPool(workers, num_teams, fixed_assignments, players, engine=options["engine"],
+                                     encoding=options["encoding"], cache_size=options["fitness_cache"])
+            interval = options["sync_interval"]
+        else:
+            pool = None
+
+        published = publish_best_teams(task, hof, num_teams, players)
+        if pool is not None:
+            with pool:
+                gen = start_gen
+                while gen < ga_repeat:
+                    reason = stop.check(task, hof, gen)
+                    if reason:
+                        run_info["stop_reason"] = reason
+                        break
+                    generations = min(interval, ga_repeat - gen)
+                    if should_log_generation(gen, generations):
+                        logging.debug(f"Generation {gen+1}-{gen+generations} on {pool.workers} workers...")
+
+                    population = process_parallel_generations(task_id, task, pool, population, hof, gen, generations, repeat, start_time, stop)
+                    published = publish_best_teams(task, hof, num_teams, players, published)
+                    gen += generations
+                    run_info["generations"] = gen
+                    saver.maybe_save(population, hof, gen, run_info)
+        else:
+            engine = None
+            if options["engine"] == "array":
+                # Population을 배열 하나로 바꿔 DEAP 개체 없이 진화시킴
+                engine = ArrayEngine(num_teams, fixed_assignments, players, encoding=options["encoding"],
+                                     fitness_cache=toolbox.fitness_cache)
+                population = engine.from_population(population)
+            for gen in range(start_gen, ga_repeat):
+                reason = stop.check(task, hof, gen)
+                if reason:
+                    run_info["stop_reason"] = reason
+                    break
+                if should_log_generation(gen):
+                    logging.debug(f"Generation {gen+1}...")
+
+                population = process_generation(task_id, task, toolbox, population, hof, gen, repeat, start_time, stop, engine)
+                published = publish_best_teams(task, hof, num_teams, players, published)
+                run_info["generations"] = gen + 1
+                saver.maybe_save(population, hof, gen + 1, run_info)
+        logging.debug(f"Task {task_id} stopped: {run_info['stop_reason']} after {run_info['generations']} generations")
+        if task.cache_stats is not None:
+            run_info["fitness_cache"] = task.cache_stats
+        if run_info["stop_reason"] == "cancelled" and task.keep_checkpoint and hierarchical_report is None:
+            # 취소 시 체크포인트를 남기면 /resume-task/로 이어서 실행 가능
+            saver.save(population, hof, run_info["generations"], run_info)
+        else:
+            remove_checkpoint(checkpoint_file)
+
+        if options["local_search"] and not skip_ga and run_info["stop_reason"] != "cancelled" and len(hof) > 0:
+            logging.debug("Polishing best individual with local search...")
+            polished, run_info["local_search"] = local_search(hof[0], num_teams, fixed_assignments, players,
+                                                              options["local_search_iterations"], options["local_search_time"])
+            hof.update([polished])
+            task.best_fitness = hof[0].fitness.values[0]
+            publish_best_teams(task, hof, num_teams, players, published)
+            log_task_event(task_id, f"Local search: {run_info['local_search']}")
+    except Exception as e:
+        logging.error(f"Task {task_id} failed: {e}")
+        task.result_path = None
+    finally:
+        finalize_task(task_id, task, hof, num_teams, players, repeat, data_path, start_time, run_info, pareto_front)
+
+def run_pareto(task_id, task, num_teams, fixed_assignments, players, repeat, start_time, stop, options, hof, run_info):
+    """
+    NSGA-II 다목적 모드로 세대를 반복하는 함수.
+    hof에는 단일 적합도(evaluate와 같은 값)가 가장 낮은 개체를 넣어 진행률과 기존 결과 형식을 그대로 유지합니다.
+
+    INPUT:
+    - task_id (str): 요청하는 uuid의 값
+    - task
+    - num_teams, fixed_assignments, players : load_data로 읽은 명단
+    - repeat : 반복 횟수
+    - start_time
+    - stop : StopCondition
+    - options : 작업 옵션
+    - hof : 단일 적합도 기준 HallOfFame(1)
+    - run_info : 종료 사유와 실제 세대 수를 기록할 실행 정보
+
+    OUTPUT:
+    - pareto_front (list): 마지막 세대의 Pareto front (pareto.front_entries)
+    """
+    run_info.update(solver="ga", objectives="pareto")
+    logging.debug("Setting up Pareto toolbox...")
+    toolbox = setup_pareto_toolbox(num_teams, fixed_assignments, players, options["encoding"])
+    population = to_pareto_population(initialize_population(toolbox, options["seed_ratio"])[0])
+    evaluate_invalid(population, toolbox)
+    hof.update([best_scalar_individual(population)])
+    task.best_fitness = hof[0].fitness.values[0]
+
+    published = publish_best_teams(task, hof, num_teams, players)
+    for gen in range(repeat):
+        reason = stop.check(task, hof, gen)
+        if reason:
+            run_info["stop_reason"] = reason
+            break
+        if should_log_generation(gen):
+            logging.debug(f"Generation {gen+1}...")
+
+        gen_start_time = time.time()
+        population = evolve_pareto_generation(population, toolbox, gen)
+        with metrics.timer("hof_update"):
+            hof.update([best_scalar_individual(population)])
+        task.best_fitness = hof[0].fitness.values[0]
+        update_progress(task_id, task, gen, repeat, start_time, gen_start_time, stop=stop)
+        metrics.flush()
+        published = publish_best_teams(task, hof, num_teams, players, published)
+        run_info["generations"] = gen + 1
+
+    pareto_front = front_entries(population, options["pareto_front_size"])
+    logging.debug(f"Task {task_id} stopped: {run_info['stop_reason']} after {run_info['generations']} generations")
+    log_task_event(task_id, f"Pareto front: {len(pareto_front)} assignments")
+    return pareto_front
+
+def publish_best_teams(task, hof, num_teams, players, published=None):
+    """
+    최적 개체가 바뀌었으면 팀별 평균 점수 합계를 task.best_team_sums에 기록하는 함수
+
+    INPUT:
+    - task
+    - hof
+    - num_teams
+    - players
+    - published : 지난번에 기록한 최적 개체의 적합도
+
+    OUTPUT:
+    - published : 이번에 기록한 최적 개체의 적합도 (다음 호출에 그대로 넘김)
+    """
+    if len(hof) == 0:
+        return published
+    fitness = hof[0].fitness.values[0]
+    if fitness == published:
+        return published
+    sums = [0.0] * num_teams
+    for player, team in zip(players, hof[0]):
+        sums[team] += player['avg']
+    task.best_team_sums = [round(value, 1) for value in sums]
+    return fitness
+
+def process_generation(task_id, task, toolbox, population, hof, gen, repeat, start_time, stop=None, engine=None):
+    """
+    세대별 작업 처리
+
+    INPUT:
+    - task_id (str): 요청하는 uuid의 값
+    - task
+    - toolbox
+    - population
+    - hof
+    - gen
+    - repeat
+    - start_time
+    - stop : StopCondition (남은 시간 계산에 실행 시간 제한을 반영)
+    - engine : ArrayEngine (주어지면 population은 ArrayPopulation)
+
+    OUTPUT:
+    - population
+    """
+
+    gen_start_time = time.time()
+
+    if engine is not None:
+        population = engine.evolve_generation(population, gen)
+        with metrics.timer("hof_update"):
+            engine.update_hof(hof, population)
+        cache = engine.fitness_cache
+    else:
+        population = evolve_generation(population, toolbox, gen)
+        with metrics.timer("hof_update"):
+            hof.update(population)
+        cache = toolbox.fitness_cache
+    task.best_fitness = hof[0].fitness.values[0]
+    if cache is not None:
+        task.cache_stats = cache.stats()
+
+    update_progress(task_id, task, gen, repeat, start_time, gen_start_time, stop=stop)
+    metrics.flush()
+    return population
+
+def process_parallel_generations(task_id, task, pool, population, hof, gen, generations, repeat, start_time, stop=None):
+    """
+    워커 프로세스들에서 여러 세대를 한 번에 처리
+
+    INPUT:
+    - task_id (str): 요청하는 uuid의 값
+    - task
+    - pool : SubPopulationPool 또는 IslandPool
+    - population
+    - hof
+    - gen : 시작 세대 번호
+    - generations : 이번에 처리할 세대 수
+    - repeat
+    - start_time
+    - stop : StopCondition (남은 시간 계산에 실행 시간 제한을 반영)
+
+    OUTPUT:
+    - population
+    """
+
+    gen_start_time = time.time()
+
+    population = pool.evolve(population, gen, generations)
+    with metrics.timer("hof_update"):
+        hof.update(population)
+    task.best_fitness = hof[0].fitness.values[0]
+    if pool.cache_stats is not None:
+        task.cache_stats = dict(pool.cache_stats)
+
+    update_progress(task_id, task, gen + generations - 1, repeat, start_time, gen_start_time, generations, stop)
+    metrics.flush()
+    return population
+
+def update_progress(task_id, task, gen, repeat, start_time, gen_start_time, generations=1, stop=None):
+    """
+    작업 진행률 및 남은 시간 업데이트
+
+    INPUT:
+    - task_id (str): 요청하는 uuid의 값
+    - task
+    - gen
+    - repeat
+    - start_time
+    - gen_start_time
+    - generations : gen_start_time 이후 처리한 세대 수
+    - stop : StopCondition (실행 시간 제한이 있으면 남은 시간이 그 이상이 되지 않음)
+
+    OUTPUT:
+    - task.progress
+    - task.remaining_time
+    """
+
+    task.progress = (gen + 1) / repeat * 100
+
+    elapsed_time = time.time() - start_time
+    gen_time = (time.time() - gen_start_time) / generations
+    remaining_time = gen_time * (repeat - gen - 1)
+    budget_left = stop.remaining_time() if stop else None
+    if budget_left is not None:
+        remaining_time = min(remaining_time, budget_left)
+    task.remaining_time = int(remaining_time)
+
+    if should_log_generation(gen + 1 - generations, generations):
+        log_task_event(task_id, f"Progress: {task.progress:.2f}%, Remaining Time: {task.remaining_time} seconds")
+
+def finalize_task(task_id, task, hof, num_teams, players, repeat, data_path, start_time, run_info=None, pareto_front=None):
+    """
+    작업 종료 후 처리
+    
+    INPUT:
+    - task_id (str): 요청하는 uuid의 값
+    - task
+    - hof
+    - num_teams
+    - players
+    - repeat
+    - data_path
+    - start_time
+    - run_info : 결과 JSON의 parameters에 함께 기록할 실행 정보 (종료 사유, 실제 세대 수)
+    - pareto_front : 다목적 모드의 Pareto front (결과 JSON의 pareto_front에 기록)
+
+    OUTPUT:
+    - total_processing_time
+    - task.result_json
+    - task.progress
+    - task.remaining_time
+    """
+    total_processing_time = time.time() - start_time
+    if len(hof) > 0:
+        with metrics.timer("save_results"):
+            task.result_json = save_results(hof[0], num_teams, players, repeat, data_path, total_processing_time, run_info,
+                                            pareto_front)
+        # 결과 그림은 작업 워커를 붙잡지 않도록 API 서버의 그림 풀에서 만듭니다. (main.RenderPool)
+
+        log_task_event(task_id, f"Results saved to {task.result_json}")
+    else:
+        # 개체를 하나도 얻기 전에 실패한 작업 (원인은 execute_genetic이 남긴 오류 로그)
+        log_task_event(task_id, "No result to save")
+
+    task.progress = 100.0
+    task.remaining_time = 0
+    metrics.flush(force=True)
@@ -0,0 +1,287 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from util import ensure_directory_exists
+
+# 작업 상태로 저장하는 필드와 기본값
+TASK_FIELDS = {
+    "cancelled": False,
+    "progress": 0.0,
+    "remaining_time": 0,
+    "result_path": None,
+    "result_json": None,
+    "best_fitness": None,
+    "cache_stats": None,
+    "keep_checkpoint": False,
+    "best_team_sums": None,
+    "owner": None,
+}
+
+# 다른 프로세스(취소 요청을 받은 서버 워커)가 바꾸므로 읽을 때마다 저장소에서 다시 가져오는 필드
+SHARED_FIELDS = ("cancelled", "keep_checkpoint")
+
+# JSON 문자열로 저장하는 필드
+JSON_FIELDS = ("cache_stats", "best_team_sums")
+
+class TaskState:
+    def __init__(self):
+        self.cancelled = False
+        self.progress = 0.0
+        self.remaining_time = 0
+        self.result_path = None
+        self.result_json = None
+        self.best_fitness = None
+        self.cache_stats = None
+        self.keep_checkpoint = False
+        self.best_team_sums = None
+        self.owner = None
+
+    def __setattr__(self, name, value):
+        # 마지막으로 바뀐 시각을 함께 기록해 TTL 만료 판단에 사용합니다.
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "updated_at", time.time())
+
+class MemoryTaskStore:
+    """
+    작업 상태를 프로세스 메모리의 dict에 보관하는 저장소.
+    서버를 다시 시작하면 사라지고 프로세스끼리 공유되지 않으므로 단일 프로세스 실행이나 벤치마크용입니다.
+    """
+
+    # 다른 프로세스에서 열 수 있는 주소 (메모리 저장소는 없음)
+    url = None
+
+    def __init__(self, ttl=86400):
+        """
+        INPUT:
+        - ttl (float): 마지막 변경 후 이 시간(초)이 지난 작업은 삭제
+        """
+        self.ttl = ttl
+        self.tasks = {}
+
+    def __contains__(self, task_id):
+        return self.get(task_id) is not None
+
+    def __getitem__(self, task_id):
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def __setitem__(self, task_id, task):
+        self.evict_expired()
+        self.tasks[task_id] = task
+
+    def __delitem__(self, task_id):
+        del self.tasks[task_id]
+
+    def get(self, task_id):
+        task = self.tasks.get(task_id)
+        if task is not None and time.time() - task.updated_at > self.ttl:
+            del self.tasks[task_id]
+            return None
+        return task
+
+    def evict_expired(self):
+        """
+        TTL이 지난 작업을 삭제하는 함수
+
+        OUTPUT:
+        - evicted (int): 삭제한 작업 수
+        """
+        deadline = time.time() - self.ttl
+        expired = [task_id for task_id, task in self.tasks.items() if task.updated_at < deadline]
+        for task_id in expired:
+            del self.tasks[task_id]
+        return len(expired)
+
+class StoredTaskState:
+    """
+    SQLiteTaskStore의 작업 하나를 TaskState처럼 다루는 객체.
+
+    속성을 바꾸면 바로 저장소에 기록하고, SHARED_FIELDS는 다른 프로세스가 바꿀 수 있으므로 읽을 때마다 저장소에서 다시 가져옵니다.
+    나머지 속성은 객체를 만들 때 읽은 값을 사용합니다.
+    """
+
+    def __init__(self, store, task_id, values, updated_at=None):
+        object.__setattr__(self, "store", store)
+        object.__setattr__(self, "task_id", task_id)
+        object.__setattr__(self, "values", values)
+        object.__setattr__(self, "updated_at", updated_at if updated_at is not None else time.time())
+
+    def __getattr__(self, name):
+        if name not in TASK_FIELDS:
+            raise AttributeError(name)
+        if name in SHARED_FIELDS:
+            return self.store.read_field(self.task_id, name)
+        return self.values[name]
+
+    def __setattr__(self, name, value):
+        if name not in TASK_FIELDS:
+            raise AttributeError(name)
+        self.values[name] = value
+        self.store.write_fields(self.task_id, {name: value})
+
+class SQLiteTaskStore:
+    """
+    작업 상태를 SQLite 파일에 보관하는 저장소.
+
+    서버를 다시 시작해도 상태가 남고, 같은 파일을 여는 여러 uvicorn 워커와 작업 워커 프로세스가
+    진행률과 취소 여부를 함께 봅니다. 마지막 변경 후 TTL이 지난 작업은 새 작업을 등록할 때 삭제합니다.
+    """
+
+    def __init__(self, path, ttl=86400):
+        """
+        INPUT:
+        - path (str): SQLite 파일 경로
+        - ttl (float): 마지막 변경 후 이 시간(초)이 지난 작업은 삭제
+        """
+        self.path = path
+        self.url = f"sqlite:{path}"
+        self.ttl = ttl
+        self.local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            ensure_directory_exists(directory)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "task_id TEXT PRIMARY KEY, cancelled INTEGER, progress REAL, remaining_time REAL, "
+                "result_path TEXT, result_json TEXT, best_fitness REAL, cache_stats TEXT, keep_checkpoint INTEGER, best_team_sums TEXT, "
+                "owner TEXT, updated_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at)")
+            # 예전 버전에서 만든 파일에는 나중에 추가된 필드 열을 더합니다.
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(tasks)")}
+            for name in TASK_FIELDS:
+                if name not in columns:
+                    connection.execute(f"ALTER TABLE tasks ADD COLUMN {name}")
+
+    def _connection(self):
+        # 스레드마다 연결을 하나씩 만들어 재사용합니다.
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def __contains__(self, task_id):
+        return self.get(task_id) is not None
+
+    def __getitem__(self, task_id):
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def __setitem__(self, task_id, task):
+        self.evict_expired()
+        values = [self._encode(name, getattr(task, name)) for name in TASK_FIELDS]
+        with self._connection() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO tasks (task_id, {', '.join(TASK_FIELDS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(TASK_FIELDS) + 2))})",
+                [task_id] + values + [time.time()],
+            )
+
+    def __delitem__(self, task_id):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def get(self, task_id):
+        row = self._connection().execute(
+            f"SELECT {', '.join(TASK_FIELDS)}, updated_at FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        if row is None or time.time() - row[-1] > self.ttl:
+            return None
+        values = {name: self._decode(name, value) for name, value in zip(TASK_FIELDS, row)}
+        return StoredTaskState(self, task_id, values, row[-1])
+
+    def read_field(self, task_id, name):
+        row = self._connection().execute(f"SELECT {name} FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return self._decode(name, row[0]) if row is not None else TASK_FIELDS[name]
+
+    def write_fields(self, task_id, values):
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        parameters = [self._encode(name, value) for name, value in values.items()]
+        with self._connection() as connection:
+            connection.execute(f"UPDATE tasks SET {assignments}, updated_at = ? WHERE task_id = ?",
+                               parameters + [time.time(), task_id])
+
+    def evict_expired(self):
+        """
+        TTL이 지난 작업을 삭제하는 함수
+
+        OUTPUT:
+        - evicted (int): 삭제한 작업 수
+        """
+        with self._connection() as connection:
+            return connection.execute("DELETE FROM tasks WHERE updated_at < ?", (time.time() - self.ttl,)).rowcount
+
+    @staticmethod
+    def _encode(name, value):
+        if name in SHARED_FIELDS:
+            return int(bool(value))
+        if name in JSON_FIELDS:
+            return json.dumps(value) if value is not None else None
+        return value
+
+    @staticmethod
+    def _decode(name, value):
+        if name in SHARED_FIELDS:
+            return bool(value)
+        if name in JSON_FIELDS:
+            return json.loads(value) if value is not None else None
+        return value
+
+def process_owner():
+    """
+    작업을 맡은 서버 프로세스를 나타내는 값 (호스트 이름:pid), 작업의 owner 필드에 기록합니다.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def is_orphaned(task, stale_after):
+    """
+    작업을 맡은 서버 프로세스가 더 이상 없는 작업인지 확인하는 함수.
+    맡은 프로세스가 없거나, 같은 호스트에서 그 프로세스가 끝났거나(서버 재시작 등),
+    stale_after초 넘게 진행 상황이 기록되지 않았으면 True입니다.
+
+    INPUT:
+    - task : 작업 상태 (TaskState 또는 StoredTaskState)
+    - stale_after (float): 진행 상황 기록이 없으면 버려진 것으로 보는 시간(초)
+
+    OUTPUT:
+    - orphaned (bool)
+    """
+    if task.owner is None:
+        return True
+    host, _, pid = task.owner.rpartition(":")
+    if host == socket.gethostname() and pid.isdigit():
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+    return time.time() - task.updated_at > stale_after
+
+def open_task_store(url, ttl=86400):
+    """
+    주소에 맞는 작업 저장소를 여는 함수
+
+    INPUT:
+    - url (str): "memory" 또는 "sqlite:<파일 경로>"
+    - ttl (float): 마지막 변경 후 이 시간(초)이 지난 작업은 삭제
+
+    OUTPUT:
+    - store (MemoryTaskStore | SQLiteTaskStore): 작업 저장소
+    """
+    if url == "memory":
+        return MemoryTaskStore(ttl)
+    if url.startswith("sqlite:"):
+        return SQLiteTaskStore(url[len("sqlite:"):], ttl)
+    raise ValueError(f"Unknown task store: {url}")
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# 모듈이 저장소 최상위에 있으므로 tests/에서도 그대로 import 할 수 있게 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 측정값/캐시 파일이 저장소의 data/에 남지 않도록 임시 디렉토리를 씁니다. (config는 import 시점에 환경 변수를 읽음)
+_data_dir = tempfile.mkdtemp(prefix="teambuilder-tests-")
+for name in ("METRICS_DIR", "RENDER_CACHE_DIR", "RESULT_CACHE_DIR"):
+    os.environ.setdefault(f"TEAMBUILDER_{name}", os.path.join(_data_dir, name.lower()))
+# main을 불러오는 테스트가 작업 저장소(sqlite)를 만들지 않도록 메모리 저장소를 씁니다.
+os.environ.setdefault("TEAMBUILDER_TASK_STORE", "memory")
@@ -0,0 +1,60 @@
+import random
+import pytest
+from deap import tools
+from genetic_algorithm import ensure_creator, setup_toolbox, initialize_population, evolve_generation, population_to_arrays
+from array_engine import ArrayEngine
+from test_incremental import make_roster
+
+def run_deap(toolbox, population, generations, seed):
+    random.seed(seed)
+    hof = tools.HallOfFame(1)
+    for gen in range(generations):
+        population = evolve_generation(population, toolbox, gen)
+        hof.update(population)
+    return population, hof
+
+def run_engine(engine, population, generations, seed):
+    random.seed(seed)
+    hof = tools.HallOfFame(1)
+    population = engine.from_population(population)
+    for gen in range(generations):
+        population = engine.evolve_generation(population, gen)
+        engine.update_hof(hof, population)
+    return population, hof
+
+@pytest.mark.parametrize("encoding", ["free", "balanced"])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_deap_path_under_the_same_seed(encoding, seed):
+    ensure_creator()
+    fixed_assignments, players = make_roster(37, 3, 4, seed)
+    toolbox = setup_toolbox(3, fixed_assignments, players, incremental=False, encoding=encoding)
+    random.seed(seed)
+    initial = initialize_population(toolbox, seed_ratio=0.1, size=40)[0]
+
+    expected, expected_hof = run_deap(toolbox, [toolbox.clone(ind) for ind in initial], 15, seed)
+    engine = ArrayEngine(3, fixed_assignments, players, encoding=encoding)
+    population, hof = run_engine(engine, initial, 15, seed)
+
+    genes, fitness = population_to_arrays(expected)
+    assert population.genes.tolist() == genes.tolist()
+    assert population.arrays()[1].tolist() == fitness.tolist()
+    assert list(hof[0]) == list(expected_hof[0])
+    assert hof[0].fitness.values == expected_hof[0].fitness.values
+
+def test_fitness_cache_does_not_change_the_run():
+    ensure_creator()
+    fixed_assignments, players = make_roster(20, 2, 2, 5)
+    toolbox = setup_toolbox(2, fixed_assignments, players, incremental=False)
+    random.seed(5)
+    initial = initialize_population(toolbox, size=40)[0]
+
+    plain, plain_hof = run_engine(ArrayEngine(2, fixed_assignments, players), initial, 30, 5)
+    engine = ArrayEngine(2, fixed_assignments, players, cache_size=1000)
+    cached, cached_hof = run_engine(engine, initial, 30, 5)
+
+    assert cached.genes.tolist() == plain.genes.tolist()
+    assert cached.fitness.tolist() == plain.fitness.tolist()
+    assert list(cached_hof[0]) == list(plain_hof[0])
+    stats = engine.fitness_cache.stats()
+    # 수렴한 Population은 같은 배정을 반복해서 만들므로 캐시에서 꺼낸 평가가 있어야 함
+    assert stats["hits"] > 0 and stats["misses"] > 0
@@ -0,0 +1,31 @@
+import io
+import json
+import config
+from batch import roster_files, run_batch
+from load import load_prev_json
+from test_incremental import make_roster
+from test_solver import write_roster
+
+def test_malformed_roster_is_reported_without_aborting_the_batch(tmp_path):
+    fixed_assignments, players = make_roster(16, 2, 2, 0)
+    good = write_roster(tmp_path / "good.json", players, fixed_assignments)
+    bad = tmp_path / "bad.json"
+    bad.write_text('{"fixed_assignments": {}, "players": [', encoding="utf-8")
+    # 이전 실행이 남긴 결과 JSON은 명단으로 읽지 않음
+    (tmp_path / "result.json").write_text("{}", encoding="utf-8")
+    files = roster_files([str(tmp_path)])
+    assert files == [str(bad), good]
+
+    output = io.StringIO()
+    options = config.solver_options(solver="ga", workers=0, islands=0, checkpoint_interval=0)
+    failed = run_batch(files, [2], 10, options, 2, output, seed=0)
+
+    assert failed == 1
+    records = {record["data_path"]: record for record in map(json.loads, output.getvalue().splitlines())}
+    assert sorted(records) == sorted(files)
+    # 작업이 logging.error로 남긴 첫 오류가 요약에 기록됨 (ErrorCollector)
+    assert records[str(bad)]["error"].startswith(f"Task {bad}:2 failed")
+    record = records[good]
+    assert "error" not in record and record["num_teams"] == 2 and record["generations"] == 10
+    result = load_prev_json(record["result"])
+    assert {team: info["Total Score"] for team, info in result["results"].items()} == record["team_sums"]
@@ -0,0 +1,82 @@
+import os
+import random
+import asyncio
+import config
+from deap import tools
+from genetic_algorithm import ensure_creator, setup_toolbox, initialize_population, evolve_generation
+from checkpoint import checkpoint_path, save_checkpoint, load_checkpoint, restore_random
+from solver import execute_genetic
+from task_store import TaskState
+from load import load_prev_json
+from test_incremental import make_roster
+from test_solver import write_roster
+
+class CancelAfter(TaskState):
+    # generations 세대를 처리한 뒤 체크포인트를 남기고 취소하는 작업 (/cancel-task/의 keep_checkpoint=true)
+    def __init__(self, generations):
+        object.__setattr__(self, "remaining", None)
+        super().__init__()
+        object.__setattr__(self, "remaining", generations)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "progress" and self.remaining is not None and value < 100:
+            object.__setattr__(self, "remaining", self.remaining - 1)
+            if self.remaining == 0:
+                self.keep_checkpoint = True
+                self.cancelled = True
+
+def test_saved_checkpoint_restores_population_hof_and_random_state(tmp_path):
+    ensure_creator()
+    fixed_assignments, players = make_roster(20, 2, 2, 0)
+    toolbox = setup_toolbox(2, fixed_assignments, players)
+    random.seed(0)
+    population, hof, _ = initialize_population(toolbox, size=20)
+    population = evolve_generation(population, toolbox, 0)
+    hof.update(population)
+    path = str(tmp_path / "checkpoint.npz")
+    save_checkpoint(path, population, hof, 1, {"num_teams": 2})
+    expected = [random.random() for _ in range(5)]
+
+    checkpoint = load_checkpoint(path)
+    assert checkpoint["generation"] == 1 and checkpoint["meta"] == {"num_teams": 2}
+    assert [list(ind) for ind in checkpoint["population"]] == [list(ind) for ind in population]
+    assert [ind.fitness.values for ind in checkpoint["population"]] == [ind.fitness.values for ind in population]
+    assert list(checkpoint["hof"][0]) == list(hof[0])
+    assert checkpoint["hof"][0].fitness.values == hof[0].fitness.values
+    restore_random(checkpoint)
+    assert [random.random() for _ in range(5)] == expected
+
+def test_cancelled_task_resumes_from_its_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task_id = "resumed"
+    os.makedirs(f"data/{task_id}")
+    fixed_assignments, players = make_roster(30, 3, 3, 1)
+    data_path = write_roster(tmp_path / "data" / task_id / "players.json", players, fixed_assignments)
+    options = config.solver_options(solver="ga", checkpoint_interval=0, stagnation=0)
+    random.seed(1)
+    execute_genetic(task_id, CancelAfter(6), 3, 40, data_path, options)
+
+    path = checkpoint_path(data_path)
+    checkpoint = load_checkpoint(path)
+    assert checkpoint["generation"] == 6
+    assert checkpoint["meta"]["run_info"]["stop_reason"] == "cancelled"
+    saved_best = checkpoint["hof"][0].fitness.values[0]
+
+    # /resume-task/는 체크포인트에 기록된 작업 정보로 resume=True인 작업을 스케줄러에 넣음
+    import main
+    submitted = []
+    monkeypatch.setattr(main.scheduler, "submit", lambda task_id, args: submitted.append((task_id, args)) or 0)
+    response = asyncio.run(main.resume_task(task_id))
+    assert response["message"] == "Task resumed"
+    (submitted_id, args), = submitted
+    assert submitted_id == task_id and args == (3, 40, data_path, options, True)
+
+    task = TaskState()
+    execute_genetic(task_id, task, *args)
+    parameters = load_prev_json(task.result_json)["parameters"]
+    assert parameters["resumed_from"] == 6
+    assert parameters["generations"] == 40 and parameters["stop_reason"] == "completed"
+    assert task.best_fitness <= saved_best
+    # 끝까지 실행하면 체크포인트를 지움
+    assert not os.path.exists(path)
@@ -0,0 +1,33 @@
+import random
+import numpy as np
+import pytest
+from genetic_algorithm import evaluate, evaluate_population, fitness_from_team_sums, team_sums, player_arrays
+from seeding import team_targets, balanced_random_individual
+from test_incremental import make_roster
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_fitness_is_bit_identical_to_evaluate(seed):
+    rng = random.Random(seed)
+    num_teams = rng.randint(2, 8)
+    fixed_assignments, players = make_roster(rng.randint(4 * num_teams + 10, 120), num_teams, rng.randint(0, 10), seed)
+    avg_scores, max_scores = player_arrays(players)
+    random.seed(seed)
+    # 모든 팀이 목표 인원을 채운 개체
+    targets = team_targets(num_teams, fixed_assignments, players)
+    population = [list(balanced_random_individual(num_teams, fixed_assignments, players, targets)) for _ in range(25)]
+    for _ in range(25):
+        # 최소 인원을 못 채운 개체를 섞음 (팀 번호를 일부 팀으로만 뽑음)
+        teams = rng.randint(1, num_teams - 1)
+        individual = [rng.randrange(teams) for _ in players]
+        for i, player in enumerate(players):
+            if player["name"] in fixed_assignments:
+                individual[i] = fixed_assignments[player["name"]]
+        population.append(individual)
+
+    expected = [evaluate(individual, num_teams, players)[0] for individual in population]
+    assert evaluate_population(np.array(population), num_teams, avg_scores, max_scores).tolist() == expected
+    counts, avg_sums, max_sums = team_sums(np.array(population), num_teams, avg_scores, max_scores)
+    fitness = fitness_from_team_sums(counts, avg_sums, max_sums, len(players) // num_teams, exact=True)
+    assert fitness.tolist() == expected
+    sizes = [np.bincount(individual, minlength=num_teams).min() for individual in population]
+    assert min(sizes) < len(players) // num_teams <= max(sizes)
@@ -0,0 +1,71 @@
+import os
+import random
+import itertools
+import pytest
+import config
+from genetic_algorithm import ensure_creator, evaluate
+from exact_solver import exact_solve, is_small_roster
+from load import load_data
+from test_incremental import make_roster
+
+def brute_force(num_teams, fixed_assignments, players):
+    # 고정 선수를 지키고 모든 팀이 최소 인원을 채운 배정 중 evaluate가 가장 낮은 값 (exact_solve처럼 최소 인원을 채운 배정만 비교)
+    free = [i for i, player in enumerate(players) if player['name'] not in fixed_assignments]
+    assignment = [fixed_assignments.get(player['name'], 0) for player in players]
+    min_team_size = len(players) // num_teams
+    best = 1000
+    feasible = False
+    for teams in itertools.product(range(num_teams), repeat=len(free)):
+        for i, team in zip(free, teams):
+            assignment[i] = team
+        if min(assignment.count(team) for team in range(num_teams)) >= min_team_size:
+            fitness = evaluate(assignment, num_teams, players)[0]
+            best = fitness if not feasible else min(best, fitness)
+            feasible = True
+    return best
+
+def random_roster(seed):
+    rng = random.Random(seed)
+    num_teams = rng.choice([2, 3])
+    num_players = rng.randint(num_teams * 2, 9)
+    players = [{"name": f"p{i}", "avg": round(rng.uniform(100, 220), 1), "max": rng.randint(150, 300)}
+               for i in range(num_players)]
+    fixed = rng.sample(range(num_players), rng.randint(0, num_players // 2))
+    # 한 팀에 고정 선수를 몰아 자유 선수의 맞바꾸기/옮기기가 막히는 경우도 포함
+    crowded = rng.random() < 0.3
+    fixed_assignments = {players[i]['name']: 0 if crowded else rng.randrange(num_teams) for i in fixed}
+    return num_teams, fixed_assignments, players
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force_on_small_rosters(seed):
+    ensure_creator()
+    random.seed(seed)
+    num_teams, fixed_assignments, players = random_roster(seed)
+    solution, report = exact_solve(num_teams, fixed_assignments, players)
+    assert report["optimal"]
+    assert solution.fitness.values[0] == pytest.approx(brute_force(num_teams, fixed_assignments, players), abs=1e-9)
+    assert all(solution[i] == fixed_assignments[player['name']]
+               for i, player in enumerate(players) if player['name'] in fixed_assignments)
+
+def test_fixed_players_filling_one_team():
+    ensure_creator()
+    players = [{"name": f"p{i}", "avg": 100.0 + i, "max": 150 + i} for i in range(6)]
+    fixed_assignments = {"p0": 0, "p1": 0, "p2": 0}
+    solution, report = exact_solve(2, fixed_assignments, players)
+    assert list(solution) == [0, 0, 0, 1, 1, 1]
+    assert report["optimal"]
+
+@pytest.mark.parametrize("num_teams", [2, 3, 4])
+def test_rosters_routed_by_auto_are_proven_within_the_auto_time_limit(num_teams):
+    ensure_creator()
+    for seed in range(3):
+        random.seed(seed)
+        # "auto"가 정확 풀이로 보내는 가장 큰 명단 (고정되지 않은 선수 EXACT_MAX_FREE_PLAYERS명)
+        fixed_assignments, players = make_roster(config.EXACT_MAX_FREE_PLAYERS + num_teams, num_teams, num_teams, seed)
+        assert is_small_roster(num_teams, fixed_assignments, players, config.EXACT_MAX_FREE_PLAYERS, num_teams)
+        _, report = exact_solve(num_teams, fixed_assignments, players, config.EXACT_AUTO_TIME_LIMIT)
+        assert report["optimal"]
+
+def test_sample_roster_is_left_to_the_genetic_algorithm():
+    fixed_assignments, players = load_data(os.path.join(os.path.dirname(__file__), "..", "players.backup"))
+    assert not is_small_roster(4, fixed_assignments, players, config.EXACT_MAX_FREE_PLAYERS, config.EXACT_MAX_TEAMS)
@@ -0,0 +1,54 @@
+import random
+import numpy as np
+import pytest
+from genetic_algorithm import ensure_creator, player_arrays, evaluate
+from seeding import team_targets
+from hierarchical_solver import hierarchical_solve, refine_swaps
+from parallel import shutdown_executor
+from test_incremental import make_roster
+
+def crowded_roster(num_players, num_teams, seed):
+    # 일부 팀에 고정 선수를 목표 인원보다 많이 몰아 팀마다 목표 인원이 다른 명단
+    fixed_assignments, players = make_roster(num_players, num_teams, num_teams * 2, seed)
+    for i in range(num_players // num_teams + 2):
+        fixed_assignments[players[-1 - i]["name"]] = 0
+    return fixed_assignments, players
+
+@pytest.mark.parametrize("num_teams", [2, 5, 12])
+def test_fixed_players_stay_and_team_sizes_follow_targets(num_teams):
+    ensure_creator()
+    random.seed(num_teams)
+    fixed_assignments, players = crowded_roster(300 + num_teams, num_teams, num_teams)
+    solution, report = hierarchical_solve(num_teams, fixed_assignments, players, refine_time=0.5)
+    assert all(solution[i] == fixed_assignments[player["name"]]
+               for i, player in enumerate(players) if player["name"] in fixed_assignments)
+    assert np.bincount(solution, minlength=num_teams).tolist() == team_targets(num_teams, fixed_assignments, players)
+    assert solution.fitness.values == evaluate(solution, num_teams, players)
+    assert report["after"] <= report["before"]
+
+def test_seeded_run_does_not_depend_on_worker_count():
+    ensure_creator()
+    fixed_assignments, players = crowded_roster(800, 10, 5)
+    solutions = []
+    try:
+        for workers in (0, 2):
+            random.seed(5)
+            solution, _ = hierarchical_solve(10, fixed_assignments, players, workers, refine_time=60.0)
+            solutions.append(list(solution))
+    finally:
+        shutdown_executor()
+    assert solutions[0] == solutions[1]
+
+@pytest.mark.parametrize("seed", range(3))
+def test_swaps_never_worsen_large_team_sums(seed):
+    # 팀 합계가 크면 제곱합에서 평균 제곱을 빼는 계산은 오차가 커서 실제로 나빠지는 맞바꾸기를 고를 수 있음
+    rng = np.random.default_rng(seed)
+    num_teams, num_players = 8, 4000
+    players = [{"name": f"p{i}", "avg": 1e9 + float(rng.uniform(0, 100)), "max": 2e9 + float(rng.uniform(0, 100))}
+               for i in range(num_players)]
+    avg_scores, max_scores = player_arrays(players)
+    assignment = rng.permutation(np.arange(num_players) % num_teams)
+    before = evaluate(assignment.tolist(), num_teams, players)[0]
+    swaps = refine_swaps(assignment, num_teams, avg_scores, max_scores, np.ones(num_players, dtype=bool), 1.0, seed=seed)
+    assert swaps > 0
+    assert evaluate(assignment.tolist(), num_teams, players)[0] < before
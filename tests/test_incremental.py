@@ -0,0 +1,58 @@
+import random
+import numpy as np
+import pytest
+from genetic_algorithm import ensure_creator, setup_toolbox, player_arrays, team_sums, evaluate, evaluate_aggregates
+
+def make_roster(num_players, num_teams, num_fixed, seed):
+    rng = random.Random(seed)
+    players = [{"name": f"p{i}", "avg": round(rng.uniform(100, 220), 1), "max": rng.randint(150, 300)}
+               for i in range(num_players)]
+    fixed_assignments = {players[i]["name"]: i % num_teams for i in range(num_fixed)}
+    return fixed_assignments, players
+
+def assert_aggregates_match(individuals, num_teams, players):
+    # 증분 집계값이 처음부터 다시 계산한 team_sums, evaluate와 같은지 확인
+    avg_scores, max_scores = player_arrays(players)
+    counts, avg_sums, max_sums = team_sums(np.array(individuals), num_teams, avg_scores, max_scores)
+    for ind, count, avg_sum, max_sum in zip(individuals, counts, avg_sums, max_sums):
+        assert ind.aggregates[0] == count.tolist()
+        np.testing.assert_allclose(ind.aggregates[1], avg_sum, rtol=0, atol=1e-6)
+        np.testing.assert_allclose(ind.aggregates[2], max_sum, rtol=0, atol=1e-6)
+    fitness = evaluate_aggregates(individuals, len(players) // num_teams)
+    expected = [evaluate(ind, num_teams, players)[0] for ind in individuals]
+    np.testing.assert_allclose(fitness, expected, rtol=1e-9, atol=1e-6)
+
+@pytest.mark.parametrize("encoding", ["free", "balanced"])
+@pytest.mark.parametrize("seed", range(5))
+def test_random_operator_sequences_match_full_recomputation(encoding, seed):
+    ensure_creator()
+    num_teams = 2 + seed % 3
+    fixed_assignments, players = make_roster(20 + 7 * seed, num_teams, seed, seed)
+    toolbox = setup_toolbox(num_teams, fixed_assignments, players, incremental=True, encoding=encoding)
+    random.seed(seed)
+    population = toolbox.population(n=20)
+    assert_aggregates_match(population, num_teams, players)
+
+    for _ in range(300):
+        if random.random() < 0.5:
+            ind1, ind2 = random.sample(population, 2)
+            toolbox.mate(ind1, ind2)
+        else:
+            toolbox.mutate(random.choice(population))
+        # 복제본은 원본과 집계값을 공유하지 않아야 함
+        i = random.randrange(len(population))
+        population[i] = toolbox.clone(population[i])
+    assert_aggregates_match(population, num_teams, players)
+
+def test_fixed_players_never_move():
+    ensure_creator()
+    fixed_assignments, players = make_roster(24, 3, 6, 42)
+    toolbox = setup_toolbox(3, fixed_assignments, players, incremental=True)
+    random.seed(42)
+    population = toolbox.population(n=10)
+    for _ in range(200):
+        toolbox.mate(*random.sample(population, 2))
+        toolbox.mutate(random.choice(population))
+    for ind in population:
+        for i in range(6):
+            assert ind[i] == fixed_assignments[players[i]["name"]]
@@ -0,0 +1,28 @@
+import random
+import pytest
+from genetic_algorithm import ensure_creator, evaluate
+from local_search import local_search
+from test_incremental import make_roster
+
+def test_free_players_without_swap_or_move_are_skipped():
+    # p0-p2가 팀 0을 채워서 p3-p5는 맞바꿀 상대도, 옮길 팀도 없음
+    ensure_creator()
+    players = [{"name": f"p{i}", "avg": 100.0 + i, "max": 150 + i} for i in range(6)]
+    fixed_assignments = {"p0": 0, "p1": 0, "p2": 0}
+    polished, report = local_search([0, 0, 0, 1, 1, 1], 2, fixed_assignments, players)
+    assert list(polished) == [0, 0, 0, 1, 1, 1]
+    assert report["swaps"] == report["moves"] == 0
+    assert polished.fitness.values == evaluate(polished, 2, players)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_never_worse_and_keeps_fixed_players(seed):
+    ensure_creator()
+    random.seed(seed)
+    fixed_assignments, players = make_roster(24, 3, 4, seed)
+    individual = [random.randrange(3) for _ in players]
+    for i in range(4):
+        individual[i] = fixed_assignments[players[i]["name"]]
+    polished, report = local_search(individual, 3, fixed_assignments, players)
+    assert report["after"] <= report["before"]
+    assert polished.fitness.values == evaluate(polished, 3, players)
+    assert all(polished[i] == fixed_assignments[players[i]["name"]] for i in range(4))
@@ -0,0 +1,48 @@
+import os
+import multiprocessing
+import pytest
+import config
+import metrics
+
+def _evolve_in_child(generations):
+    for _ in range(generations):
+        metrics.inc("teambuilder_generations_total")
+    metrics.flush(force=True)
+
+def _counter(name):
+    for line in metrics.render().splitlines():
+        if line.startswith(name + " "):
+            return int(float(line.split()[1]))
+    return 0
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "METRICS_DIR", str(tmp_path))
+    metrics._counters.clear()
+    metrics._histograms.clear()
+    yield tmp_path
+    metrics._counters.clear()
+    metrics._histograms.clear()
+
+def test_forked_workers_do_not_report_parent_counters_again(metrics_dir):
+    metrics.inc("teambuilder_generations_total", 1000)
+    context = multiprocessing.get_context("fork")
+    children = [context.Process(target=_evolve_in_child, args=(5,)) for _ in range(2)]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join()
+    assert _counter("teambuilder_generations_total") == 1010
+
+def test_files_of_finished_processes_are_folded_and_removed(metrics_dir):
+    context = multiprocessing.get_context("fork")
+    for _ in range(3):
+        child = context.Process(target=_evolve_in_child, args=(2,))
+        child.start()
+        child.join()
+    assert _counter("teambuilder_generations_total") == 6
+    # 이 프로세스의 파일과 끝난 프로세스들을 합친 파일만 남음
+    assert sorted(os.listdir(metrics_dir)) == sorted([
+        ".retire.lock", metrics.RETIRED_FILE, f"metrics-{os.getpid()}-{metrics._started}.json"])
+    # 합친 뒤에도 카운터는 줄어들지 않음
+    assert _counter("teambuilder_generations_total") == 6
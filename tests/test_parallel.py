@@ -0,0 +1,57 @@
+import os
+import pickle
+import random
+import pytest
+from genetic_algorithm import ensure_creator, setup_toolbox, initialize_population, evaluate
+from parallel import SubPopulationPool, IslandPool, shutdown_executor
+from test_incremental import make_roster
+
+def test_pools_reuse_worker_processes_across_tasks():
+    ensure_creator()
+    random.seed(0)
+    try:
+        pids = []
+        for num_teams, encoding in ((2, "free"), (3, "balanced")):
+            fixed_assignments, players = make_roster(30, num_teams, 3, num_teams)
+            toolbox = setup_toolbox(num_teams, fixed_assignments, players, encoding=encoding)
+            population = initialize_population(toolbox, size=40)[0]
+            with SubPopulationPool(2, num_teams, fixed_assignments, players, encoding=encoding) as pool:
+                population = pool.evolve(population, 0, 3)
+                pids.append(set(pool.executor._processes))
+                executor = pool.executor
+            # 작업(명단)이 바뀌어도 워커가 그 작업의 선수 정보로 평가해야 함
+            for ind in population:
+                assert ind.fitness.values[0] == pytest.approx(evaluate(ind, num_teams, players)[0])
+                assert all(ind[i] == fixed_assignments[players[i]["name"]] for i in range(3))
+        assert pids[0] == pids[1]
+
+        fixed_assignments, players = make_roster(30, 2, 0, 7)
+        toolbox = setup_toolbox(2, fixed_assignments, players)
+        population = initialize_population(toolbox, size=40)[0] + initialize_population(toolbox, size=40)[0]
+        with IslandPool(2, 2, 2, fixed_assignments, players) as pool:
+            assert pool.executor is executor
+            assert len(pool.evolve(population, 0, 2)) == 80
+    finally:
+        shutdown_executor()
+
+def test_roster_is_not_resent_with_every_slice(monkeypatch):
+    ensure_creator()
+    random.seed(1)
+    fixed_assignments, players = make_roster(400, 4, 4, 1)
+    toolbox = setup_toolbox(4, fixed_assignments, players)
+    population = initialize_population(toolbox, size=20)[0]
+    submitted = []
+    try:
+        with SubPopulationPool(2, 4, fixed_assignments, players) as pool:
+            submit = pool.executor.submit
+            monkeypatch.setattr(pool.executor, "submit", lambda *args: submitted.append(pickle.dumps(args)) or submit(*args))
+            for gen in range(3):
+                population = pool.evolve(population, gen, 1)
+            path = pool.context_path
+            assert os.path.exists(path)
+        # 작업이 끝나면 작업 정보 파일을 지움
+        assert not os.path.exists(path)
+    finally:
+        shutdown_executor()
+    # 워커에는 선수 정보 대신 작업 정보 파일 경로만 보냄 (선수 dict의 "avg" 키가 pickle에 없어야 함)
+    assert len(submitted) == 6 and all(b"\x8c\x03avg" not in args for args in submitted)
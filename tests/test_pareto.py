@@ -0,0 +1,68 @@
+import random
+import numpy as np
+from deap import creator
+from genetic_algorithm import ensure_creator, evaluate, player_arrays, team_sums
+from pareto import (OBJECTIVES, INFEASIBLE, objectives_from_team_sums, scalar_fitness, setup_pareto_toolbox,
+                    evaluate_invalid, evolve_pareto_generation, select_front, front_entries)
+from save import save_results
+from load import load_prev_json
+from test_incremental import make_roster
+from test_solver import write_roster
+
+def dominates(a, b):
+    return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+def pareto_population(num_teams, fixed_assignments, players, size=40, generations=5):
+    toolbox = setup_pareto_toolbox(num_teams, fixed_assignments, players)
+    population = [creator.ParetoIndividual(ind) for ind in toolbox.population(n=size)]
+    evaluate_invalid(population, toolbox)
+    for gen in range(generations):
+        population = evolve_pareto_generation(population, toolbox, gen)
+    return population
+
+def test_undersized_teams_get_the_infeasible_sentinel():
+    ensure_creator()
+    fixed_assignments, players = make_roster(12, 3, 0, 0)
+    avg_scores, max_scores = player_arrays(players)
+    feasible = [i % 3 for i in range(12)]
+    undersized = [0] * 6 + [1] * 6
+    counts, avg_sums, max_sums = team_sums(np.array([feasible, undersized]), 3, avg_scores, max_scores)
+    objectives = objectives_from_team_sums(counts, avg_sums, max_sums, 4)
+    assert objectives[1].tolist() == [INFEASIBLE] * len(OBJECTIVES)
+    assert scalar_fitness(objectives[0]) == evaluate(feasible, 3, players)[0]
+    assert scalar_fitness(objectives[1]) > scalar_fitness(objectives[0])
+
+def test_selected_front_holds_only_non_dominated_entries():
+    ensure_creator()
+    random.seed(0)
+    fixed_assignments, players = make_roster(24, 3, 3, 0)
+    population = pareto_population(3, fixed_assignments, players)
+    values = [ind.fitness.values for ind in population]
+    entries = front_entries(population, 5)
+    assert 0 < len(entries) <= 5
+    for entry in entries:
+        objectives = tuple(entry["objectives"][name] for name in OBJECTIVES)
+        assert objectives[0] < INFEASIBLE
+        assert not any(dominates(other, objectives) for other in values)
+    assert [entry["fitness"] for entry in entries] == sorted(entry["fitness"] for entry in entries)
+
+    front = [ind for ind in population if not any(dominates(other, ind.fitness.values) for other in values)]
+    selected = select_front(front, 3)
+    assert len(selected) == min(3, len(front)) and all(ind in front for ind in selected)
+
+def test_save_results_writes_the_pareto_front(tmp_path):
+    ensure_creator()
+    random.seed(1)
+    fixed_assignments, players = make_roster(12, 2, 2, 1)
+    data_path = write_roster(tmp_path / "players.json", players, fixed_assignments)
+    entries = front_entries(pareto_population(2, fixed_assignments, players), 4)
+    best = creator.Individual(entries[0]["assignment"])
+    result = load_prev_json(save_results(best, 2, players, 10, data_path, 1.0, pareto_front=entries))
+
+    assert len(result["pareto_front"]) == len(entries)
+    for saved, entry in zip(result["pareto_front"], entries):
+        assert saved["objectives"] == entry["objectives"] and saved["fitness"] == entry["fitness"]
+        assert sorted(saved["results"]) == ["Team 1", "Team 2"]
+        members = [name for team in saved["results"].values() for name in team["Members"]]
+        assert sorted(members) == sorted(player["name"] for player in players)
+    assert result["pareto_front"][0]["results"] == result["results"]
@@ -0,0 +1,45 @@
+import os
+import json
+import time
+import pytest
+import config
+import save
+
+@pytest.fixture
+def render_cache(tmp_path, monkeypatch):
+    directory = tmp_path / "render_cache"
+    monkeypatch.setattr(config, "RENDER_CACHE_DIR", str(directory))
+    monkeypatch.setattr(config, "RENDER_CACHE_SIZE", 3)
+    monkeypatch.setattr(config, "RENDER_CACHE_TTL", 3600)
+    directory.mkdir()
+    return directory
+
+def touch(path, age):
+    path.write_bytes(b"png")
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+def test_evicts_expired_then_least_recently_used(render_cache):
+    touch(render_cache / "expired.png", 7200)
+    for i, age in enumerate([50, 40, 30, 20]):
+        touch(render_cache / f"{i}.png", age)
+    touch(render_cache / "other.tmp", 7200)
+    save.evict_render_cache()
+    assert sorted(os.listdir(render_cache)) == ["1.png", "2.png", "3.png", "other.tmp"]
+
+def test_cached_render_is_reused_and_refreshed(render_cache, tmp_path, monkeypatch):
+    matplotlib = pytest.importorskip("matplotlib")
+    font = os.path.join(os.path.dirname(matplotlib.__file__), "mpl-data", "fonts", "ttf", "DejaVuSans.ttf")
+    monkeypatch.setattr(config, "FONT_PATH", font)
+    save.load_fonts.cache_clear()
+    data = {"parameters": {}, "results": {"Team 1": {"Total Score": 300.0, "Members": {"a": 150.0, "b": 150.0}},
+                                          "Team 2": {"Total Score": 290.0, "Members": {"c": 145.0, "d": 145.0}}}}
+    paths = []
+    for name in ("result.json", "result1.json"):
+        path = tmp_path / name
+        path.write_text(json.dumps(data), encoding="utf-8")
+        paths.append(save.json_to_png(str(path), dpi=50))
+    cached = render_cache / (save.render_key(data, 50) + ".png")
+    assert os.listdir(render_cache) == [cached.name]
+    assert open(paths[0], "rb").read() == open(paths[1], "rb").read() == cached.read_bytes()
+    save.load_fonts.cache_clear()
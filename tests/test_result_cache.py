@@ -0,0 +1,54 @@
+import json
+import pytest
+import config
+import result_cache
+from save import save_update_team
+from load import load_prev_json
+from test_incremental import make_roster
+from test_solver import write_roster
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "RESULT_CACHE_DIR", str(tmp_path / "result_cache"))
+    monkeypatch.setattr(config, "RESULT_CACHE_SIZE", 4)
+    monkeypatch.setattr(config, "RESULT_CACHE_TTL", 3600)
+
+def upload(tmp_path, user, players, fixed_assignments):
+    directory = tmp_path / user
+    directory.mkdir()
+    path = directory / "players.json"
+    write_roster(path, players, fixed_assignments)
+    return str(path)
+
+def test_same_roster_in_another_order_shares_a_key(tmp_path):
+    fixed_assignments, players = make_roster(8, 2, 1, seed=3)
+    first = upload(tmp_path, "first", players, fixed_assignments)
+    second = upload(tmp_path, "second", list(reversed(players)), fixed_assignments)
+    options = config.solver_options()
+    assert result_cache.task_key(first, 2, 1, options) == result_cache.task_key(second, 2, 1, options)
+
+def test_cache_hit_does_not_leak_the_first_request(tmp_path):
+    first_path = str(tmp_path / "first-uuid" / "players.json")
+    original = {
+        "parameters": {"num_teams": 2, "repeat": 1, "data_path": first_path, "run_time": 12.5, "version": 3,
+                       "solver": "ga", "stop_reason": "completed", "generations": 40,
+                       "local_search": {"moves": 2}, "warm_start": {"path": first_path}},
+        "results": {"Team 1": {"Total Score": 10.0, "Members": {"a": 10.0}},
+                    "Team 2": {"Total Score": 9.0, "Members": {"b": 9.0}}},
+        "pareto_front": [{"objectives": ["balance"], "fitness": [1.0], "results": {}}],
+    }
+    result_json = tmp_path / "result.json"
+    result_json.write_text(json.dumps(original), encoding="utf-8")
+    result_cache.store("key", str(result_json))
+    assert "first-uuid" not in open(result_cache.entry_path("key"), encoding="utf-8").read()
+
+    second_dir = tmp_path / "second-uuid"
+    second_dir.mkdir()
+    second_path = str(second_dir / "players.json")
+    saved = load_prev_json(save_update_team(second_path, result_cache.cached_result(result_cache.lookup("key"), second_path)))
+
+    assert saved["results"] == original["results"]
+    assert saved["pareto_front"] == original["pareto_front"]
+    assert saved["parameters"] == {"num_teams": 2, "repeat": 1, "solver": "ga", "stop_reason": "completed",
+                                   "generations": 40, "data_path": second_path, "run_time": 0.0, "cached": True,
+                                   "version": 0}
@@ -0,0 +1,38 @@
+import os
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from load import latest_result_version, latest_result_path, result_json_path
+from save import next_result_version, write_json_atomic
+
+def test_concurrent_allocations_get_distinct_increasing_versions(tmp_path):
+    # 이전 버전 파일이 없는 디렉토리는 기존 result*.json 이름에서 이어서 번호를 매김
+    directory = str(tmp_path / "uuid")
+    os.makedirs(directory)
+    write_json_atomic(result_json_path(directory, 0), {})
+    write_json_atomic(result_json_path(directory, 1), {})
+    assert latest_result_version(directory) == 1
+
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        by_process = pool.map(next_result_version, [directory] * 40)
+    with ThreadPoolExecutor(8) as executor:
+        by_thread = list(executor.map(next_result_version, [directory] * 40))
+
+    assert sorted(by_process + by_thread) == list(range(2, 82))
+    assert min(by_thread) > max(by_process)
+    assert latest_result_version(directory) == 81
+    assert next_result_version(directory) == 82
+
+def test_write_json_atomic_replaces_the_file_without_leftovers(tmp_path):
+    directory = str(tmp_path)
+    for version in range(3):
+        assert next_result_version(directory) == version
+        write_json_atomic(result_json_path(directory, version), {"version": version, "이름": "팀"})
+    write_json_atomic(result_json_path(directory, 2), {"version": 2, "rewritten": True})
+
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+    assert latest_result_version(directory) == 2
+    with open(latest_result_path(directory), encoding="utf-8") as file:
+        assert json.load(file) == {"version": 2, "rewritten": True}
+    with open(result_json_path(directory, 0), encoding="utf-8") as file:
+        assert json.load(file)["이름"] == "팀"
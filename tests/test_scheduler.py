@@ -0,0 +1,98 @@
+import sys
+import time
+import socket
+import subprocess
+import queue
+import config
+from scheduler import JobScheduler, RemoteTaskState
+from task_store import TaskState, open_task_store, TASK_FIELDS, SHARED_FIELDS
+from load import load_prev_json
+from test_solver import write_roster
+from test_incremental import make_roster
+
+def test_remote_task_state_starts_with_task_field_defaults():
+    updates = queue.Queue()
+    task = RemoteTaskState("t", updates, {"t": False})
+    for name, value in TASK_FIELDS.items():
+        if name not in SHARED_FIELDS:
+            assert getattr(task, name) == value
+    assert updates.empty()
+    task.progress = 50.0
+    assert updates.get_nowait() == ("t", "progress", 50.0)
+
+def test_memory_store_task_runs_to_completion_on_worker(tmp_path):
+    fixed_assignments, players = make_roster(16, 2, 2, 0)
+    data_path = write_roster(tmp_path / "players.json", players, fixed_assignments)
+    tasks = open_task_store("memory")
+    finished = []
+    scheduler = JobScheduler(tasks, concurrency=1, on_finished=finished.append)
+    scheduler.start()
+    try:
+        tasks["t"] = TaskState()
+        options = config.solver_options(solver="ga", local_search=True, checkpoint_interval=0)
+        scheduler.submit("t", (2, 20, data_path, options))
+        deadline = time.time() + 60
+        while not finished and time.time() < deadline:
+            time.sleep(0.1)
+    finally:
+        scheduler.stop()
+    assert finished == ["t"]
+    task = tasks["t"]
+    assert task.progress == 100.0
+    # 작업이 도중에 실패하지 않았으면 언덕 오르기까지 실행됨
+    assert "local_search" in load_prev_json(task.result_json)["parameters"]
+
+def _finished_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+def test_cancel_leaves_tasks_running_on_another_server_worker(tmp_path):
+    url = f"sqlite:{tmp_path / 'tasks.db'}"
+    owner, other = JobScheduler(open_task_store(url)), JobScheduler(open_task_store(url))
+    tasks = owner.tasks
+    tasks["t"] = TaskState()
+    # 다른 uvicorn 워커의 스케줄러가 실행 중인 작업
+    tasks["t"].owner = "another-host:1234"
+    other.cancel("t")
+    assert tasks["t"].progress == 0.0
+    # 실행 중인 서버 워커가 취소 여부를 보고 마무리함
+    tasks["t"].cancelled = True
+    assert open_task_store(url)["t"].cancelled
+
+def test_cancel_finishes_orphaned_tasks(tmp_path):
+    url = f"sqlite:{tmp_path / 'tasks.db'}"
+    scheduler = JobScheduler(open_task_store(url), stale_after=600)
+    tasks = scheduler.tasks
+    for task_id, owner in (("none", None), ("dead", f"{socket.gethostname()}:{_finished_pid()}")):
+        tasks[task_id] = TaskState()
+        tasks[task_id].owner = owner
+        scheduler.cancel(task_id)
+        assert tasks[task_id].progress == 100.0
+
+    # 다른 호스트의 작업은 진행 기록이 stale_after보다 오래되면 버려진 것으로 봄
+    tasks["stale"] = TaskState()
+    tasks["stale"].owner = "another-host:1234"
+    scheduler.stale_after = 0
+    time.sleep(0.01)
+    scheduler.cancel("stale")
+    assert tasks["stale"].progress == 100.0
+
+def test_cancelled_queued_tasks_leave_no_cancel_flag():
+    # concurrency=0이면 워커를 시작하지 않고 대기열만 확인할 수 있음
+    scheduler = JobScheduler(open_task_store("memory"), concurrency=0)
+    scheduler.cancelled = {}
+    tasks = scheduler.tasks
+    for task_id in ("queued", "cancelled elsewhere"):
+        tasks[task_id] = TaskState()
+        scheduler.submit(task_id, ())
+    scheduler.cancel("queued")
+    assert tasks["queued"].progress == 100.0
+
+    # 다른 서버 워커에서 취소된 작업은 _dispatch가 실행하지 않고 건너뜀
+    tasks["cancelled elsewhere"].cancelled = True
+    scheduler.concurrency = 1
+    with scheduler.lock:
+        scheduler._dispatch()
+    assert tasks["cancelled elsewhere"].progress == 100.0
+    assert scheduler.cancelled == {} and scheduler.counts() == (0, 0)
@@ -0,0 +1,59 @@
+import random
+import numpy as np
+from genetic_algorithm import ensure_creator, setup_toolbox, initialize_population, evolve_generation, evaluate
+from seeding import team_targets, assignment_from_result
+from test_incremental import make_roster, assert_aggregates_match
+
+def feasible(individual, num_teams, num_players):
+    return np.bincount(individual, minlength=num_teams).min() >= num_players // num_teams
+
+def test_seeded_population_keeps_a_feasible_best_individual():
+    ensure_creator()
+    random.seed(0)
+    rng = random.Random(0)
+    # 팀 합계가 커서 정상 배정의 적합도가 고정 벌점(1000)보다 훨씬 큰 명단
+    players = [{"name": f"p{i}", "avg": round(rng.uniform(100, 220), 1), "max": rng.randint(150, 300)} for i in range(203)]
+    fixed_assignments = {players[i]["name"]: i % 4 for i in range(8)}
+    toolbox = setup_toolbox(4, fixed_assignments, players)
+    population, hof, _ = initialize_population(toolbox, seed_ratio=0.2, size=60)
+    seeded = population[:12]
+    assert all(feasible(ind, 4, len(players)) for ind in seeded)
+    assert min(evaluate(ind, 4, players)[0] for ind in seeded) > 1000
+
+    for gen in range(20):
+        population = evolve_generation(population, toolbox, gen)
+        hof.update(population)
+    assert feasible(hof[0], 4, len(players))
+    # 최소 인원을 못 채운 배정은 어떤 정상 배정보다 나쁨
+    infeasible = [0] * len(players)
+    assert evaluate(infeasible, 4, players)[0] > max(evaluate(ind, 4, players)[0] for ind in seeded)
+
+def test_warm_start_from_a_result_with_changed_roster_and_team_count():
+    ensure_creator()
+    random.seed(3)
+    _, old_players = make_roster(40, 4, 0, 3)
+    previous = {"results": {f"Team {team + 1}": {"Members": {player["name"]: player["avg"]
+                                                             for player in old_players[team::4]}}
+                            for team in range(4)}}
+    # 앞의 10명은 빠지고 새 선수 7명이 들어왔으며, 팀은 4개에서 3개로 줄고 이전 Team 1 선수 한 명은 Team 3에 고정
+    _, new_players = make_roster(7, 3, 0, 4)
+    for player in new_players:
+        player["name"] = "new " + player["name"]
+    players = old_players[10:] + new_players
+    fixed_assignments = {old_players[12]["name"]: 2, new_players[0]["name"]: 0}
+    targets = team_targets(3, fixed_assignments, players)
+
+    base, matched = assignment_from_result(previous, 3, fixed_assignments, players)
+    # 남아 있고 고정되지 않았으며 이전 팀(i % 4)이 새 팀 수 안에 있는 선수만 이전 팀을 이어받음
+    kept = [player for i, player in enumerate(old_players)
+            if i >= 10 and i % 4 < 3 and player["name"] not in fixed_assignments]
+    assert matched == len(kept)
+    toolbox = setup_toolbox(3, fixed_assignments, players, incremental=True)
+    seeds = toolbox.warm_start_population(10, base)
+    assert list(seeds[0]) == base
+    for individual in seeds:
+        assert len(individual) == len(players) and set(individual) <= {0, 1, 2}
+        assert all(individual[i] == fixed_assignments[player["name"]]
+                   for i, player in enumerate(players) if player["name"] in fixed_assignments)
+        assert np.bincount(individual, minlength=3).tolist() == targets
+    assert_aggregates_match(seeds, 3, players)
@@ -0,0 +1,43 @@
+import json
+import random
+import logging
+import config
+from solver import execute_genetic
+from task_store import TaskState
+from load import load_prev_json
+from test_incremental import make_roster
+
+def write_roster(path, players, fixed_assignments):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"fixed_assignments": fixed_assignments, "players": players}, file)
+    return str(path)
+
+def test_default_solver_handles_fixed_players_filling_one_team(tmp_path):
+    players = [{"name": f"p{i}", "avg": 100.0 + i, "max": 150 + i} for i in range(6)]
+    data_path = write_roster(tmp_path / "players.json", players, {"p0": 0, "p1": 0, "p2": 0})
+    task = TaskState()
+    random.seed(0)
+    execute_genetic("t", task, 2, 20, data_path, config.solver_options(solver="auto", local_search=True, checkpoint_interval=0))
+    result = load_prev_json(task.result_json)
+    assert result["parameters"]["solver"] == "exact"
+    assert sorted(result["results"]["Team 1"]["Members"]) == ["p0", "p1", "p2"]
+    assert task.progress == 100.0
+
+def test_failure_before_any_individual_keeps_the_original_error(tmp_path, caplog):
+    task = TaskState()
+    with caplog.at_level(logging.ERROR):
+        execute_genetic("t", task, 2, 20, str(tmp_path / "missing.json"), config.solver_options())
+    assert task.result_json is None
+    assert task.progress == 100.0
+    assert any("Data file not found" in record.getMessage() for record in caplog.records)
+
+def test_auto_solver_proves_small_rosters_without_the_genetic_algorithm(tmp_path):
+    fixed_assignments, players = make_roster(config.EXACT_MAX_FREE_PLAYERS + 4, 4, 4, 1)
+    data_path = write_roster(tmp_path / "players.json", players, fixed_assignments)
+    task = TaskState()
+    random.seed(1)
+    execute_genetic("t", task, 4, 20, data_path, config.solver_options(solver="auto", checkpoint_interval=0))
+    parameters = load_prev_json(task.result_json)["parameters"]
+    assert parameters["solver"] == "exact"
+    assert parameters["exact"]["optimal"] and parameters["stop_reason"] == "optimal"
+    assert parameters["generations"] == 0
@@ -1,5 +1,6 @@
 import os
 import json
+import logging
 import argparse
 
 def ensure_directory_exists(directory):
@@ -15,18 +16,61 @@ def ensure_directory_exists(directory):
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-def parse_args():
+def parse_args(argv=None):
     """
-    명령줄 인수를 파싱하는 함수.
+    명령줄 인수를 파싱하는 함수. (batch.py)
     
     INPUT:
-    - 없음
+    - argv (list): 파싱할 인수 리스트 (None이면 sys.argv)
     
     OUTPUT:
     - argparse.Namespace: 명령줄 인수로부터 파싱된 값들을 반환합니다.
     """
     parser = argparse.ArgumentParser(description="Team assignment using genetic algorithms.")
-    parser.add_argument("--num_teams", type=int, required=True, help="Number of teams to distribute players among.")
+    parser.add_argument("--num_teams", type=int, nargs="+", required=True, help="Number of teams to distribute players among (several values run a sweep).")
     parser.add_argument("--repeat", type=int, default=1000, help="Number of generations for the genetic algorithm.")
-    parser.add_argument("--data_path", type=str, default="players.json", help="Path to the players data file.")
-    return parser.parse_args()
+    parser.add_argument("--data_path", type=str, nargs="+", default=["players.json"], help="Players data files, directories or glob patterns.")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Number of rosters solved at the same time.")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON Lines summary to this file instead of stdout.")
+    parser.add_argument("--render", action="store_true", help="Also render the result table PNG next to each result JSON.")
+    parser.add_argument("--solver", type=str, default=None, help="auto, exact, ga or hierarchical (default: TEAMBUILDER_SOLVER).")
+    parser.add_argument("--encoding", type=str, default=None, help="free or balanced (default: TEAMBUILDER_ENCODING).")
+    parser.add_argument("--engine", type=str, default=None, help="deap or array (default: TEAMBUILDER_ENGINE).")
+    parser.add_argument("--objectives", type=str, default=None, help="scalar or pareto (default: TEAMBUILDER_OBJECTIVES).")
+    parser.add_argument("--time_budget", type=float, default=None, help="Maximum seconds per roster (default: TEAMBUILDER_TIME_BUDGET).")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed; each roster/num_teams pair uses seed + its index.")
+    return parser.parse_args(argv)
+
+def setup_logging():
+    """
+    API 서버와 작업 워커 프로세스가 함께 쓰는 로그 설정 함수.
+    
+    INPUT:
+    - 없음
+    
+    OUTPUT:
+    - 없음
+    """
+    logging.basicConfig(
+        filename='api.log',  # 로그를 저장할 파일명
+        level=logging.DEBUG,  # 로그 레벨 설정 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        format='%(asctime)s %(levelname)s:%(message)s'  # 로그 포맷 설정
+    )
+
+def log_task_event(task_id: str, message: str, level: str = "debug"):
+    """
+    로깅 유틸리티 함수
+
+    INPUT:
+    - task_id (str): 요청하는 uuid의 값
+    - message (str): 로그 메세지
+    - level (str): 로그의 레벨을 나타냄
+
+    OUTPUT:
+    - 
+    """
+    log_message = f"Task {task_id} - {message}"
+    if level == "debug":
+        logging.debug(log_message)
+    elif level == "error":
+        logging.error(log_message)